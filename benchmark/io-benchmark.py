@@ -0,0 +1,72 @@
+import os
+import time
+import json
+import argparse
+from word_vectors import FileType
+from word_vectors.read import read
+from word_vectors.utils import IO_STRATEGIES
+
+
+def drop_cache(path):
+    """Evict a file from the page cache so the next read has to go to disk.
+
+    This only drops this file (not the whole cache like ``echo 3 > /proc/sys/vm/drop_caches``)
+    so it doesn't need root, the pages can't be evicted if something else has the file mapped.
+    """
+    with open(path, "rb") as f:
+        os.fsync(f.fileno())
+        os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_DONTNEED)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compare the I/O strategies for reading a file on a cold and warm cache."
+    )
+    parser.add_argument("embedding", help="The path to the embedding file to read")
+    parser.add_argument("--format", type=FileType.from_string, help="The file format, it is sniffed when not given")
+    parser.add_argument(
+        "--io-strategy",
+        "--io_strategy",
+        action="append",
+        choices=IO_STRATEGIES,
+        help="The strategies to benchmark, can be given multiple times. Defaults to all of them.",
+    )
+    parser.add_argument(
+        "--cache", choices=("cold", "warm", "both"), default="both", help="The state of the page cache for each read"
+    )
+    parser.add_argument("--trials", default=3, type=int, help="The number of times to read the file with each setting")
+    args = parser.parse_args()
+
+    if args.cache != "warm" and not hasattr(os, "posix_fadvise"):
+        raise ValueError("Benchmarking a cold cache needs `os.posix_fadvise` to evict the file from the cache.")
+    caches = ("cold", "warm") if args.cache == "both" else (args.cache,)
+
+    for io_strategy in args.io_strategy or IO_STRATEGIES:
+        for cache in caches:
+            if cache == "warm":
+                # Make sure the whole file is in the cache before timing.
+                read(args.embedding, args.format, io_strategy=io_strategy)
+            trials = []
+            for _ in range(args.trials):
+                if cache == "cold":
+                    drop_cache(args.embedding)
+                tic = time.time()
+                read(args.embedding, args.format, io_strategy=io_strategy)
+                toc = time.time()
+                trials.append(toc - tic)
+            print(
+                json.dumps(
+                    {
+                        "file": args.embedding,
+                        "io_strategy": io_strategy,
+                        "cache": cache,
+                        "size": os.path.getsize(args.embedding),
+                        "time": min(trials),
+                        "trials": trials,
+                    }
+                )
+            )
+
+
+if __name__ == "__main__":
+    main()
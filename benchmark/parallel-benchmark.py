@@ -0,0 +1,52 @@
+import time
+import json
+import argparse
+from word_vectors import FileType
+from word_vectors.read import read_glove, read_w2v_text
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compare parsing a text embedding file with a process pool to one process."
+    )
+    parser.add_argument("embedding", help="The path to the embedding file to read")
+    parser.add_argument(
+        "--format", required=True, type=FileType.from_string, help="The file format we are benchmarking"
+    )
+    parser.add_argument("--workers", required=True, type=int, help="The number of processes to parse with")
+    parser.add_argument("--trials", default=3, type=int, help="The number of times to read the file with each setting")
+    args = parser.parse_args()
+
+    if args.format is FileType.GLOVE:
+        reader = read_glove
+    elif args.format is FileType.W2V_TEXT:
+        reader = read_w2v_text
+    else:
+        raise ValueError(f"Only text formats are parsed in parallel, got {args.format}")
+
+    times = {}
+    for workers in (None, args.workers):
+        trials = []
+        for _ in range(args.trials):
+            tic = time.time()
+            reader(args.embedding, workers=workers)
+            toc = time.time()
+            trials.append(toc - tic)
+        times[workers] = min(trials)
+
+    print(
+        json.dumps(
+            {
+                "file": args.embedding,
+                "format": str(args.format),
+                "workers": args.workers,
+                "serial": times[None],
+                "parallel": times[args.workers],
+                "speedup": times[None] / times[args.workers],
+            }
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -39,11 +39,11 @@ setup(
     url=About.URL,
     download_url=About.DL_URL,
     license=About.LICENSE,
-    python_requires=">=3.6",
+    python_requires=">=3.8",
     packages=find_packages(),
     package_data={"word_vectors": [],},
     include_package_data=True,
-    install_requires=["file_or_name>=1.1.3", "numpy"],
+    install_requires=["file_or_name>=1.1.3", "numpy>=1.23"],
     extras_require={"test": ["pytest"],},
     keywords=[],
     ext_modules=ext_modules,
@@ -0,0 +1,150 @@
+import io
+import os
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+import pytest
+import numpy as np
+import word_vectors
+from word_vectors import FileType
+from word_vectors.read import read
+from word_vectors.cache import read_cached, cache_path, fingerprint, evict, CACHE_EXTENSION
+from utils import vocab, vectors, DATA, GLOVE, W2V, W2V_TEXT, LEADER, GLOVE_DUPPED, dupped_vocab, dupped_vectors
+
+
+@pytest.fixture
+def glove(tmp_path):
+    path = tmp_path / GLOVE
+    shutil.copy(DATA / GLOVE, path)
+    return path
+
+
+def _snapshots(cache_dir):
+    return sorted(p for p in os.listdir(cache_dir) if p.endswith(CACHE_EXTENSION))
+
+
+@pytest.mark.parametrize("data", [GLOVE, W2V_TEXT, W2V, LEADER])
+def test_read_cache_dir(tmp_path, data):
+    cache_dir = tmp_path / "cache"
+    w, wv = read(DATA / data, cache_dir=cache_dir)
+    assert w == vocab
+    np.testing.assert_allclose(wv, vectors)
+    assert _snapshots(cache_dir) == [os.path.basename(cache_path(DATA / data, cache_dir))]
+    w, wv = read(DATA / data, cache_dir=cache_dir)
+    assert w == vocab
+    np.testing.assert_allclose(wv, vectors)
+
+
+def test_read_cache_hit_does_not_parse(tmp_path, glove, monkeypatch):
+    cache_dir = tmp_path / "cache"
+    read(glove, cache_dir=cache_dir)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("The file was parsed again")
+
+    monkeypatch.setattr(word_vectors.cache_module, "read", fail)
+    w, wv = read(glove, cache_dir=cache_dir)
+    assert w == vocab
+    np.testing.assert_allclose(wv, vectors)
+    # The cached vectors are a view of the memory mapped snapshot.
+    assert not wv.flags.owndata
+
+
+def test_read_cache_dupped(tmp_path):
+    cache_dir = tmp_path / "cache"
+    for _ in range(2):
+        w, wv = read(DATA / GLOVE_DUPPED, cache_dir=cache_dir)
+        assert w == dupped_vocab
+        np.testing.assert_allclose(wv, dupped_vectors)
+
+
+def test_read_cache_open_file(tmp_path, glove):
+    cache_dir = tmp_path / "cache"
+    with open(glove) as f:
+        read(f, cache_dir=cache_dir)
+    assert _snapshots(cache_dir) == [os.path.basename(cache_path(glove, cache_dir))]
+
+
+def test_read_cache_stream_not_cached(tmp_path):
+    cache_dir = tmp_path / "cache"
+    w, wv = read(io.BytesIO((DATA / W2V).read_bytes()), cache_dir=cache_dir)
+    assert w == vocab
+    np.testing.assert_allclose(wv, vectors)
+    assert not cache_dir.exists()
+
+
+def test_read_cache_modified_file(tmp_path, glove):
+    cache_dir = tmp_path / "cache"
+    read(glove, cache_dir=cache_dir)
+    stat = os.stat(glove)
+    os.utime(glove, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+    w, wv = read(glove, cache_dir=cache_dir)
+    assert w == vocab
+    np.testing.assert_allclose(wv, vectors)
+    assert len(_snapshots(cache_dir)) == 2
+
+
+def test_fingerprint_file_type(glove):
+    assert fingerprint(glove) != fingerprint(glove, FileType.GLOVE)
+
+
+def test_fingerprint_content_hash(glove):
+    stat = os.stat(glove)
+    before = fingerprint(glove), fingerprint(glove, content_hash=True)
+    data = bytearray(glove.read_bytes())
+    data[0:1] = b"x"
+    glove.write_bytes(bytes(data))
+    # Put back the metadata so only the contents changed.
+    os.utime(glove, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    assert fingerprint(glove) == before[0]
+    assert fingerprint(glove, content_hash=True) != before[1]
+
+
+def test_read_cache_no_temporary_files(tmp_path, glove):
+    cache_dir = tmp_path / "cache"
+    read(glove, cache_dir=cache_dir)
+    assert os.listdir(cache_dir) == _snapshots(cache_dir)
+
+
+def test_evict_least_recently_used(tmp_path):
+    cache_dir = tmp_path / "cache"
+    cache_dir.mkdir()
+    paths = [cache_dir / f"{i}{CACHE_EXTENSION}" for i in range(4)]
+    for i, path in enumerate(paths):
+        path.write_bytes(b"x" * 10)
+        os.utime(path, ns=(i * 10 ** 9, i * 10 ** 9))
+    # Other files in the directory are not snapshots.
+    (cache_dir / "partial.tmp").write_bytes(b"x" * 100)
+    assert evict(cache_dir, 20, keep=str(paths[0])) == 2
+    assert _snapshots(cache_dir) == [paths[0].name, paths[3].name]
+    assert (cache_dir / "partial.tmp").exists()
+
+
+def test_read_cached_max_size(tmp_path):
+    cache_dir = tmp_path / "cache"
+    read_cached(DATA / GLOVE, cache_dir)
+    first = cache_path(DATA / GLOVE, cache_dir)
+    os.utime(first, ns=(0, 0))
+    # The cache only has room for one snapshot so the older one is evicted.
+    read_cached(DATA / W2V, cache_dir, max_size=os.path.getsize(first))
+    assert _snapshots(cache_dir) == [os.path.basename(cache_path(DATA / W2V, cache_dir))]
+
+
+def test_read_cache_hit_marks_used(tmp_path, glove):
+    cache_dir = tmp_path / "cache"
+    read(glove, cache_dir=cache_dir)
+    snapshot = cache_path(glove, cache_dir)
+    os.utime(snapshot, ns=(0, 0))
+    read(glove, cache_dir=cache_dir)
+    assert os.stat(snapshot).st_mtime_ns > 0
+
+
+def _read_vocab(path, cache_dir):
+    return read(path, cache_dir=cache_dir)[0]
+
+
+def test_read_cache_concurrent(tmp_path, glove):
+    cache_dir = tmp_path / "cache"
+    with ProcessPoolExecutor(max_workers=4) as pool:
+        results = list(pool.map(_read_vocab, [glove] * 4, [cache_dir] * 4))
+    assert all(w == vocab for w in results)
+    assert os.listdir(cache_dir) == [os.path.basename(cache_path(glove, cache_dir))]
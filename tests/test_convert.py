@@ -1,12 +1,18 @@
+import io
 import os
+import sys
+import gzip
 import random
-import pathlib
 from unittest.mock import patch
+import pytest
 import numpy as np
 from word_vectors import FileType
-from word_vectors.read import read
+from word_vectors.read import read, iter_batches, leader_version
+from word_vectors.write import write
 from word_vectors.convert import convert
+from word_vectors.scripts.convert_embeddings import main
 from utils import vocab, vectors, DATA, GLOVE, W2V, W2V_TEXT, LEADER, rand_str
+from utils import GLOVE_DUPPED, dupped_vocab, dupped_vectors
 
 
 INPUT_MAPPING = {
@@ -17,161 +23,298 @@ INPUT_MAPPING = {
 }
 
 
-def test_convert():
+def check_output(output, output_type):
+    w, wv = read(output, output_type)
+    assert w == vocab
+    np.testing.assert_allclose(wv, vectors)
+
+
+def test_convert(tmp_path):
     data = random.choice([GLOVE, W2V, W2V_TEXT, LEADER])
     output_type = random.choice(list(FileType))
-    input_path = str(DATA / data)
-    gold_output_path = os.path.splitext(input_path)[0] + "." + str(output_type)
-    with patch("word_vectors.convert_module.write") as write_patch:
-        w, wv = read(input_path)
-        convert(input_path, output_file_type=output_type)
-        call_file, call_w, call_wv, call_type = write_patch.call_args_list[0][0]
-        assert call_file == gold_output_path
-        assert call_w == w
-        np.testing.assert_allclose(call_wv, wv)
-        assert call_type is output_type
-
-
-def test_convert_with_output():
+    input_path = tmp_path / data
+    input_path.write_bytes((DATA / data).read_bytes())
+    gold_output_path = os.path.splitext(str(input_path))[0] + "." + str(output_type)
+    convert(str(input_path), output_file_type=output_type)
+    check_output(gold_output_path, output_type)
+
+
+def test_convert_with_output(tmp_path):
     data = random.choice([GLOVE, W2V, W2V_TEXT, LEADER])
     output_type = random.choice(list(FileType))
-    output = rand_str()
-    input_path = str(DATA / data)
-    with patch("word_vectors.convert_module.write") as write_patch:
-        w, wv = read(input_path)
-        convert(input_path, output, output_file_type=output_type)
-        call_file, call_w, call_wv, call_type = write_patch.call_args_list[0][0]
-        assert call_file == output
-        assert call_w == w
-        assert call_type == output_type
-        np.testing.assert_allclose(call_wv, wv)
-
-
-def test_convert_with_input():
+    output = str(tmp_path / rand_str())
+    convert(str(DATA / data), output, output_file_type=output_type)
+    check_output(output, output_type)
+
+
+def test_convert_with_input(tmp_path):
     data = random.choice([GLOVE, W2V, W2V_TEXT, LEADER])
     input_type = INPUT_MAPPING[data]
     output_type = random.choice(list(FileType))
-    input_path = str(DATA / data)
-    output = rand_str()
-    with patch("word_vectors.convert_module.read") as read_patch:
-        with patch("word_vectors.convert_module.write") as write_patch:
-            w, wv = read(input_path)
-            read_patch.return_value = (w, wv)
-            convert(input_path, output, output_file_type=output_type, input_file_type=input_type)
-            read_patch.assert_called_once_with(input_path, input_type)
-            call_file, call_w, call_wv, call_type = write_patch.call_args_list[0][0]
-            assert call_file == output
-            assert call_w == w
-            assert call_type == output_type
-            np.testing.assert_allclose(call_wv, wv)
-
-
-def test_convert_pathlib():
+    output = str(tmp_path / rand_str())
+    with patch("word_vectors.read_module.sniff") as sniff_patch:
+        convert(str(DATA / data), output, output_file_type=output_type, input_file_type=input_type)
+        sniff_patch.assert_not_called()
+    check_output(output, output_type)
+
+
+def test_convert_pathlib(tmp_path):
     data = random.choice([GLOVE, W2V, W2V_TEXT, LEADER])
     output_type = random.choice(list(FileType))
-    input_path = DATA / data
+    input_path = tmp_path / data
+    input_path.write_bytes((DATA / data).read_bytes())
     gold_output_path = os.path.splitext(str(input_path))[0] + "." + str(output_type)
-    with patch("word_vectors.convert_module.write") as write_patch:
-        w, wv = read(input_path)
-        convert(input_path, output_file_type=output_type)
-        call_file, call_w, call_wv, call_type = write_patch.call_args_list[0][0]
-        assert str(call_file) == gold_output_path
-        assert call_w == w
-        np.testing.assert_allclose(call_wv, wv)
-        assert call_type is output_type
+    convert(input_path, output_file_type=output_type)
+    check_output(gold_output_path, output_type)
 
 
-def test_convert_with_output_pathlib():
+def test_convert_with_output_pathlib(tmp_path):
     data = random.choice([GLOVE, W2V, W2V_TEXT, LEADER])
     output_type = random.choice(list(FileType))
-    output = pathlib.Path(rand_str())
-    input_path = DATA / data
-    with patch("word_vectors.convert_module.write") as write_patch:
-        w, wv = read(input_path)
-        convert(input_path, output, output_file_type=output_type)
-        call_file, call_w, call_wv, call_type = write_patch.call_args_list[0][0]
-        assert call_file == output
-        assert call_w == w
-        assert call_type == output_type
-        np.testing.assert_allclose(call_wv, wv)
-
-
-def test_convert_with_input_pathlib():
+    output = tmp_path / rand_str()
+    convert(DATA / data, output, output_file_type=output_type)
+    check_output(output, output_type)
+
+
+def test_convert_with_input_pathlib(tmp_path):
     data = random.choice([GLOVE, W2V, W2V_TEXT, LEADER])
     input_type = INPUT_MAPPING[data]
     output_type = random.choice(list(FileType))
-    input_path = DATA / data
-    output = pathlib.Path(rand_str())
-    with patch("word_vectors.convert_module.read") as read_patch:
-        with patch("word_vectors.convert_module.write") as write_patch:
-            w, wv = read(input_path)
-            read_patch.return_value = (w, wv)
-            convert(input_path, output, output_file_type=output_type, input_file_type=input_type)
-            read_patch.assert_called_once_with(input_path, input_type)
-            call_file, call_w, call_wv, call_type = write_patch.call_args_list[0][0]
-            assert call_file == output
-            assert call_w == w
-            assert call_type == output_type
-            np.testing.assert_allclose(call_wv, wv)
-
-
-def test_convert_open():
+    output = tmp_path / rand_str()
+    with patch("word_vectors.read_module.sniff") as sniff_patch:
+        convert(DATA / data, output, output_file_type=output_type, input_file_type=input_type)
+        sniff_patch.assert_not_called()
+    check_output(output, output_type)
+
+
+def test_convert_open(tmp_path):
     data = random.choice([GLOVE, W2V, W2V_TEXT, LEADER])
     output_type = random.choice(list(FileType))
-    input_path = DATA / data
+    input_path = tmp_path / data
+    input_path.write_bytes((DATA / data).read_bytes())
     gold_output_path = os.path.splitext(str(input_path))[0] + "." + str(output_type)
-    with open(input_path, "r" if data in (GLOVE, W2V_TEXT) else "rb") as input_path:
-        with patch("word_vectors.convert_module.write") as write_patch:
-            w, wv = read(input_path)
-            convert(input_path, output_file_type=output_type)
-            call_file, call_w, call_wv, call_type = write_patch.call_args_list[0][0]
-            assert str(call_file) == gold_output_path
-            assert call_w == w
-            np.testing.assert_allclose(call_wv, wv)
-            assert call_type is output_type
-
-
-def test_convert_with_output_open():
+    with open(input_path, "r" if data in (GLOVE, W2V_TEXT) else "rb") as input_file:
+        convert(input_file, output_file_type=output_type)
+    check_output(gold_output_path, output_type)
+
+
+def test_convert_with_output_open(tmp_path):
     data = random.choice([GLOVE, W2V, W2V_TEXT, LEADER])
     output_type = random.choice(list(FileType))
-    output = rand_str()
-    input_path = DATA / data
-    print(output)
-    try:
-        with open(input_path, "r" if data in (GLOVE, W2V_TEXT) else "rb") as input_path:
-            with open(output, "w" if output_type in (FileType.GLOVE, FileType.W2V_TEXT) else "wb") as output:
-                with patch("word_vectors.convert_module.write") as write_patch:
-                    w, wv = read(input_path)
-                    convert(input_path, output, output_file_type=output_type)
-                    call_file, call_w, call_wv, call_type = write_patch.call_args_list[0][0]
-                    assert call_file == output
-                    assert call_w == w
-                    assert call_type == output_type
-                    np.testing.assert_allclose(call_wv, wv)
-    finally:
-        os.remove(output.name)
-
-
-def test_convert_with_input_open():
+    output = tmp_path / rand_str()
+    with open(DATA / data, "r" if data in (GLOVE, W2V_TEXT) else "rb") as input_file:
+        with open(output, "w" if output_type in (FileType.GLOVE, FileType.W2V_TEXT) else "wb") as output_file:
+            convert(input_file, output_file, output_file_type=output_type)
+            assert not output_file.closed
+    check_output(output, output_type)
+
+
+def test_convert_with_input_open(tmp_path):
     data = random.choice([GLOVE, W2V, W2V_TEXT, LEADER])
     input_type = INPUT_MAPPING[data]
     output_type = random.choice(list(FileType))
-    input_path = DATA / data
-    output = rand_str()
-    print(output)
-    try:
-        with open(input_path, "r" if data in (GLOVE, W2V_TEXT) else "rb") as input_path:
-            with open(output, "w" if output_type in (FileType.GLOVE, FileType.W2V_TEXT) else "wb") as output:
-                with patch("word_vectors.convert_module.read") as read_patch:
-                    with patch("word_vectors.convert_module.write") as write_patch:
-                        w, wv = read(input_path)
-                        read_patch.return_value = (w, wv)
-                        convert(input_path, output, output_file_type=output_type, input_file_type=input_type)
-                        read_patch.assert_called_once_with(input_path, input_type)
-                        call_file, call_w, call_wv, call_type = write_patch.call_args_list[0][0]
-                        assert call_file == output
-                        assert call_w == w
-                        assert call_type == output_type
-                        np.testing.assert_allclose(call_wv, wv)
-    finally:
-        os.remove(output.name)
+    output = tmp_path / rand_str()
+    with open(DATA / data, "r" if data in (GLOVE, W2V_TEXT) else "rb") as input_file:
+        with open(output, "w" if output_type in (FileType.GLOVE, FileType.W2V_TEXT) else "wb") as output_file:
+            with patch("word_vectors.read_module.sniff") as sniff_patch:
+                convert(input_file, output_file, output_file_type=output_type, input_file_type=input_type)
+                sniff_patch.assert_not_called()
+            assert not input_file.closed
+            assert not output_file.closed
+    check_output(output, output_type)
+
+
+def test_convert_leader_matches_write(tmp_path):
+    output = tmp_path / "vectors.leader"
+    convert(DATA / GLOVE, output, output_file_type=FileType.LEADER)
+    data = output.read_bytes()
+    assert leader_version(data) == 1
+    gold = io.BytesIO()
+    write(gold, vocab, vectors, FileType.LEADER)
+    assert data == gold.getvalue()
+
+
+@pytest.mark.parametrize("output_type", [FileType.W2V_TEXT, FileType.W2V, FileType.LEADER])
+def test_convert_duplicates_matches_write(tmp_path, output_type):
+    output = tmp_path / "vectors.out"
+    convert(DATA / GLOVE_DUPPED, output, output_file_type=output_type)
+    gold = tmp_path / "vectors.gold"
+    write(gold, dupped_vocab, dupped_vectors, output_type)
+    assert output.read_bytes() == gold.read_bytes()
+
+
+@pytest.mark.parametrize("output_type", [FileType.GLOVE, FileType.W2V_TEXT, FileType.W2V, FileType.LEADER])
+def test_convert_duplicates(tmp_path, output_type):
+    words = list(vocab)
+    dupped = words + random.sample(words, 10)
+    dupped_vectors = np.concatenate([vectors, np.random.rand(10, vectors.shape[1]).astype(np.float32)])
+    input_path = tmp_path / "dupped.glove"
+    input_path.write_text("".join(" ".join([w, *map(str, v)]) + "\n" for w, v in zip(dupped, dupped_vectors)))
+    output = tmp_path / "output"
+    convert(input_path, output, output_file_type=output_type, input_file_type=FileType.GLOVE)
+    # The first occurrence of each word is kept, like when reading.
+    check_output(output, output_type)
+
+
+@pytest.mark.parametrize("output_type", [FileType.W2V_TEXT, FileType.W2V])
+def test_convert_patches_count(tmp_path, output_type):
+    input_path = tmp_path / "dupped.glove"
+    lines = (DATA / GLOVE).read_text().splitlines(keepends=True)
+    input_path.write_text("".join(lines + lines[:5]))
+    output = tmp_path / "output"
+    convert(input_path, output, output_file_type=output_type, input_file_type=FileType.GLOVE)
+    # There is room for the count of every line but only the unique ones are written.
+    count = len(str(len(lines) + 5))
+    assert output.read_bytes().startswith(f"{len(vocab):0{count}d} {vectors.shape[1]}\n".encode("utf-8"))
+    check_output(output, output_type)
+
+
+def test_convert_compressed(tmp_path):
+    data = random.choice([GLOVE, W2V, W2V_TEXT, LEADER])
+    input_path = tmp_path / f"{os.path.splitext(data)[0]}.vec.gz"
+    input_path.write_bytes(gzip.compress((DATA / data).read_bytes()))
+    output_type = random.choice(list(FileType))
+    convert(input_path, output_file_type=output_type)
+    w, wv = read(tmp_path / f"{os.path.splitext(data)[0]}.{output_type}", output_type)
+    assert w == vocab
+    np.testing.assert_allclose(wv, vectors)
+
+
+def test_convert_cli_stdin_stdout(monkeypatch):
+    data = random.choice([GLOVE, W2V, W2V_TEXT, LEADER])
+    output_type = random.choice([FileType.GLOVE, FileType.W2V_TEXT, FileType.W2V, FileType.LEADER])
+    stdout = io.TextIOWrapper(io.BytesIO())
+    monkeypatch.setattr(sys, "stdin", io.TextIOWrapper(io.BytesIO((DATA / data).read_bytes())))
+    monkeypatch.setattr(sys, "stdout", stdout)
+    monkeypatch.setattr(sys, "argv", ["convert-embeddings", "-", "--output-format", str(output_type)])
+    main()
+    w, wv = read(io.BytesIO(stdout.buffer.getvalue()), output_type)
+    assert w == vocab
+    np.testing.assert_allclose(wv, vectors)
+
+
+def test_convert_many(tmp_path):
+    data = random.choice([GLOVE, W2V, W2V_TEXT, LEADER])
+    output_types = [FileType.GLOVE, FileType.W2V_TEXT, FileType.W2V, FileType.LEADER]
+    outputs = [tmp_path / rand_str(), None, tmp_path / rand_str(), None]
+    input_path = tmp_path / data
+    input_path.write_bytes((DATA / data).read_bytes())
+    with patch("word_vectors.convert_module.iter_batches", wraps=iter_batches) as iter_patch:
+        convert(input_path, outputs, output_file_type=output_types)
+        iter_patch.assert_called_once()
+    for output, output_type in zip(outputs, output_types):
+        if output is None:
+            output = os.path.splitext(str(input_path))[0] + "." + str(output_type)
+        check_output(output, output_type)
+
+
+def test_convert_many_output_mismatch(tmp_path):
+    with pytest.raises(ValueError):
+        convert(DATA / GLOVE, [tmp_path / "a"], output_file_type=[FileType.W2V, FileType.LEADER])
+    with pytest.raises(ValueError):
+        convert(DATA / GLOVE, str(tmp_path / "a"), output_file_type=[FileType.W2V, FileType.LEADER])
+
+
+def test_convert_cli_many(tmp_path, monkeypatch):
+    input_path = tmp_path / GLOVE
+    input_path.write_bytes((DATA / GLOVE).read_bytes())
+    output_types = [FileType.W2V, FileType.LEADER]
+    argv = ["convert-embeddings", str(input_path)]
+    for output_type in output_types:
+        argv.extend(["--output-format", str(output_type)])
+    monkeypatch.setattr(sys, "argv", argv)
+    main()
+    for output_type in output_types:
+        check_output(os.path.splitext(str(input_path))[0] + "." + str(output_type), output_type)
+
+
+def test_convert_cli_many_stdout(monkeypatch):
+    monkeypatch.setattr(sys, "argv", ["convert-embeddings", "-", "--output-format", "w2v", "--output-format", "leader"])
+    with pytest.raises(SystemExit):
+        main()
+
+
+def copy_inputs(tmp_path, datas):
+    paths = []
+    for i, data in enumerate(datas):
+        path = tmp_path / f"{i}-{data}"
+        path.write_bytes((DATA / data).read_bytes())
+        paths.append(path)
+    return paths
+
+
+@pytest.mark.parametrize("jobs", ["1", "2"])
+def test_convert_cli_glob(tmp_path, monkeypatch, capsys, jobs):
+    paths = copy_inputs(tmp_path, [GLOVE, W2V, W2V_TEXT])
+    monkeypatch.setattr(
+        sys, "argv", ["convert-embeddings", str(tmp_path / "*-*"), "--output-format", "leader", "--jobs", jobs]
+    )
+    main()
+    for path in paths:
+        check_output(os.path.splitext(str(path))[0] + ".leader", FileType.LEADER)
+    err = capsys.readouterr().err
+    assert "[3/3]" in err
+    assert "MB/s" in err
+    for path in paths:
+        assert f"{path}" in err
+
+
+def test_convert_cli_skips_up_to_date(tmp_path, monkeypatch, capsys):
+    glove, w2v = copy_inputs(tmp_path, [GLOVE, W2V])
+    monkeypatch.setattr(sys, "argv", ["convert-embeddings", str(glove), str(w2v), "--output-format", "leader"])
+    main()
+    capsys.readouterr()
+    # Make the first input newer than its output.
+    old = os.path.getmtime(os.path.splitext(str(glove))[0] + ".leader")
+    os.utime(glove, (old + 10, old + 10))
+    with patch("word_vectors.scripts.convert_embeddings.convert") as convert_patch:
+        main()
+        convert_patch.assert_called_once()
+        assert convert_patch.call_args[0][0] == str(glove)
+    err = capsys.readouterr().err
+    assert f"{w2v}: up to date" in err
+    monkeypatch.setattr(sys, "argv", sys.argv + ["--force"])
+    with patch("word_vectors.scripts.convert_embeddings.convert") as convert_patch:
+        main()
+        assert convert_patch.call_count == 2
+
+
+def test_convert_cli_only_stale_formats(tmp_path, monkeypatch):
+    (glove,) = copy_inputs(tmp_path, [GLOVE])
+    monkeypatch.setattr(sys, "argv", ["convert-embeddings", str(glove), "--output-format", "leader"])
+    main()
+    argv = ["convert-embeddings", str(glove), "--output-format", "leader", "--output-format", "w2v"]
+    monkeypatch.setattr(sys, "argv", argv)
+    with patch("word_vectors.scripts.convert_embeddings.convert") as convert_patch:
+        main()
+        assert convert_patch.call_args[1]["output_file_type"] == [FileType.W2V]
+
+
+def test_convert_cli_failure(tmp_path, monkeypatch, capsys):
+    (glove,) = copy_inputs(tmp_path, [GLOVE])
+    bad = tmp_path / "bad.glove"
+    bad.write_text("not vectors\n")
+    monkeypatch.setattr(sys, "argv", ["convert-embeddings", str(glove), str(bad), "--input-format", "glove"])
+    with pytest.raises(SystemExit):
+        main()
+    assert "failed" in capsys.readouterr().err
+    check_output(os.path.splitext(str(glove))[0] + ".leader", FileType.LEADER)
+    assert not os.path.exists(tmp_path / "bad.leader")
+
+
+def test_convert_cli_no_match(tmp_path, monkeypatch):
+    monkeypatch.setattr(sys, "argv", ["convert-embeddings", str(tmp_path / "*.vec")])
+    with pytest.raises(SystemExit):
+        main()
+
+
+def test_convert_cli_precision(tmp_path, monkeypatch):
+    (glove,) = copy_inputs(tmp_path, [GLOVE])
+    output = tmp_path / "output.glove"
+    argv = ["convert-embeddings", str(glove), "--output-format", "glove", "--output", str(output), "--precision", "5"]
+    monkeypatch.setattr(sys, "argv", argv)
+    main()
+    w, wv = read(output, FileType.GLOVE)
+    assert w == vocab
+    np.testing.assert_allclose(wv, vectors, rtol=1e-4)
+    assert output.stat().st_size < glove.stat().st_size
@@ -0,0 +1,234 @@
+import os
+import random
+import shutil
+import logging
+import builtins
+import pytest
+import numpy as np
+import word_vectors
+from word_vectors import FileType
+from word_vectors.read import read, read_with_vocab, read_glove_with_vocab, parse_text_vector
+from word_vectors.index import LeaderIndex, TextIndex, build_index, load_index, sidecar_path
+from word_vectors.write import write_leader
+from utils import (
+    vocab,
+    vectors,
+    DATA,
+    LEADER,
+    GLOVE,
+    W2V,
+    W2V_TEXT,
+    GLOVE_DUPPED,
+    W2V_TEXT_DUPPED,
+    dupped_vocab,
+    dupped_vectors,
+    rand_str,
+)
+
+
+@pytest.fixture
+def leader_v2(tmp_path):
+    path = tmp_path / "leader-v2.bin"
+    write_leader(path, vocab, vectors, version=2)
+    return path
+
+
+@pytest.fixture
+def big_leader(tmp_path):
+    path = tmp_path / "big.leader"
+    words = list({rand_str(min_=1, max_=10) for _ in range(2000)})
+    big_vocab = {w: i for i, w in enumerate(words)}
+    big_vectors = np.random.rand(len(words), 8).astype(np.float32)
+    write_leader(path, big_vocab, big_vectors, version=2)
+    return path, big_vocab, big_vectors
+
+
+def test_leader_index_get(leader_v2):
+    with LeaderIndex(leader_v2) as index:
+        assert len(index) == len(vocab)
+        assert index.dim == vectors.shape[1]
+        for word, idx in vocab.items():
+            np.testing.assert_allclose(index.get(word), vectors[idx])
+            np.testing.assert_allclose(index[word], vectors[idx])
+            assert index.find(word) == idx
+            assert index.word(idx) == word
+
+
+def test_leader_index_missing(leader_v2):
+    with LeaderIndex(leader_v2) as index:
+        missing = rand_str(20)
+        assert missing not in index
+        assert index.find(missing) == -1
+        assert index.get(missing) is None
+        with pytest.raises(KeyError):
+            index[missing]
+
+
+def test_leader_index_get_many(big_leader):
+    path, big_vocab, big_vectors = big_leader
+    queries = random.sample(list(big_vocab), 100) + [rand_str(20) for _ in range(10)]
+    random.shuffle(queries)
+    with LeaderIndex(path) as index:
+        found_vectors, found = index.get_many(queries)
+    for word, vector, was_found in zip(queries, found_vectors, found):
+        if word in big_vocab:
+            assert was_found
+            np.testing.assert_allclose(vector, big_vectors[big_vocab[word]])
+        else:
+            assert not was_found
+            np.testing.assert_allclose(vector, 0)
+
+
+def test_leader_index_opened(leader_v2):
+    with open(leader_v2, "rb") as f:
+        with LeaderIndex(f) as index:
+            np.testing.assert_allclose(index.get("3"), vectors[3])
+
+
+def test_leader_index_v1_raises():
+    with pytest.raises(ValueError):
+        LeaderIndex(DATA / LEADER)
+
+
+def test_leader_index_no_index_raises(tmp_path):
+    path = tmp_path / "no-index.leader"
+    write_leader(path, vocab, vectors, version=2, index=False)
+    with pytest.raises(ValueError):
+        LeaderIndex(path)
+
+
+@pytest.fixture(params=[GLOVE, W2V_TEXT])
+def indexed(tmp_path, request):
+    path = tmp_path / request.param
+    shutil.copy(DATA / request.param, path)
+    build_index(path)
+    return path
+
+
+def test_build_index(indexed):
+    assert os.path.exists(sidecar_path(indexed))
+    with TextIndex(indexed) as index:
+        assert index.is_fresh()
+        assert len(index) == len(vocab)
+        assert index.dim == vectors.shape[1]
+        assert list(index) == list(vocab)
+        with open(indexed, "rb") as f:
+            buf = f.read()
+        for word, idx in vocab.items():
+            np.testing.assert_allclose(parse_text_vector(buf, index[word]), vectors[idx])
+        assert rand_str(20) not in index
+
+
+@pytest.mark.parametrize("data", [GLOVE_DUPPED, W2V_TEXT_DUPPED])
+def test_build_index_dupped(tmp_path, data):
+    path = tmp_path / data
+    shutil.copy(DATA / data, path)
+    build_index(path)
+    with TextIndex(path) as index:
+        assert index.lines == len(dupped_vectors) + 1
+        assert len(index) == len(dupped_vocab)
+        assert list(index) == list(dupped_vocab)
+    w, wv = read(path)
+    assert w == dupped_vocab
+    np.testing.assert_allclose(wv, dupped_vectors)
+
+
+def test_build_index_binary_raises():
+    with pytest.raises(ValueError):
+        build_index(DATA / W2V)
+
+
+def test_load_index_missing(tmp_path):
+    path = tmp_path / GLOVE
+    shutil.copy(DATA / GLOVE, path)
+    assert load_index(path) is None
+
+
+def test_load_index_rebuilds_stale(indexed):
+    file_type = FileType.GLOVE if indexed.name == GLOVE else FileType.W2V_TEXT
+    new_vocab = {rand_str(min_=6, max_=8): i for i in range(5)}
+    new_vectors = np.random.rand(len(new_vocab), 4).astype(np.float32)
+    word_vectors.write(indexed, new_vocab, new_vectors, file_type)
+    stat = os.stat(indexed)
+    # Make sure the modification time changes even on file systems with coarse timestamps.
+    os.utime(indexed, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+    with TextIndex(indexed) as index:
+        assert not index.is_fresh()
+    with load_index(indexed) as index:
+        assert index.is_fresh()
+        assert len(index) == len(new_vocab)
+        assert index.dim == 4
+        assert set(index) == set(new_vocab)
+
+
+def test_read_stale_index_read_only(indexed, monkeypatch, caplog):
+    file_type = FileType.GLOVE if indexed.name == GLOVE else FileType.W2V_TEXT
+    new_vocab = {rand_str(min_=6, max_=8): i for i in range(5)}
+    new_vectors = np.random.rand(len(new_vocab), 4).astype(np.float32)
+    word_vectors.write(indexed, new_vocab, new_vectors, file_type)
+    stat = os.stat(indexed)
+    os.utime(indexed, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+    sidecar = open(sidecar_path(indexed), "rb").read()
+    real_open = builtins.open
+
+    def read_only(path, mode="r", *args, **kwargs):
+        if "w" in mode:
+            raise PermissionError(13, "Permission denied", path)
+        return real_open(path, mode, *args, **kwargs)
+
+    # Chmod doesn't stop root from writing so fail the writes directly.
+    monkeypatch.setattr(builtins, "open", read_only)
+    with caplog.at_level(logging.WARNING, logger="word_vectors"):
+        assert load_index(indexed) is None
+        w, wv = read(indexed, file_type)
+    monkeypatch.undo()
+    assert "Unable to rebuild the sidecar index" in caplog.text
+    assert w == new_vocab
+    np.testing.assert_allclose(wv, new_vectors, atol=1e-6)
+    assert open(sidecar_path(indexed), "rb").read() == sidecar
+    assert sorted(os.listdir(indexed.parent)) == sorted([indexed.name, os.path.basename(sidecar_path(indexed))])
+
+
+def test_read_uses_index(indexed, monkeypatch):
+    def fail(f):
+        raise AssertionError("The file should not be scanned to count lines.")
+
+    monkeypatch.setattr(word_vectors.read_module, "_count_lines", fail)
+    monkeypatch.setattr(word_vectors.read_module, "_count_w2v", fail)
+    w, wv = read(indexed)
+    assert w == vocab
+    np.testing.assert_allclose(wv, vectors)
+
+
+def test_read_with_vocab_uses_index(indexed, monkeypatch):
+    def fail(f):
+        raise AssertionError("The whole file should not be read.")
+
+    monkeypatch.setattr(word_vectors.read_module, "read_glove_lines", fail)
+    monkeypatch.setattr(word_vectors.read_module, "read_w2v_text_lines", fail)
+    user_vocab = {w: i for i, w in enumerate(random.sample(list(vocab), 5) + [rand_str(20)])}
+    w, wv = read_with_vocab(indexed, dict(user_vocab), initializer=lambda x: np.full(x, -1))
+    assert w == user_vocab
+    for word, idx in user_vocab.items():
+        if word in vocab:
+            np.testing.assert_allclose(wv[idx], vectors[vocab[word]])
+        else:
+            np.testing.assert_allclose(wv[idx], -1)
+
+
+def test_read_glove_with_vocab_index_dupped(tmp_path):
+    path = tmp_path / GLOVE_DUPPED
+    shutil.copy(DATA / GLOVE_DUPPED, path)
+    build_index(path)
+    w, wv = read_glove_with_vocab(path, {"c": 0, "a": 1})
+    np.testing.assert_allclose(wv[0], dupped_vectors[dupped_vocab["c"]])
+    np.testing.assert_allclose(wv[1], dupped_vectors[dupped_vocab["a"]])
+
+
+def test_store_uses_index(indexed):
+    with word_vectors.open(indexed) as store:
+        assert isinstance(store._offsets, TextIndex)
+        assert len(store) == len(vocab)
+        assert store.dim == vectors.shape[1]
+        for word, idx in vocab.items():
+            np.testing.assert_allclose(store[word], vectors[idx])
@@ -1,24 +1,53 @@
+import io
+import bz2
+import gzip
+import lzma
 import struct
 import random
+import zipfile
 from copy import deepcopy
 from itertools import chain
 from operator import itemgetter
 from pathlib import Path
 import pytest
 import numpy as np
-from word_vectors import FileType, LEADER_MAGIC_NUMBER
+from word_vectors import FileType, LEADER_MAGIC_NUMBER, LONG_SIZE, FLOAT_SIZE, read_module as word_vectors_read
 from word_vectors.read import (
     read,
     read_with_vocab,
+    read_with_vocabs,
+    reindex,
+    iter_batches,
     read_glove,
     read_w2v,
     read_w2v_text,
     read_leader,
+    read_glove_lines,
+    read_w2v_lines,
+    read_glove_blocks,
+    read_w2v_text_blocks,
+    _parse_text_block,
+    _text_ranges,
+    _read_with_vocab,
+    _scan_glove,
+    _gather_vectors,
+    _count_lines,
+    _count_w2v,
+    _count_leader,
+    _ensure_rows,
+    _trim,
     sniff,
     GLOVE_BIN,
     read_leader_header,
+    read_leader_v2_header,
+    read_leader_lines,
+    read_leader_with_vocab,
+    leader_version,
     verify_leader,
 )
+from word_vectors.write import write_leader, write_w2v
+from word_vectors.utils import uniform_initializer, hashed_uniform, hash_words
+from word_vectors.vocab import CompactVocab, BucketVocab
 from utils import (
     vocab,
     vectors,
@@ -502,6 +531,595 @@ def test_read_leader_dupped_opened(dupped_vocab, dupped_vectors):
     np.testing.assert_allclose(wv, dupped_vectors)
 
 
+def test_read_glove_blocks(gold_vocab, gold_vectors):
+    block_size = random.randint(1, 200)
+    blocks = list(read_glove_blocks(DATA / GLOVE, block_size=block_size))
+    assert len(blocks) > 1
+    words = list(chain(*(w for w, _ in blocks)))
+    assert words == list(gold_vocab)
+    np.testing.assert_allclose(np.concatenate([wv for _, wv in blocks]), gold_vectors)
+
+
+def test_read_w2v_text_blocks(gold_vocab, gold_vectors):
+    block_size = random.randint(1, 200)
+    blocks = list(read_w2v_text_blocks(DATA / W2V_TEXT, block_size=block_size))
+    words = list(chain(*(w for w, _ in blocks)))
+    assert words == list(gold_vocab)
+    np.testing.assert_allclose(np.concatenate([wv for _, wv in blocks]), gold_vectors)
+
+
+def test_read_glove_blocks_matches_lines():
+    block_words, block_vectors = zip(*read_glove_blocks(DATA / GLOVE_DUPPED, block_size=2 ** 20))
+    line_words, line_vectors = zip(*read_glove_lines(DATA / GLOVE_DUPPED))
+    assert list(chain(*block_words)) == list(line_words)
+    np.testing.assert_allclose(np.concatenate(block_vectors), np.stack(line_vectors))
+
+
+def test_parse_text_block_no_trailing_newline():
+    words, vectors = _parse_text_block(b"a 1.0 2.0\nb 3.0 4.0")
+    assert words == ["a", "b"]
+    np.testing.assert_allclose(vectors, [[1.0, 2.0], [3.0, 4.0]])
+
+
+def test_parse_text_block_ragged_falls_back():
+    with pytest.raises(ValueError):
+        _parse_text_block(b"a 1.0 2.0\nb 3.0\n")
+
+
+@pytest.mark.parametrize("data", [GLOVE, W2V_TEXT])
+def test_read_parallel(data, gold_vocab, gold_vectors):
+    w, wv = read(DATA / data, workers=2)
+    assert w == gold_vocab
+    assert wv.dtype == np.float32
+    np.testing.assert_allclose(wv, gold_vectors)
+
+
+@pytest.mark.parametrize("data,reader", [(GLOVE_DUPPED, read_glove), (W2V_TEXT_DUPPED, read_w2v_text)])
+def test_read_parallel_dupped(data, reader, dupped_vocab, dupped_vectors):
+    with open(DATA / data) as f:
+        w, wv = reader(f, workers=3)
+    assert w == dupped_vocab
+    np.testing.assert_allclose(wv, dupped_vectors)
+
+
+def test_read_parallel_no_trailing_newline(tmp_path):
+    path = tmp_path / "vectors.txt"
+    path.write_text("a 1.0 2.0\nb 3.0 4.0\na 5.0 6.0\nc 7.0 8.0")
+    w, wv = read_glove(path, workers=2)
+    assert w == {"a": 0, "b": 1, "c": 2}
+    np.testing.assert_allclose(wv, [[1.0, 2.0], [3.0, 4.0], [7.0, 8.0]])
+
+
+def test_read_parallel_without_shared_memory(monkeypatch, gold_vocab, gold_vectors):
+    monkeypatch.setattr(word_vectors_read, "shared_memory", None)
+    w, wv = read_glove(DATA / GLOVE, workers=2)
+    assert w == gold_vocab
+    np.testing.assert_allclose(wv, gold_vectors)
+
+
+def test_text_ranges():
+    with open(DATA / GLOVE, "rb") as f:
+        data = f.read()
+    ranges = list(_text_ranges(data, 0, random.randint(1, 200)))
+    assert ranges[0][0] == 0
+    assert ranges[-1][1] == len(data)
+    for (_, end), (start, _) in zip(ranges, ranges[1:]):
+        assert end == start
+        assert data[end - 1 : end] == b"\n"
+
+
+def test_read_with_vocab_stops_early(gold_vocab, gold_vectors):
+    user_vocab = {w: i for i, w in enumerate(random.sample(list(gold_vocab)[:5], 3))}
+
+    def scanner(m):
+        dim, words = _scan_glove(m)
+
+        def first_five():
+            for i, row in enumerate(words):
+                if i == 5:
+                    raise AssertionError("Reading should have stopped once all the words were found.")
+                yield row
+
+        return dim, first_five()
+
+    w, wv = _read_with_vocab(DATA / GLOVE, scanner, dict(user_vocab), lambda x: np.zeros(x))
+    assert w == user_vocab
+    for word, idx in user_vocab.items():
+        np.testing.assert_allclose(wv[idx], gold_vectors[gold_vocab[word]])
+
+
+@pytest.mark.parametrize("data", [GLOVE, W2V_TEXT, W2V, LEADER])
+def test_read_with_vocab_only_parses_matches(data, monkeypatch, gold_vocab, gold_vectors):
+    parsed = []
+    for name in ("parse_text_vector", "parse_binary_vector"):
+        parse = getattr(word_vectors_read, name)
+
+        def counted(*args, parse=parse, **kwargs):
+            parsed.append(args[1])
+            return parse(*args, **kwargs)
+
+        monkeypatch.setattr(word_vectors_read, name, counted)
+    user_vocab = {w: i for i, w in enumerate(random.sample(list(gold_vocab), 4) + [rand_str(20)])}
+    w, wv = read_with_vocab(DATA / data, dict(user_vocab), initializer=lambda x: np.zeros(x))
+    assert len(parsed) == 4
+    for word, idx in user_vocab.items():
+        if word in gold_vocab:
+            np.testing.assert_allclose(wv[idx], gold_vectors[gold_vocab[word]])
+
+
+def test_read_with_vocab_nothing_found(gold_vectors):
+    user_vocab = {rand_str(20): 0, rand_str(21): 1}
+    w, wv = read_with_vocab(DATA / GLOVE, user_vocab, initializer=lambda x: np.ones(x))
+    assert wv.shape == (2, gold_vectors.shape[1])
+    np.testing.assert_allclose(wv, 1)
+
+
+@pytest.mark.parametrize("data", [GLOVE, LEADER])
+def test_read_with_vocab_hashed_initializer(data, gold_vocab, gold_vectors):
+    missing = [rand_str(20) for _ in range(3)]
+    user_vocab = {missing[0]: 3, random.choice(list(gold_vocab)): 1, missing[1]: 0, missing[2]: 2}
+    init = uniform_initializer(0.25, seed=7, hashed=True)
+    w, wv = read_with_vocab(DATA / data, dict(user_vocab), initializer=init)
+    gold = hashed_uniform(hash_words(missing), gold_vectors.shape[1], 0.25, 7)
+    for word, vector in zip(missing, gold):
+        np.testing.assert_allclose(wv[user_vocab[word]], vector, rtol=1e-6)
+    # The vectors only depend on the word.
+    w, wv = read_with_vocab(DATA / data, {missing[2]: 0}, initializer=init)
+    np.testing.assert_allclose(wv[0], gold[2], rtol=1e-6)
+
+
+def test_read_with_vocab_seeded_initializer(gold_vocab):
+    user_vocab = {rand_str(20): i for i in range(4)}
+    _, first = read_with_vocab(DATA / GLOVE, dict(user_vocab), initializer=uniform_initializer(0.25, seed=11))
+    _, second = read_with_vocab(DATA / GLOVE, dict(user_vocab), initializer=uniform_initializer(0.25, seed=11))
+    np.testing.assert_array_equal(first, second)
+
+
+@pytest.mark.parametrize("data", [GLOVE, W2V_TEXT, W2V, LEADER])
+def test_read_with_vocab_oov_buckets(data, gold_vocab, gold_vectors):
+    present = random.sample(list(gold_vocab), 3)
+    missing = [rand_str(20) for _ in range(50)]
+    words = present + missing
+    random.shuffle(words)
+    user_vocab = {word: i for i, word in enumerate(words)}
+    w, wv = read_with_vocab(DATA / data, dict(user_vocab), initializer=uniform_initializer(0.25, seed=1), oov_buckets=4)
+    assert isinstance(w, BucketVocab)
+    assert wv.shape == (3 + 4, gold_vectors.shape[1])
+    # Found words keep their relative order.
+    assert list(w) == sorted(present, key=user_vocab.get)
+    for word in present:
+        np.testing.assert_allclose(wv[w[word]], gold_vectors[gold_vocab[word]])
+    for word in missing + [rand_str(21)]:
+        assert word not in w
+        assert 3 <= w[word] < 3 + 4
+        assert w[word] == w.bucket(word)
+    np.testing.assert_array_equal(w.lookup(words), [w[word] for word in words])
+
+
+def test_read_with_vocab_oov_buckets_keep_extra(gold_vocab, gold_vectors):
+    present = random.choice(list(gold_vocab))
+    user_vocab = {rand_str(20): 0, present: 1, rand_str(21): 2}
+    w, wv = read_with_vocab(DATA / GLOVE, dict(user_vocab), keep_extra=True, oov_buckets=2)
+    assert len(w) == len(gold_vocab)
+    assert len(wv) == len(gold_vocab) + 2
+    assert w[present] == 0
+    for word, idx in w.items():
+        np.testing.assert_allclose(wv[idx], gold_vectors[gold_vocab[word]])
+
+
+def test_read_with_vocab_oov_buckets_compact():
+    user_vocab = CompactVocab.from_words([rand_str(20), "1", rand_str(20)])
+    w, wv = read_with_vocab(DATA / GLOVE, user_vocab, oov_buckets=3)
+    assert isinstance(w.vocab, CompactVocab)
+    assert dict(w) == {"1": 0}
+    assert len(wv) == 4
+
+
+def test_read_with_vocab_oov_buckets_invalid():
+    with pytest.raises(ValueError):
+        read_with_vocab(DATA / GLOVE, {"1": 0}, oov_buckets=0)
+
+
+@pytest.mark.parametrize("data", [GLOVE, W2V_TEXT, W2V, LEADER])
+def test_read_with_vocabs(data, gold_vocab, gold_vectors):
+    words = list(gold_vocab)
+    user_vocabs = {
+        "a": {w: i for i, w in enumerate(random.sample(words, 4) + [rand_str(20)])},
+        "b": {w: i for i, w in zip([2, 0, 1], random.sample(words, 2) + [rand_str(21)])},
+        "empty": {},
+    }
+    init = uniform_initializer(0.25, seed=3)
+    results = read_with_vocabs(DATA / data, {k: dict(v) for k, v in user_vocabs.items()}, initializer=init)
+    assert set(results) == set(user_vocabs)
+    # A fresh initializer with the same seed creates the same vectors when the vocabs are read in the same order.
+    init = uniform_initializer(0.25, seed=3)
+    for name, user_vocab in user_vocabs.items():
+        w, wv = results[name]
+        gold_w, gold_wv = read_with_vocab(DATA / data, dict(user_vocab), initializer=init)
+        assert w == gold_w == user_vocab
+        np.testing.assert_allclose(wv, gold_wv)
+
+
+def test_read_with_vocabs_single_scan(monkeypatch, gold_vocab):
+    scans = []
+
+    def scan(m, scanner=word_vectors_read._scan_glove):
+        scans.append(m)
+        return scanner(m)
+
+    user_vocabs = {str(i): {w: 0} for i, w in enumerate(gold_vocab)}
+    user_vocabs["missing"] = {rand_str(20): 0}
+    monkeypatch.setattr(word_vectors_read, "_scan_glove", scan)
+    results = read_with_vocabs(DATA / GLOVE, user_vocabs, file_type=FileType.GLOVE)
+    assert len(scans) == 1
+    assert len(results) == len(gold_vocab) + 1
+
+
+def test_read_with_vocabs_dupped(dupped_vocab, dupped_vectors):
+    results = read_with_vocabs(DATA / GLOVE_DUPPED, {"x": {"a": 0}, "y": {"c": 1, "a": 0}})
+    np.testing.assert_allclose(results["x"][1][0], dupped_vectors[dupped_vocab["a"]])
+    np.testing.assert_allclose(results["y"][1], dupped_vectors[[dupped_vocab["a"], dupped_vocab["c"]]])
+
+
+def test_read_with_vocabs_oov_buckets(gold_vocab):
+    word = random.choice(list(gold_vocab))
+    results = read_with_vocabs(DATA / GLOVE, {"a": {rand_str(20): 0, word: 1}, "b": {word: 0}}, oov_buckets=2)
+    assert all(isinstance(w, BucketVocab) for w, _ in results.values())
+    assert len(results["a"][1]) == len(results["b"][1]) == 3
+
+
+def _user_vocab(gold_vocab):
+    words = random.sample(list(gold_vocab), 5) + [rand_str(20), rand_str(21)]
+    random.shuffle(words)
+    return {w: i for i, w in enumerate(words)}
+
+
+@pytest.mark.parametrize("keep_extra", [False, True])
+@pytest.mark.parametrize("oov_buckets", [None, 3])
+def test_reindex_matches_read_with_vocab(keep_extra, oov_buckets, gold_vocab):
+    user_vocab = _user_vocab(gold_vocab)
+    gold_w, gold_wv = read_with_vocab(
+        DATA / GLOVE,
+        dict(user_vocab),
+        initializer=uniform_initializer(0.25, seed=5),
+        keep_extra=keep_extra,
+        oov_buckets=oov_buckets,
+    )
+    w, wv = read(DATA / GLOVE)
+    init = uniform_initializer(0.25, seed=5)
+    w, wv = reindex(w, wv, dict(user_vocab), initializer=init, keep_extra=keep_extra, oov_buckets=oov_buckets)
+    assert dict(w.items()) == dict(gold_w.items())
+    np.testing.assert_array_equal(wv, gold_wv)
+
+
+def test_reindex_dupped():
+    user_vocab = {"c": 0, "a": 1, "z": 2}
+    gold_w, gold_wv = read_with_vocab(DATA / GLOVE_DUPPED, dict(user_vocab), initializer=lambda x: np.zeros(x))
+    w, wv = read(DATA / GLOVE_DUPPED)
+    w, wv = reindex(w, wv, dict(user_vocab), initializer=lambda x: np.zeros(x))
+    assert w == gold_w
+    np.testing.assert_array_equal(wv, gold_wv)
+
+
+def test_reindex_compact_keep_extra(gold_vocab, gold_vectors):
+    user_vocab = CompactVocab.from_vocab(_user_vocab(gold_vocab))
+    w, wv = reindex(gold_vocab, gold_vectors, user_vocab, keep_extra=True)
+    assert isinstance(w, CompactVocab)
+    assert set(w) == set(gold_vocab) | set(user_vocab)
+    for word, idx in gold_vocab.items():
+        np.testing.assert_array_equal(wv[w[word]], gold_vectors[idx])
+
+
+def test_read_with_vocab_early_stop_keeps_first(dupped_vocab, dupped_vectors):
+    w, wv = read_with_vocab(DATA / GLOVE_DUPPED, {"a": 0})
+    np.testing.assert_allclose(wv[0], dupped_vectors[dupped_vocab["a"]])
+
+
+def test_gather_vectors():
+    dim = random.randint(1, 10)
+    gold = np.random.rand(100, dim).astype(np.float32)
+    buf = bytearray()
+    starts = []
+    for vector in gold:
+        buf.extend(b" " * random.randint(0, 7))
+        starts.append(len(buf))
+        buf.extend(vector.tobytes())
+    vectors = _gather_vectors(bytes(buf), np.array(starts), dim)
+    np.testing.assert_array_equal(vectors, gold)
+
+
+def test_read_w2v_matches_lines(tmp_path):
+    path = tmp_path / "vectors.w2v"
+    words = list({rand_str(min_=1, max_=12) for _ in range(200)})
+    gold = np.random.rand(len(words), 7).astype(np.float32)
+    write_w2v(path, {w: i for i, w in enumerate(words)}, gold)
+    w, wv = read_w2v(path)
+    assert list(w) == words
+    np.testing.assert_array_equal(wv, gold)
+    line_words, line_vectors = zip(*read_w2v_lines(path))
+    assert list(line_words) == words
+    np.testing.assert_array_equal(np.stack(line_vectors), gold)
+
+
+@pytest.mark.parametrize("data", [GLOVE, W2V_TEXT, W2V, LEADER])
+def test_iter_batches(data, gold_vocab, gold_vectors):
+    batch_size = random.randint(1, len(gold_vocab) + 2)
+    batches = list(iter_batches(DATA / data, batch_size=batch_size))
+    assert all(len(words) == batch_size for words, _ in batches[:-1])
+    assert 0 < len(batches[-1][0]) <= batch_size
+    for words, batch in batches:
+        assert len(words) == len(batch)
+        assert batch.dtype == np.float32
+    assert list(chain(*(w for w, _ in batches))) == list(gold_vocab)
+    np.testing.assert_allclose(np.concatenate([b for _, b in batches]), gold_vectors)
+
+
+@pytest.mark.parametrize("data", [GLOVE_DUPPED, W2V_TEXT_DUPPED, W2V_DUPPED, LEADER_DUPPED])
+def test_iter_batches_keeps_duplicates(data):
+    words, batch = zip(*iter_batches(DATA / data, batch_size=1))
+    assert list(chain(*words)) == ["a", "b", "a", "c"]
+    np.testing.assert_allclose(np.concatenate(batch), np.arange(4 * 20, dtype=np.float32).reshape(4, -1))
+
+
+def test_iter_batches_leader_v2(leader_v2, gold_vocab, gold_vectors):
+    batches = list(iter_batches(leader_v2, batch_size=4))
+    assert list(chain(*(w for w, _ in batches))) == list(gold_vocab)
+    np.testing.assert_allclose(np.concatenate([b for _, b in batches]), gold_vectors)
+
+
+def test_iter_batches_bad_size():
+    with pytest.raises(ValueError):
+        next(iter_batches(DATA / GLOVE, batch_size=0))
+
+
+def _compress(path, codec, output):
+    data = path.read_bytes()
+    if codec == "zip":
+        with zipfile.ZipFile(output, "w") as archive:
+            archive.writestr(path.name, data)
+        return output
+    compress = {"gzip": gzip.compress, "bz2": bz2.compress, "xz": lzma.compress}[codec]
+    output.write_bytes(compress(data))
+    return output
+
+
+@pytest.mark.parametrize("codec", ["gzip", "bz2", "xz", "zip"])
+@pytest.mark.parametrize(
+    "data,file_type",
+    [(GLOVE, FileType.GLOVE), (W2V_TEXT, FileType.W2V_TEXT), (W2V, FileType.W2V), (LEADER, FileType.LEADER)],
+)
+def test_read_compressed(tmp_path, codec, data, file_type, gold_vocab, gold_vectors):
+    path = _compress(DATA / data, codec, tmp_path / f"{data}.compressed")
+    assert sniff(path) is file_type
+    w, wv = read(path)
+    assert w == gold_vocab
+    assert wv.dtype == np.float32
+    np.testing.assert_allclose(wv, gold_vectors)
+
+
+@pytest.mark.parametrize("data", [GLOVE_DUPPED, W2V_TEXT_DUPPED, W2V_DUPPED, LEADER_DUPPED])
+def test_read_compressed_dupped(tmp_path, data, dupped_vocab, dupped_vectors):
+    path = _compress(DATA / data, "gzip", tmp_path / f"{data}.gz")
+    w, wv = read(path)
+    assert w == dupped_vocab
+    np.testing.assert_allclose(wv, dupped_vectors)
+
+
+def test_read_compressed_leader_v2(tmp_path, leader_v2, gold_vocab, gold_vectors):
+    path = _compress(leader_v2, "xz", tmp_path / "leader.xz")
+    w, wv = read(path)
+    assert w == gold_vocab
+    np.testing.assert_allclose(wv, gold_vectors)
+
+
+def test_read_compressed_small_chunks(tmp_path, monkeypatch, gold_vocab, gold_vectors):
+    # Make sure words and vectors that are split across chunks are put back together.
+    monkeypatch.setattr(word_vectors_read, "BLOCK_SIZE", random.randint(1, 50))
+    for data in (GLOVE, W2V_TEXT, W2V, LEADER):
+        path = _compress(DATA / data, "gzip", tmp_path / f"{data}.gz")
+        w, wv = read(path)
+        assert w == gold_vocab
+        np.testing.assert_allclose(wv, gold_vectors)
+
+
+@pytest.mark.parametrize("data", [GLOVE, W2V])
+def test_iter_batches_compressed(tmp_path, data, gold_vocab, gold_vectors):
+    path = _compress(DATA / data, "bz2", tmp_path / f"{data}.bz2")
+    batches = list(iter_batches(path, batch_size=4))
+    assert all(len(w) == 4 for w, _ in batches[:-1])
+    assert list(chain(*(w for w, _ in batches))) == list(gold_vocab)
+    np.testing.assert_allclose(np.concatenate([b for _, b in batches]), gold_vectors)
+
+
+def test_read_compressed_truncated(tmp_path):
+    data = (DATA / W2V).read_bytes()
+    path = tmp_path / "truncated.gz"
+    path.write_bytes(gzip.compress(data[:-10]))
+    with pytest.raises(ValueError):
+        read(path, FileType.W2V)
+
+
+def test_read_with_vocab_compressed_raises(tmp_path, gold_vocab):
+    path = _compress(DATA / GLOVE, "gzip", tmp_path / "glove.gz")
+    with pytest.raises(ValueError):
+        read_with_vocab(path, gold_vocab)
+
+
+class _Pipe(io.RawIOBase):
+    """A stream that can't be rewound or memory mapped, like stdin."""
+
+    def __init__(self, data):
+        self.data = io.BytesIO(data)
+
+    def readable(self):
+        return True
+
+    def readinto(self, b):
+        return self.data.readinto(b)
+
+
+@pytest.mark.parametrize("data", [GLOVE, W2V_TEXT, W2V, LEADER])
+def test_read_bytes_io(data, gold_vocab, gold_vectors):
+    f = io.BytesIO((DATA / data).read_bytes())
+    w, wv = read(f)
+    assert w == gold_vocab
+    np.testing.assert_allclose(wv, gold_vectors)
+
+
+@pytest.mark.parametrize("data", [GLOVE, W2V_TEXT, W2V, LEADER])
+def test_read_pipe(data, gold_vocab, gold_vectors):
+    f = io.BufferedReader(_Pipe((DATA / data).read_bytes()))
+    assert not f.seekable()
+    w, wv = read(f)
+    assert w == gold_vocab
+    np.testing.assert_allclose(wv, gold_vectors)
+
+
+def test_read_pipe_compressed(gold_vocab, gold_vectors):
+    f = io.BufferedReader(_Pipe(gzip.compress((DATA / W2V).read_bytes())))
+    w, wv = read(f)
+    assert w == gold_vocab
+    np.testing.assert_allclose(wv, gold_vectors)
+
+
+def test_read_string_io(gold_vocab, gold_vectors):
+    f = io.StringIO((DATA / GLOVE).read_text())
+    w, wv = read(f)
+    assert w == gold_vocab
+    np.testing.assert_allclose(wv, gold_vectors)
+
+
+@pytest.mark.parametrize(
+    "data,reader", [(GLOVE, read_glove), (W2V_TEXT, read_w2v_text), (W2V, read_w2v), (LEADER, read_leader)]
+)
+def test_readers_bytes_io(data, reader, gold_vocab, gold_vectors):
+    w, wv = reader(io.BytesIO((DATA / data).read_bytes()))
+    assert w == gold_vocab
+    np.testing.assert_allclose(wv, gold_vectors)
+
+
+@pytest.mark.parametrize("data", [GLOVE_DUPPED, W2V_DUPPED])
+def test_read_bytes_io_dupped(data, dupped_vocab, dupped_vectors):
+    w, wv = read(io.BytesIO((DATA / data).read_bytes()))
+    assert w == dupped_vocab
+    np.testing.assert_allclose(wv, dupped_vectors)
+
+
+def test_iter_batches_pipe(gold_vocab, gold_vectors):
+    f = io.BufferedReader(_Pipe((DATA / W2V_TEXT).read_bytes()))
+    batches = list(iter_batches(f, batch_size=4))
+    assert list(chain(*(w for w, _ in batches))) == list(gold_vocab)
+    np.testing.assert_allclose(np.concatenate([b for _, b in batches]), gold_vectors)
+
+
+@pytest.mark.parametrize("data,file_type", [(GLOVE, FileType.GLOVE), (W2V, FileType.W2V)])
+def test_sniff_pipe(data, file_type):
+    f = io.BufferedReader(_Pipe((DATA / data).read_bytes()))
+    assert sniff(f) is file_type
+    # Sniffing doesn't consume the stream.
+    assert f.read() == (DATA / data).read_bytes()
+
+
+def test_count_lines():
+    assert _count_lines(DATA / GLOVE) == len(vocab)
+    assert _count_lines(DATA / GLOVE_DUPPED) == len(dupped_vs) + 1
+
+
+def test_count_header():
+    assert _count_w2v(DATA / W2V) == len(vocab)
+    assert _count_w2v(DATA / W2V_TEXT) == len(vocab)
+    assert _count_leader(DATA / LEADER) == len(vocab)
+
+
+def test_ensure_rows_grows():
+    vectors = np.random.rand(3, 4)
+    grown = _ensure_rows(vectors, 5)
+    assert grown.shape == (6, 4)
+    np.testing.assert_allclose(grown[:3], vectors)
+    assert _ensure_rows(vectors, 3) is vectors
+
+
+def test_trim():
+    vectors = np.random.rand(10, 4).astype(np.float32)
+    gold = vectors[:6].copy()
+    vectors = _trim(vectors, 6)
+    assert vectors.shape == (6, 4)
+    np.testing.assert_allclose(vectors, gold)
+
+
+def test_read_with_vocab_missing_is_float32(gold_vocab):
+    user_vocab = {**gold_vocab, rand_str(10): len(gold_vocab)}
+    data = random.choice([GLOVE, W2V, LEADER, W2V_TEXT])
+    v, wv = read_with_vocab(DATA / data, user_vocab)
+    assert wv.dtype == np.float32
+    assert wv.shape == (len(user_vocab), 20)
+
+
+@pytest.fixture
+def leader_v2(tmp_path):
+    path = tmp_path / "leader-v2.bin"
+    write_leader(path, vocab, vectors, version=2)
+    return path
+
+
+def test_leader_version(leader_v2):
+    assert leader_version(open(DATA / LEADER, "rb").read()) == 1
+    assert leader_version(open(leader_v2, "rb").read()) == 2
+
+
+def test_verify_leader_version(leader_v2):
+    v1 = open(DATA / LEADER, "rb").read()
+    v2 = open(leader_v2, "rb").read()
+    assert verify_leader(v1, version=1)
+    assert not verify_leader(v1, version=2)
+    assert verify_leader(v2, version=2)
+    assert not verify_leader(v2, version=1)
+
+
+def test_sniff_leader_v2(leader_v2):
+    assert sniff(leader_v2) is FileType.LEADER
+
+
+def test_read_leader_v2(leader_v2, gold_vocab, gold_vectors):
+    w, wv = read_leader(leader_v2)
+    assert w == gold_vocab
+    np.testing.assert_allclose(wv, gold_vectors)
+    # The vectors are a view of the memory mapped file.
+    assert not wv.flags.owndata
+    assert wv.flags.writeable
+
+
+def test_read_dispatches_leader_v2(leader_v2, gold_vocab, gold_vectors):
+    w, wv = read(leader_v2)
+    assert w == gold_vocab
+    np.testing.assert_allclose(wv, gold_vectors)
+    assert not wv.flags.owndata
+    with open(leader_v2, "rb") as f:
+        w, wv = read(f, FileType.LEADER)
+    assert w == gold_vocab
+    assert not wv.flags.owndata
+
+
+def test_read_leader_v2_copy_on_write(leader_v2):
+    before = open(leader_v2, "rb").read()
+    _, wv = read_leader(leader_v2)
+    wv[0] = 100
+    assert open(leader_v2, "rb").read() == before
+
+
+def test_read_leader_v2_lines(leader_v2, gold_vocab, gold_vectors):
+    words, wv = zip(*read_leader_lines(leader_v2))
+    assert list(words) == list(gold_vocab)
+    np.testing.assert_allclose(np.stack(wv), gold_vectors)
+
+
+def test_read_leader_v2_with_vocab(leader_v2, gold_vocab, gold_vectors):
+    user_vocab, user_vectors = sample(gold_vocab, gold_vectors, 0.5)
+    v, wv = read_leader_with_vocab(leader_v2, user_vocab)
+    assert v == user_vocab
+    np.testing.assert_allclose(wv, user_vectors)
+
+
 def test_glove_regex_weird_start():
     ex = "<user< -0.4532 23.123\n".encode("utf-8")
     match = GLOVE_BIN.search(ex)
@@ -526,3 +1144,116 @@ def test_sniff_w2v_text():
 def test_sniff_leader():
     x = sniff(DATA / LEADER)
     assert x is FileType.LEADER
+
+
+IO_STRATEGIES = ["mmap-sequential", "mmap-random", "buffered", "pread"]
+
+
+@pytest.mark.parametrize("io_strategy", IO_STRATEGIES)
+@pytest.mark.parametrize("data", [GLOVE, W2V_TEXT, W2V, LEADER])
+def test_read_io_strategy(data, io_strategy, gold_vocab, gold_vectors):
+    w, wv = read(DATA / data, io_strategy=io_strategy)
+    assert w == gold_vocab
+    np.testing.assert_allclose(wv, gold_vectors)
+
+
+@pytest.mark.parametrize("io_strategy", IO_STRATEGIES)
+@pytest.mark.parametrize("data", [GLOVE_DUPPED, W2V_TEXT_DUPPED, W2V_DUPPED, LEADER_DUPPED])
+def test_read_io_strategy_dupped(data, io_strategy, dupped_vocab, dupped_vectors):
+    w, wv = read(DATA / data, io_strategy=io_strategy)
+    assert w == dupped_vocab
+    np.testing.assert_allclose(wv, dupped_vectors)
+
+
+@pytest.mark.parametrize("io_strategy", IO_STRATEGIES)
+@pytest.mark.parametrize(
+    "data,reader", [(GLOVE, read_glove), (W2V_TEXT, read_w2v_text), (W2V, read_w2v), (LEADER, read_leader)]
+)
+def test_readers_io_strategy(data, reader, io_strategy, gold_vocab, gold_vectors):
+    w, wv = reader(DATA / data, io_strategy=io_strategy)
+    assert w == gold_vocab
+    np.testing.assert_allclose(wv, gold_vectors)
+
+
+@pytest.mark.parametrize("io_strategy", IO_STRATEGIES)
+def test_read_leader_v2_io_strategy(leader_v2, io_strategy, gold_vocab, gold_vectors):
+    w, wv = read_leader(leader_v2, io_strategy=io_strategy)
+    assert w == gold_vocab
+    np.testing.assert_allclose(wv, gold_vectors)
+
+
+def _cut_leader_v2(path, section):
+    buf = open(path, "rb").read()
+    header = read_leader_v2_header(buf)
+    cut = {
+        "header": LONG_SIZE * 3,
+        "vectors": header.vectors + FLOAT_SIZE * header.dim + 2,
+        "offsets": header.word_offsets,
+        "words": header.words + 3,
+    }[section]
+    return buf[:cut]
+
+
+@pytest.mark.parametrize("section", ["header", "vectors", "offsets", "words"])
+def test_read_leader_v2_stream_truncated(leader_v2, section):
+    with pytest.raises(ValueError, match="The file ended before all of the vectors were read"):
+        read(io.BytesIO(_cut_leader_v2(leader_v2, section)))
+
+
+@pytest.mark.parametrize("section", ["header", "vectors", "offsets", "words"])
+def test_iter_batches_leader_v2_stream_truncated(leader_v2, section):
+    with pytest.raises(ValueError, match="The file ended before all of the vectors were read"):
+        list(iter_batches(io.BytesIO(_cut_leader_v2(leader_v2, section)), file_type=FileType.LEADER))
+
+
+@pytest.mark.parametrize("io_strategy", IO_STRATEGIES)
+@pytest.mark.parametrize("data", [GLOVE, W2V])
+def test_iter_batches_io_strategy(data, io_strategy, gold_vocab, gold_vectors):
+    batches = list(iter_batches(DATA / data, batch_size=3, io_strategy=io_strategy))
+    assert all(len(w) == 3 for w, _ in batches[:-1])
+    assert list(chain(*(w for w, _ in batches))) == list(gold_vocab)
+    np.testing.assert_allclose(np.concatenate([b for _, b in batches]), gold_vectors)
+
+
+def test_read_pread_compressed(tmp_path, gold_vocab, gold_vectors):
+    w, wv = read(_compress(DATA / W2V, "gzip", tmp_path / "vectors.gz"), io_strategy="pread")
+    assert w == gold_vocab
+    np.testing.assert_allclose(wv, gold_vectors)
+
+
+def test_read_pread_keeps_position(gold_vocab):
+    with open(DATA / W2V, "rb") as f:
+        w, _ = read_w2v(f, io_strategy="pread")
+        assert f.tell() == 0
+    assert w == gold_vocab
+
+
+@pytest.mark.parametrize("io_strategy", ["mmap-sequential", "mmap-random"])
+@pytest.mark.parametrize("data", [GLOVE, W2V])
+def test_read_with_vocab_io_strategy(data, io_strategy, gold_vocab, gold_vectors):
+    user_vocab = {word: i for i, word in enumerate(random.sample(list(gold_vocab), 3))}
+    w, wv = read_with_vocab(DATA / data, dict(user_vocab), io_strategy=io_strategy)
+    assert w == user_vocab
+    for word, idx in user_vocab.items():
+        np.testing.assert_allclose(wv[idx], gold_vectors[gold_vocab[word]])
+
+
+def test_read_with_vocab_buffered_raises(gold_vocab):
+    with pytest.raises(ValueError):
+        read_with_vocab(DATA / GLOVE, dict(gold_vocab), io_strategy="buffered")
+
+
+@pytest.mark.parametrize("reader", [read, read_glove, iter_batches])
+def test_read_unknown_io_strategy(reader):
+    with pytest.raises(ValueError):
+        list(reader(DATA / GLOVE, io_strategy=rand_str()))
+
+
+def test_read_advises_mmap(monkeypatch):
+    advised = []
+    monkeypatch.setattr(word_vectors_read, "advise", lambda m, strategy, whole=False: advised.append((strategy, whole)))
+    read(DATA / W2V, io_strategy="mmap-random")
+    assert advised == [("mmap-random", True)]
+    advised.clear()
+    read(DATA / W2V, io_strategy="buffered")
+    assert advised == []
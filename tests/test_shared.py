@@ -0,0 +1,122 @@
+import pickle
+import random
+from concurrent.futures import ProcessPoolExecutor
+import pytest
+import numpy as np
+from word_vectors.shared import SharedVectors, share, attach, shared_memory
+from word_vectors.vocab import CompactVocab
+from utils import vocab, vectors, rand_str
+
+pytestmark = pytest.mark.skipif(shared_memory is None, reason="Shared memory needs python 3.8+")
+
+
+@pytest.fixture
+def shared():
+    with share(vocab, vectors) as shared:
+        yield shared
+
+
+def test_share(shared):
+    assert isinstance(shared.vocab, CompactVocab)
+    assert dict(shared.vocab) == vocab
+    assert shared.dim == vectors.shape[1]
+    np.testing.assert_allclose(shared.vectors, vectors)
+
+
+def test_shared_vectors_read_only(shared):
+    with pytest.raises(ValueError):
+        shared.vectors[0, 0] = 1
+
+
+def test_shared_vocab(shared):
+    word = random.choice(list(vocab))
+    assert shared.vocab[word] == vocab[word]
+    assert word in shared.vocab
+    assert shared.vocab.word(vocab[word]) == word
+    missing = rand_str(20)
+    assert missing not in shared.vocab
+    assert shared.vocab.get(missing) is None
+    with pytest.raises(KeyError):
+        shared.vocab[missing]
+    assert list(shared.vocab) == list(vocab)
+    assert len(shared.vocab) == len(vocab)
+
+
+def test_share_reorders_rows():
+    words = [rand_str(10) for _ in range(4)]
+    user_vocab = {words[0]: 7, words[1]: 2, words[2]: 0, words[3]: 4}
+    user_vectors = np.random.rand(8, 5).astype(np.float32)
+    with share(user_vocab, user_vectors) as shared:
+        assert list(shared.vocab) == [words[2], words[1], words[3], words[0]]
+        for word, idx in user_vocab.items():
+            np.testing.assert_allclose(shared.vectors[shared.vocab[word]], user_vectors[idx])
+
+
+def test_share_word_list():
+    words = [rand_str(10) for _ in range(3)]
+    with share(words, vectors[:3]) as shared:
+        assert list(shared.vocab) == words
+
+
+def test_attach(shared):
+    other = attach(shared.name)
+    assert not other.owner
+    assert dict(other.vocab) == vocab
+    np.testing.assert_allclose(other.vectors, vectors)
+    # A process only attaches to a block once.
+    assert attach(shared.name) is other
+    other.close()
+    # Closing an attachment doesn't remove the block.
+    again = attach(shared.name)
+    assert again is not other
+    again.close()
+
+
+def test_close_with_views(shared):
+    other = attach(shared.name)
+    view = other.vectors[:2]
+    with pytest.raises(BufferError):
+        other.close()
+    np.testing.assert_allclose(view, vectors[:2])
+    del view
+    other.close()
+
+
+def test_share_name():
+    name = "wv" + rand_str(10)
+    with share(vocab, vectors, name=name) as shared:
+        assert shared.name == name
+
+
+def test_unlink_on_exit():
+    with share(vocab, vectors) as shared:
+        name = shared.name
+    with pytest.raises(FileNotFoundError):
+        attach(name)
+
+
+def test_pickle_attaches(shared):
+    other = pickle.loads(pickle.dumps(shared))
+    assert isinstance(other, SharedVectors)
+    assert other.name == shared.name
+    assert not other.owner
+    np.testing.assert_allclose(other.vectors, vectors)
+    other.close()
+
+
+def _lookup(shared, word):
+    vector = shared.vectors[shared.vocab[word]].copy()
+    shared.close()
+    return vector
+
+
+def test_share_with_pool(shared):
+    words = random.sample(list(vocab), 5)
+    with ProcessPoolExecutor(max_workers=2) as pool:
+        results = list(pool.map(_lookup, [shared] * len(words), words))
+    for word, vector in zip(words, results):
+        np.testing.assert_allclose(vector, vectors[vocab[word]])
+    # The workers only closed their mappings.
+    other = attach(shared.name)
+    np.testing.assert_allclose(other.vectors, vectors)
+    other.close()
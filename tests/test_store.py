@@ -0,0 +1,122 @@
+import random
+import pytest
+import numpy as np
+import word_vectors
+from word_vectors import FileType
+from word_vectors.read import (
+    read_glove_offsets,
+    read_w2v_text_offsets,
+    read_w2v_offsets,
+    read_leader_offsets,
+)
+from word_vectors.store import VectorStore
+from word_vectors.write import write_leader
+from utils import (
+    vocab,
+    vectors,
+    dupped_vocab,
+    dupped_vectors,
+    DATA,
+    GLOVE,
+    W2V,
+    W2V_TEXT,
+    LEADER,
+    GLOVE_DUPPED,
+    W2V_DUPPED,
+    LEADER_DUPPED,
+    rand_str,
+)
+
+
+@pytest.fixture
+def leader_v2(tmp_path):
+    path = tmp_path / "leader-v2.bin"
+    write_leader(path, vocab, vectors, version=2)
+    return path
+
+
+def test_offsets_match_lines():
+    for reader, data in (
+        (read_glove_offsets, GLOVE),
+        (read_w2v_text_offsets, W2V_TEXT),
+        (read_w2v_offsets, W2V),
+        (read_leader_offsets, LEADER),
+    ):
+        words = [w for w, _ in reader(DATA / data)]
+        assert words == list(vocab)
+
+
+def test_open_sniffs():
+    data = random.choice([GLOVE, W2V, W2V_TEXT, LEADER])
+    with word_vectors.open(DATA / data) as store:
+        assert len(store) == len(vocab)
+        assert store.dim == vectors.shape[1]
+        assert set(store) == set(vocab)
+
+
+def test_star_import_keeps_builtin_open():
+    namespace = {}
+    exec("from word_vectors import *", namespace)
+    assert "open" not in namespace
+    assert namespace["VectorStore"] is VectorStore
+
+
+def test_store_getitem():
+    data = random.choice([GLOVE, W2V, W2V_TEXT, LEADER])
+    with word_vectors.open(DATA / data) as store:
+        for word, idx in vocab.items():
+            np.testing.assert_allclose(store[word], vectors[idx])
+        with pytest.raises(KeyError):
+            store[rand_str(20)]
+
+
+def test_store_leader_v2(leader_v2):
+    with word_vectors.open(leader_v2, FileType.LEADER) as store:
+        for word, idx in vocab.items():
+            np.testing.assert_allclose(store[word], vectors[idx])
+
+
+def test_store_opened():
+    with open(DATA / GLOVE) as f:
+        with VectorStore(f) as store:
+            np.testing.assert_allclose(store["4"], vectors[4])
+
+
+def test_store_dupped():
+    data = random.choice([GLOVE_DUPPED, W2V_DUPPED, LEADER_DUPPED])
+    with word_vectors.open(DATA / data) as store:
+        assert len(store) == len(dupped_vocab)
+        for word, idx in dupped_vocab.items():
+            np.testing.assert_allclose(store[word], dupped_vectors[idx])
+
+
+def test_store_lookup():
+    data = random.choice([GLOVE, W2V, W2V_TEXT, LEADER])
+    queries = random.choices(list(vocab), k=10) + [rand_str(20)]
+    random.shuffle(queries)
+    with word_vectors.open(DATA / data) as store:
+        # Pre-populate the cache with some of the words.
+        store[next(q for q in queries if q in vocab)]
+        found_vectors, found = store.lookup(queries)
+    for word, vector, was_found in zip(queries, found_vectors, found):
+        if word in vocab:
+            assert was_found
+            np.testing.assert_allclose(vector, vectors[vocab[word]])
+        else:
+            assert not was_found
+            np.testing.assert_allclose(vector, 0)
+
+
+def test_store_cache_is_bounded():
+    with word_vectors.open(DATA / GLOVE, cache_size=3) as store:
+        for word in vocab:
+            store[word]
+        assert len(store._cache) == 3
+        assert list(store._cache) == list(vocab)[-3:]
+
+
+def test_store_vectors_are_read_only():
+    with word_vectors.open(DATA / GLOVE) as store:
+        vector = store["1"]
+        with pytest.raises(ValueError):
+            vector[0] = 12
@@ -1,10 +1,40 @@
 import io
+import os
+import mmap
+import bz2
+import gzip
+import lzma
 import random
+import zipfile
 import string
 import pathlib
 from io import StringIO
+import pytest
+import numpy as np
 from word_vectors import FileType
-from word_vectors.utils import is_binary, find_space, bookmark, to_vocab, create_output_path
+from word_vectors.utils import (
+    is_binary,
+    find_space,
+    bookmark,
+    to_vocab,
+    create_output_path,
+    fnv1a,
+    hash_words,
+    HashSet,
+    hash_table_size,
+    build_hash_table,
+    probe_hash_table,
+    compression,
+    open_compressed,
+    prefetch,
+    advise,
+    pread_chunks,
+    check_io_strategy,
+    IO_STRATEGIES,
+    uniform_initializer,
+    hashed_uniform,
+    UINT64_MASK,
+)
 from utils import DATA, GLOVE, W2V, W2V_TEXT, LEADER, rand_str
 
 
@@ -105,3 +135,263 @@ def test_create_output_path_open_bytes():
     path_file.name = path
     gold = f"{ext}.{file_type}"
     assert create_output_path(path_file, file_type) == gold
+
+
+def test_fnv1a_known():
+    assert fnv1a(b"") == 0xCBF29CE484222325
+    assert fnv1a(b"a") == 0xAF63DC4C8601EC8C
+    assert fnv1a(b"foobar") == 0x85944171F73967E8
+
+
+def test_hash_words_matches_fnv1a():
+    words = [rand_str(min_=0, max_=20) for _ in range(100)] + ["üñí©ødé"]
+    gold = [fnv1a(w.encode("utf-8")) for w in words]
+    assert hash_words(words).tolist() == gold
+
+
+def test_hash_table_size():
+    for n in (0, 1, 2, 7, 100, 1000):
+        size = hash_table_size(n)
+        assert size & (size - 1) == 0
+        assert size >= 2 * n
+
+
+def test_build_hash_table_lookup():
+    words = list({rand_str(min_=1, max_=8) for _ in range(500)})
+    hashes = hash_words(words)
+    table = build_hash_table(hashes)
+    for i, word in enumerate(words):
+        assert probe_hash_table(table, int(hashes[i]), lambda j: words[j] == word) == i
+    assert probe_hash_table(table, fnv1a(b"not a word"), lambda j: False) == -1
+
+
+def test_build_hash_table_collisions():
+    # Every item has the same home slot so they have to be placed by probing.
+    hashes = np.arange(20, dtype=np.uint64) * np.uint64(64)
+    table = build_hash_table(hashes, size=64)
+    for i, h in enumerate(hashes):
+        assert probe_hash_table(table, int(h), lambda j: j == i) == i
+
+
+def test_build_hash_table_duplicates_find_first():
+    words = ["a", "b", "a", "c", "a"]
+    hashes = hash_words(words)
+    table = build_hash_table(hashes)
+    assert probe_hash_table(table, int(hashes[0]), lambda j: words[j] == "a") == 0
+
+
+def test_build_hash_table_bad_size():
+    with pytest.raises(ValueError):
+        build_hash_table(np.arange(10, dtype=np.uint64), size=12)
+
+
+@pytest.mark.parametrize(
+    "codec,compress",
+    [("gzip", gzip.compress), ("bz2", bz2.compress), ("xz", lzma.compress)],
+)
+def test_compression_round_trip(tmp_path, codec, compress):
+    data = (DATA / GLOVE).read_bytes()
+    path = tmp_path / "vectors"
+    path.write_bytes(compress(data))
+    assert compression(path) == codec
+    with open_compressed(path, codec) as f:
+        assert f.read() == data
+
+
+def test_compression_zip(tmp_path):
+    data = (DATA / GLOVE).read_bytes()
+    path = tmp_path / "vectors.zip"
+    with zipfile.ZipFile(path, "w") as archive:
+        archive.writestr("vectors.txt", data)
+    assert compression(path) == "zip"
+    with open_compressed(path, "zip") as f:
+        assert f.read() == data
+
+
+def test_compression_zip_many_files(tmp_path):
+    path = tmp_path / "vectors.zip"
+    with zipfile.ZipFile(path, "w") as archive:
+        archive.writestr("a.txt", "a 1.0")
+        archive.writestr("b.txt", "b 1.0")
+    with pytest.raises(ValueError):
+        open_compressed(path, "zip")
+
+
+@pytest.mark.parametrize("data", [GLOVE, W2V, W2V_TEXT, LEADER])
+def test_compression_uncompressed(data):
+    assert compression(DATA / data) is None
+
+
+def test_compression_text_mode():
+    with open(DATA / GLOVE) as f:
+        assert compression(f) is None
+
+
+def test_compression_keeps_position():
+    f = io.BytesIO(gzip.compress(b"abc"))
+    assert compression(f) == "gzip"
+    assert f.tell() == 0
+
+
+def test_create_output_path_compressed():
+    base = rand_str()
+    file_type = random.choice(list(FileType))
+    ext = random.choice([".gz", ".bz2", ".xz", ".zip"])
+    assert create_output_path(f"{base}.vec{ext}", file_type) == f"{base}.{file_type}"
+
+
+def test_prefetch():
+    chunks = [rand_str().encode("utf-8") for _ in range(random.randint(0, 20))]
+    assert list(prefetch(iter(chunks), depth=random.randint(1, 3))) == chunks
+
+
+def test_prefetch_raises():
+    def chunks():
+        yield b"a"
+        raise OSError("bad read")
+
+    with pytest.raises(OSError):
+        list(prefetch(chunks()))
+
+
+def test_prefetch_stop_early():
+    chunks = prefetch(iter([b"a"] * 100), depth=1)
+    assert next(chunks) == b"a"
+    # Closing the generator has to stop the background thread, this would hang otherwise.
+    chunks.close()
+
+
+def test_check_io_strategy():
+    strategy = random.choice(IO_STRATEGIES)
+    assert check_io_strategy(strategy) == strategy
+    with pytest.raises(ValueError):
+        check_io_strategy(rand_str())
+    with pytest.raises(ValueError):
+        check_io_strategy("buffered", ("mmap-sequential", "mmap-random"))
+
+
+class _Advised:
+    def __init__(self):
+        self.flags = []
+
+    def __len__(self):
+        return 1
+
+    def madvise(self, flag):
+        self.flags.append(flag)
+
+
+@pytest.mark.skipif(not hasattr(mmap, "MADV_RANDOM"), reason="madvise is not available")
+def test_advise():
+    m = _Advised()
+    advise(m, "mmap-random")
+    assert m.flags == [mmap.MADV_RANDOM]
+    m = _Advised()
+    advise(m, "mmap-sequential")
+    assert m.flags == [mmap.MADV_SEQUENTIAL]
+    m = _Advised()
+    advise(m, "mmap-sequential", whole=True)
+    assert m.flags == [mmap.MADV_SEQUENTIAL, mmap.MADV_WILLNEED]
+    m = _Advised()
+    advise(m, "mmap-random", whole=True)
+    assert m.flags == [mmap.MADV_RANDOM]
+    m = _Advised()
+    advise(m, "buffered")
+    assert m.flags == []
+
+
+def test_advise_real_mmap():
+    with open(DATA / GLOVE, "rb") as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+            for strategy in IO_STRATEGIES:
+                advise(m, strategy, whole=True)
+            assert m[:10] == (DATA / GLOVE).read_bytes()[:10]
+
+
+@pytest.mark.skipif(not hasattr(os, "pread"), reason="pread is not available")
+def test_pread_chunks():
+    data = (DATA / W2V).read_bytes()
+    size = random.randint(1, 100)
+    with open(DATA / W2V, "rb") as f:
+        f.seek(10)
+        chunks = list(pread_chunks(f, size))
+        # The chunks start at the position of the file but don't move it.
+        assert f.tell() == 10
+    assert b"".join(chunks) == data[10:]
+    assert all(len(chunk) == size for chunk in chunks[:-1])
+
+
+def test_uniform_initializer_matches_global_state():
+    init = uniform_initializer(0.25)
+    np.random.seed(1234)
+    batch = init.batch(3, 5)
+    np.random.seed(1234)
+    gold = [np.random.uniform(-0.25, 0.25, size=(5,)) for _ in range(3)]
+    np.testing.assert_array_equal(batch, gold)
+    assert init(5).shape == (5,)
+
+
+def test_uniform_initializer_seeded():
+    init = uniform_initializer(0.1, seed=12)
+    batch = init.batch(4, 6)
+    assert batch.shape == (4, 6)
+    assert np.all(np.abs(batch) <= 0.1)
+    np.testing.assert_array_equal(batch, uniform_initializer(0.1, seed=12).batch(4, 6))
+    assert not np.array_equal(batch, uniform_initializer(0.1, seed=13).batch(4, 6))
+
+
+def test_uniform_initializer_seeded_calls_differ():
+    init = uniform_initializer(0.1, seed=12)
+    first, second = init(6), init(6)
+    assert not np.array_equal(first, second)
+    again = uniform_initializer(0.1, seed=12)
+    np.testing.assert_array_equal(again(6), first)
+    np.testing.assert_array_equal(again(6), second)
+
+
+def test_uniform_initializer_hashed():
+    init = uniform_initializer(0.5, seed=3, hashed=True)
+    assert init.uses_words
+    words = [rand_str(10) for _ in range(5)]
+    batch = init.batch(len(words), 7, words)
+    assert batch.shape == (5, 7)
+    assert np.all(np.abs(batch) <= 0.5)
+    # A word's vector doesn't depend on what else is missing.
+    np.testing.assert_array_equal(init.batch(2, 7, words[3:]), batch[3:])
+    assert not np.array_equal(uniform_initializer(0.5, seed=4, hashed=True).batch(5, 7, words), batch)
+    with pytest.raises(ValueError):
+        init.batch(5, 7)
+
+
+def _splitmix64(x):
+    x = (x + 0x9E3779B97F4A7C15) & UINT64_MASK
+    x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & UINT64_MASK
+    x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & UINT64_MASK
+    return x ^ (x >> 31)
+
+
+def test_hashed_uniform_matches_splitmix64():
+    word = rand_str(10)
+    h, seed, dim = fnv1a(word.encode("utf-8")), random.randint(0, 1000), 4
+    gold = []
+    for j in range(dim):
+        # Each element is the next output of a SplitMix64 generator whose state starts at the hash mixed with the seed.
+        x = _splitmix64(((h ^ _splitmix64(seed)) + j * 0x9E3779B97F4A7C15) & UINT64_MASK)
+        gold.append((x >> 11) * 2.0 ** -53 * 2 - 1)
+    np.testing.assert_array_equal(hashed_uniform(hash_words([word]), dim, 1.0, seed)[0], gold)
+
+
+def test_hash_set():
+    seen = HashSet(capacity=4)
+    gold = set()
+    for _ in range(20):
+        hashes = np.random.randint(0, 500, size=100).astype(np.uint64) * np.uint64(2 ** 40)
+        new = seen.add(hashes)
+        for h, n in zip(hashes.tolist(), new):
+            assert n == (h not in gold)
+            gold.add(h)
+    assert len(seen) == len(gold)
+
+
+def test_hash_set_empty():
+    assert len(HashSet().add(np.zeros(0, dtype=np.uint64))) == 0
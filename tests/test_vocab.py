@@ -0,0 +1,152 @@
+import sys
+import pickle
+import random
+import pytest
+import numpy as np
+from word_vectors import FileType
+from word_vectors.vocab import CompactVocab, BucketVocab
+from word_vectors.read import read, read_with_vocab, read_leader
+from word_vectors.write import write, write_leader
+from word_vectors.utils import to_vocab, fnv1a
+from utils import vocab, vectors, rand_str, DATA, GLOVE, W2V, W2V_TEXT, LEADER
+
+
+def test_from_words():
+    words = [rand_str(10) for _ in range(100)]
+    compact = CompactVocab.from_words(words)
+    assert compact.positional
+    assert len(compact) == len(words)
+    assert list(compact) == words
+    assert dict(compact) == to_vocab(words)
+    for i, word in enumerate(words):
+        assert compact[word] == i
+        assert compact.word(i) == word
+
+
+def test_from_words_duplicates():
+    compact = CompactVocab.from_words(["a", "b", "a", "c", "b"])
+    assert dict(compact) == {"a": 0, "b": 1, "c": 2}
+
+
+def test_from_words_empty():
+    compact = CompactVocab.from_words([])
+    assert len(compact) == 0
+    assert "a" not in compact
+    assert dict(compact) == {}
+
+
+def test_unicode():
+    words = ["café", "naïve", "日本語", "🙂"]
+    compact = CompactVocab.from_words(words)
+    assert dict(compact) == to_vocab(words)
+
+
+def test_missing():
+    compact = CompactVocab.from_vocab(vocab)
+    missing = rand_str(20)
+    assert missing not in compact
+    assert 1 not in compact
+    assert compact.get(missing) is None
+    assert compact.find(missing) == -1
+    with pytest.raises(KeyError):
+        compact[missing]
+
+
+def test_from_vocab_indices():
+    user_vocab = {"a": 3, "b": 0, "c": 1, "d": 2}
+    compact = CompactVocab.from_vocab(user_vocab)
+    assert not compact.positional
+    assert compact == user_vocab
+    assert list(compact.items()) == list(user_vocab.items())
+    assert list(compact.values()) == list(user_vocab.values())
+
+
+def test_from_vocab_positional():
+    assert CompactVocab.from_vocab(vocab).positional
+
+
+def test_extend():
+    user_vocab = {"a": 1, "b": 0}
+    compact = CompactVocab.from_vocab(user_vocab).extend(["c", "d"])
+    assert compact == {"a": 1, "b": 0, "c": 2, "d": 3}
+    compact = CompactVocab.from_words(["a", "b"]).extend(["c"])
+    assert compact.positional
+    assert compact == {"a": 0, "b": 1, "c": 2}
+
+
+def test_pickle():
+    compact = CompactVocab.from_vocab({"a": 3, "b": 0, "c": 1, "d": 2})
+    assert pickle.loads(pickle.dumps(compact)) == compact
+
+
+def test_smaller_than_dict():
+    words = [rand_str(8) for _ in range(10000)]
+    user_vocab = to_vocab(words)
+    size = sys.getsizeof(user_vocab) + sum(sys.getsizeof(w) + sys.getsizeof(i) for w, i in user_vocab.items())
+    assert CompactVocab.from_words(words).nbytes * 2 < size
+
+
+def test_bucket_vocab():
+    buckets = BucketVocab({"a": 0, "b": 1}, 3)
+    assert buckets["b"] == 1
+    assert "a" in buckets
+    assert len(buckets) == 2
+    assert list(buckets) == ["a", "b"]
+    word = rand_str(10)
+    assert word not in buckets
+    assert buckets[word] == buckets.get(word) == 2 + fnv1a(word.encode("utf-8")) % 3
+    np.testing.assert_array_equal(buckets.lookup(["b", word, "a"]), [1, buckets[word], 0])
+
+
+def test_bucket_vocab_no_buckets():
+    with pytest.raises(ValueError):
+        BucketVocab({"a": 0}, 0)
+
+
+@pytest.mark.parametrize("data", [GLOVE, W2V_TEXT, W2V, LEADER])
+def test_read_with_compact_vocab(data):
+    words = random.sample(list(vocab), 5) + [rand_str(12)]
+    user_vocab = CompactVocab.from_words(words)
+    w, wv = read_with_vocab(DATA / data, user_vocab, initializer=lambda x: np.zeros(x))
+    assert w is user_vocab
+    for word in words[:-1]:
+        np.testing.assert_allclose(wv[w[word]], vectors[vocab[word]])
+    np.testing.assert_allclose(wv[w[words[-1]]], 0)
+
+
+@pytest.mark.parametrize("data", [GLOVE, LEADER])
+def test_read_with_compact_vocab_keep_extra(data):
+    words = random.sample(list(vocab), 5)
+    user_vocab = CompactVocab.from_vocab({word: i for i, word in zip(reversed(range(5)), words)})
+    w, wv = read_with_vocab(DATA / data, user_vocab, keep_extra=True)
+    assert isinstance(w, CompactVocab)
+    assert set(w) == set(vocab)
+    assert len(wv) == len(vocab)
+    for word in words:
+        assert w[word] == user_vocab[word]
+    for word, idx in w.items():
+        np.testing.assert_allclose(wv[idx], vectors[vocab[word]])
+
+
+@pytest.mark.parametrize("file_type", [FileType.GLOVE, FileType.W2V_TEXT, FileType.W2V, FileType.LEADER])
+def test_write_compact_vocab(tmp_path, file_type):
+    user_vocab = {word: len(vocab) - 1 - idx for word, idx in vocab.items()}
+    path = tmp_path / "vectors"
+    write(path, CompactVocab.from_vocab(user_vocab), vectors, file_type)
+    w, wv = read(path, file_type)
+    for word, idx in user_vocab.items():
+        np.testing.assert_allclose(wv[w[word]], vectors[idx])
+
+
+def test_write_leader_reuses_index(tmp_path):
+    path = tmp_path / "vectors.leader"
+    compact = CompactVocab.from_vocab(vocab)
+    write_leader(path, compact, vectors, version=2)
+    w, wv = read_leader(path)
+    assert w == vocab
+    np.testing.assert_allclose(wv, vectors)
+    # The words and index are written as is.
+    data = path.read_bytes()
+    words, _, table, hashes, _ = compact.arrays()
+    assert words.tobytes() in data
+    assert table.tobytes() + hashes.tobytes() in data
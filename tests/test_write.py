@@ -1,11 +1,23 @@
+import io
 import os
 import random
 import string
 from unittest.mock import patch
 import pytest
+import numpy as np
+import word_vectors
 from utils import vocab, vectors, DATA, GLOVE, W2V, LEADER, W2V_TEXT
-from word_vectors import FileType
-from word_vectors.write import write, write_glove, write_w2v, write_w2v_text, write_leader
+from word_vectors import FileType, LEADER_ALIGNMENT
+from word_vectors.read import read, read_leader_v2_header, sniff
+from word_vectors.write import (
+    write,
+    write_glove,
+    write_w2v,
+    write_w2v_text,
+    write_leader,
+    open_writer,
+    format_vectors,
+)
 
 
 @pytest.fixture
@@ -53,6 +65,37 @@ def test_save_leader(w, wv, file_name):
     assert mine == gold
 
 
+def test_save_leader_v2(w, wv, file_name):
+    write_leader(file_name, w, wv, version=2)
+    buf = open(file_name, "rb").read()
+    header = read_leader_v2_header(buf)
+    assert header.vocab == len(w)
+    assert header.dim == wv.shape[1]
+    assert header.vectors % LEADER_ALIGNMENT == 0
+    assert header.word_offsets % LEADER_ALIGNMENT == 0
+    mine = np.frombuffer(buf, dtype=np.float32, count=header.vocab * header.dim, offset=header.vectors)
+    np.testing.assert_allclose(mine.reshape(header.vocab, header.dim), wv)
+    offsets = np.frombuffer(buf, dtype=np.uint64, count=header.vocab + 1, offset=header.word_offsets)
+    assert buf[header.words : header.words + int(offsets[-1])] == "".join(w).encode("utf-8")
+    assert header.index % LEADER_ALIGNMENT == 0
+    assert header.index_size >= 2 * len(w)
+
+
+def test_save_leader_v2_no_index(w, wv, file_name):
+    write_leader(file_name, w, wv, version=2, index=False)
+    buf = open(file_name, "rb").read()
+    header = read_leader_v2_header(buf)
+    assert header.index == 0
+    assert header.index_size == 0
+    assert len(buf) == header.words + len("".join(w).encode("utf-8"))
+
+
+def test_save_leader_unknown_version(w, wv, file_name):
+    with open(file_name, "wb") as wf:
+        with pytest.raises(ValueError):
+            write_leader(wf, w, wv, version=3)
+
+
 def test_write():
     with patch("word_vectors.write_module.write_leader") as leader_patch, patch(
         "word_vectors.write_module.write_w2v"
@@ -72,3 +115,164 @@ def test_write():
                 p.assert_called_once()
             else:
                 p.assert_not_called()
+
+
+class Unseekable(io.BytesIO):
+    def seekable(self):
+        return False
+
+
+def write_batches(wf, file_type, count=None, batch_size=7, **kwargs):
+    words = list(vocab)
+    with open_writer(wf, file_type, count, **kwargs) as writer:
+        for i in range(0, len(words), batch_size):
+            writer.write(words[i : i + batch_size], vectors[i : i + batch_size])
+    return writer
+
+
+def written(file_type, write_fn, buf):
+    text = file_type in (FileType.GLOVE, FileType.W2V_TEXT)
+    wf = io.TextIOWrapper(buf, write_through=True) if text else buf
+    write_fn(wf)
+    return buf.getvalue()
+
+
+@pytest.mark.parametrize("file_type", [FileType.GLOVE, FileType.W2V_TEXT, FileType.W2V, FileType.LEADER])
+@pytest.mark.parametrize("buf", [io.BytesIO, Unseekable])
+def test_open_writer_matches_write(file_type, buf):
+    gold = written(file_type, lambda wf: write(wf, vocab, vectors, file_type), io.BytesIO())
+    # Without a count the header is written after the rows are spooled.
+    count = len(vocab) if buf is io.BytesIO else None
+    assert written(file_type, lambda wf: write_batches(wf, file_type, count), buf()) == gold
+
+
+@pytest.mark.parametrize("buf", [io.BytesIO, Unseekable])
+def test_open_writer_leader_v2_matches_write(buf):
+    gold = written(FileType.LEADER, lambda wf: write_leader(wf, vocab, vectors, version=2), io.BytesIO())
+    assert written(FileType.LEADER, lambda wf: write_batches(wf, FileType.LEADER, version=2), buf()) == gold
+
+
+def test_open_writer_leader_unknown_version():
+    with pytest.raises(ValueError):
+        open_writer(io.BytesIO(), FileType.LEADER, version=3)
+
+
+@pytest.mark.parametrize("file_type", [FileType.W2V_TEXT, FileType.W2V])
+def test_open_writer_pads_count(file_type):
+    data = written(file_type, lambda wf: write_batches(wf, file_type, 1000), io.BytesIO())
+    header = f"{len(vocab)} {vectors.shape[1]}".ljust(len(f"1000 {vectors.shape[1]}")) + "\n"
+    assert data.startswith(header.encode("utf-8"))
+    assert sniff(io.BytesIO(data)) is file_type
+    w, wv = read(io.BytesIO(data), file_type)
+    assert w == vocab
+    np.testing.assert_allclose(wv, vectors)
+
+
+def test_open_writer_count_too_small():
+    with pytest.raises(ValueError):
+        write_batches(io.BytesIO(), FileType.W2V, 10)
+
+
+def test_open_writer_dim_mismatch():
+    with pytest.raises(ValueError):
+        with open_writer(io.BytesIO(), FileType.LEADER) as writer:
+            writer.write(["a"], np.zeros((1, 3)))
+            writer.write(["b"], np.zeros((1, 4)))
+
+
+def test_open_writer_path(tmp_path):
+    path = tmp_path / "vectors.leader"
+    writer = write_batches(path, FileType.LEADER)
+    assert writer.wf.closed
+    w, wv = read(path, FileType.LEADER)
+    assert w == vocab
+    np.testing.assert_allclose(wv, vectors)
+
+
+def printf_lines(vectors, precision):
+    fmt = f"%.{precision}g"
+    return "".join(" ".join(fmt % x for x in vector.astype(np.float64)) + "\n" for vector in vectors)
+
+
+@pytest.mark.parametrize("precision", range(1, 10))
+def test_format_vectors_matches_printf(precision):
+    wide = np.random.randn(200, 30) * 10.0 ** np.random.randint(-40, 38, size=(200, 30))
+    wide = wide.astype(np.float32)
+    wide[0, :8] = [0.0, -0.0, 1.0, 0.125, 99.95, 9.9999999, 1e-5, 0.0001]
+    text, offsets = format_vectors(wide, precision)
+    assert text == printf_lines(wide, precision)
+    assert text[offsets[7] : offsets[8]] == printf_lines(wide[7:8], precision)
+
+
+def test_format_vectors_non_finite():
+    data = np.random.randn(10, 5).astype(np.float32)
+    data[2, 3] = np.inf
+    data[4, 1] = -np.inf
+    data[5, 0] = np.nan
+    text, _ = format_vectors(data, 6)
+    assert text == printf_lines(data, 6)
+
+
+def str_lines(vectors):
+    return "".join(" ".join(map(str, vector)) + "\n" for vector in vectors)
+
+
+def test_format_vectors_shortest_matches_str():
+    wide = np.random.randn(200, 30) * 10.0 ** np.random.randint(-45, 38, size=(200, 30))
+    wide = wide.astype(np.float32)
+    wide[0, :12] = [0.0, -0.0, 1.0, 100.0, 0.1, 1 / 3, 1e-4, 1e6, 16777216.0, 123456789.0, 1e-45, 3.4e38]
+    # Random bit patterns cover every exponent and number of digits.
+    bits = np.random.randint(0, 2 ** 32, size=(100, 30), dtype=np.uint64).astype(np.uint32).view(np.float32)
+    bits = np.where(np.isfinite(bits), bits, 0).astype(np.float32)
+    for data in (wide, bits, vectors):
+        text, offsets = format_vectors(data)
+        assert text == str_lines(data)
+        assert text[offsets[7] : offsets[8]] == str_lines(data[7:8])
+
+
+def test_format_vectors_shortest_positional_limit(monkeypatch):
+    # Before numpy 2 float32s were written in positional notation up to 1e16.
+    monkeypatch.setattr(word_vectors.write_module, "_POSITIONAL_LIMIT", 1e16)
+    data = (np.random.randn(50, 20) * 10.0 ** np.random.randint(-8, 18, size=(50, 20))).astype(np.float32)
+
+    def numpy_1(x):
+        if x == 0 or 1e-4 <= abs(x) < 1e16:
+            return np.format_float_positional(x, unique=True, trim="0")
+        return np.format_float_scientific(x, unique=True, trim="-", exp_digits=2)
+
+    text, _ = format_vectors(data)
+    assert text == "".join(" ".join(map(numpy_1, vector)) + "\n" for vector in data)
+
+
+def test_format_vectors_shortest_non_finite():
+    data = np.random.randn(10, 5).astype(np.float32)
+    data[2, 3] = np.inf
+    data[5, 0] = np.nan
+    text, _ = format_vectors(data)
+    assert text == str_lines(data)
+
+
+@pytest.mark.parametrize("file_type", [FileType.GLOVE, FileType.W2V_TEXT])
+def test_save_text_precision(file_type, file_name):
+    write(file_name, vocab, vectors, file_type, precision=4)
+    w, wv = read(file_name, file_type)
+    assert w == vocab
+    np.testing.assert_allclose(wv, vectors, rtol=1e-3)
+    full = io.StringIO()
+    write(full, vocab, vectors, file_type)
+    assert os.path.getsize(file_name) < len(full.getvalue())
+
+
+@pytest.mark.parametrize("precision", [0, 10])
+def test_save_glove_bad_precision(precision):
+    with pytest.raises(ValueError):
+        write_glove(io.StringIO(), vocab, vectors, precision)
+    with pytest.raises(ValueError):
+        open_writer(io.StringIO(), FileType.W2V_TEXT, precision=precision)
+
+
+def test_open_writer_precision():
+    buf = io.StringIO()
+    with open_writer(buf, FileType.GLOVE, precision=3) as writer:
+        writer.write(["a", "b"], np.array([[1.23456, 0.5], [-2.0, 1e-7]], dtype=np.float32))
+    assert buf.getvalue() == "a 1.23 0.5\nb -2 1e-07\n"
@@ -75,14 +75,27 @@ FLOAT_SIZE = 4  #: The size of a float32 in bytes when reading a binary file.
 LONG_SIZE = 8  #: The size of an int64 in bytes when reading binary files.
 LEADER_HEADER = 3  #: The number of elements in the Leader format header.
 LEADER_MAGIC_NUMBER = 38941  #: A magic number used to identify a Leader format file.
+LEADER_VERSION = 1  #: The version of the Leader format that is written by default.
+LEADER_V2_HEADER = 8  #: The number of elements in the version 2 Leader format header.
+LEADER_ALIGNMENT = 64  #: The byte alignment of the sections in a version 2 Leader file.
+SIDECAR_HEADER = 8  #: The number of elements in the header of a sidecar index.
+SIDECAR_MAGIC_NUMBER = 38942  #: A magic number used to identify a sidecar index for a text file.
 
 
 import word_vectors.read as read_module
 import word_vectors.write as write_module
 import word_vectors.convert as convert_module
+import word_vectors.index as index_module
+import word_vectors.store as store_module
+import word_vectors.cache as cache_module
+import word_vectors.shared as shared_module
+import word_vectors.vocab as vocab_module
 from word_vectors.read import (
     read,
     read_with_vocab,
+    read_with_vocabs,
+    reindex,
+    iter_batches,
     read_w2v,
     read_w2v_with_vocab,
     read_w2v_text,
@@ -92,6 +105,7 @@ from word_vectors.read import (
     read_leader,
     read_leader_with_vocab,
     verify_leader,
+    leader_version,
 )
 from word_vectors.convert import (
     convert,
@@ -108,4 +122,67 @@ from word_vectors.convert import (
     leader_to_w2v,
     leader_to_w2v_text,
 )
-from word_vectors.write import write, write_w2v, write_w2v_text, write_glove, write_leader
+from word_vectors.write import write, write_w2v, write_w2v_text, write_glove, write_leader, open_writer
+from word_vectors.index import LeaderIndex, TextIndex, build_index
+from word_vectors.store import VectorStore, open
+from word_vectors.shared import SharedVectors, share, attach
+from word_vectors.vocab import CompactVocab, BucketVocab
+
+# ``open`` is left out so ``from word_vectors import *`` doesn't shadow the builtin.
+__all__ = [
+    "Vocab",
+    "Vectors",
+    "FileType",
+    "INT_SIZE",
+    "FLOAT_SIZE",
+    "LONG_SIZE",
+    "LEADER_HEADER",
+    "LEADER_MAGIC_NUMBER",
+    "LEADER_VERSION",
+    "LEADER_V2_HEADER",
+    "LEADER_ALIGNMENT",
+    "SIDECAR_HEADER",
+    "SIDECAR_MAGIC_NUMBER",
+    "read",
+    "read_with_vocab",
+    "read_with_vocabs",
+    "reindex",
+    "iter_batches",
+    "read_w2v",
+    "read_w2v_with_vocab",
+    "read_w2v_text",
+    "read_glove",
+    "read_glove_with_vocab",
+    "read_leader",
+    "read_leader_with_vocab",
+    "verify_leader",
+    "leader_version",
+    "convert",
+    "w2v_to_leader",
+    "w2v_to_glove",
+    "w2v_to_w2v_text",
+    "glove_to_leader",
+    "glove_to_w2v",
+    "glove_to_w2v_text",
+    "w2v_text_to_leader",
+    "w2v_text_to_w2v",
+    "w2v_text_to_glove",
+    "leader_to_glove",
+    "leader_to_w2v",
+    "leader_to_w2v_text",
+    "write",
+    "write_w2v",
+    "write_w2v_text",
+    "write_glove",
+    "write_leader",
+    "open_writer",
+    "LeaderIndex",
+    "TextIndex",
+    "build_index",
+    "VectorStore",
+    "SharedVectors",
+    "share",
+    "attach",
+    "CompactVocab",
+    "BucketVocab",
+]
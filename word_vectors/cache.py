@@ -0,0 +1,203 @@
+"""Cache parsed vector files as Leader files so later reads are memory mapped.
+
+Parsing the float text of a large GloVe or w2v-text file takes a long time and many
+programs re-read the same file every time they start. Passing ``cache_dir`` to
+:py:func:`~word_vectors.read.read` stores the parsed vocab and vectors as a (version 2)
+Leader file the first time a file is read. Later reads of the same file load the
+snapshot, this only decodes the words, the vectors are a zero-copy view of the memory
+mapped snapshot.
+
+Snapshots are named by a fingerprint of the file they were made from (its path, size,
+and modification time and optionally a hash of its contents) so a file that changes
+gets a new snapshot and the old one is eventually evicted. The cache is bounded in size,
+when it grows past ``max_size`` bytes the least recently used snapshots are deleted.
+"""
+
+import os
+import hashlib
+import logging
+import pathlib
+import tempfile
+from typing import Union, IO, Optional, Tuple
+from word_vectors import FileType, Vocab, Vectors
+from word_vectors.read import read, read_leader, BLOCK_SIZE
+from word_vectors.write import write_leader
+
+
+LOGGER = logging.getLogger("word_vectors")
+
+#: The default maximum number of bytes the snapshots in a cache directory can use.
+CACHE_SIZE = 2 ** 35
+#: The extension of the snapshots in a cache directory.
+CACHE_EXTENSION = f".{FileType.LEADER}"
+
+
+def fingerprint(
+    f: Union[str, pathlib.PurePath, IO], file_type: Optional[FileType] = None, content_hash: bool = False
+) -> str:
+    """Create a key that changes whenever the parsed contents of a file could change.
+
+    Args:
+        f: The vector file.
+        file_type: The file type it is parsed as, ``None`` when it is sniffed.
+        content_hash: Include a hash of the file's contents. This catches changes that
+            keep the size and modification time the same (for example copying a file
+            while preserving its metadata) but the whole file has to be read to check
+            the cache.
+
+    Returns:
+        A hex digest that identifies the file.
+    """
+    path = os.path.realpath(_path(f))
+    stat = os.stat(path)
+    key = hashlib.sha256()
+    key.update(f"{path}\0{stat.st_size}\0{stat.st_mtime_ns}\0{file_type}\0".encode("utf-8"))
+    if content_hash:
+        contents = hashlib.blake2b()
+        with open(path, "rb") as rf:
+            for chunk in iter(lambda: rf.read(BLOCK_SIZE), b""):
+                contents.update(chunk)
+        key.update(contents.digest())
+    return key.hexdigest()
+
+
+def cache_path(
+    f: Union[str, pathlib.PurePath, IO],
+    cache_dir: Union[str, pathlib.PurePath],
+    file_type: Optional[FileType] = None,
+    content_hash: bool = False,
+) -> str:
+    """Get the path of the snapshot for a vector file.
+
+    Args:
+        f: The vector file.
+        cache_dir: The directory of snapshots.
+        file_type: The file type it is parsed as, ``None`` when it is sniffed.
+        content_hash: Include a hash of the file's contents in the key, see
+            :py:func:`~word_vectors.cache.fingerprint`.
+
+    Returns:
+        The path to the snapshot, it might not exist yet.
+    """
+    return os.path.join(str(cache_dir), fingerprint(f, file_type, content_hash) + CACHE_EXTENSION)
+
+
+def read_cached(
+    f: Union[str, pathlib.PurePath, IO],
+    cache_dir: Union[str, pathlib.PurePath],
+    file_type: Optional[FileType] = None,
+    workers: Optional[int] = None,
+    io_strategy: str = "mmap-sequential",
+    max_size: Optional[int] = CACHE_SIZE,
+    content_hash: bool = False,
+) -> Tuple[Vocab, Vectors]:
+    """Read vectors from a file, using (or creating) a snapshot in the cache.
+
+    Several processes can populate the cache at the same time, each snapshot is written
+    to a temporary file and moved into place so a reader never sees a partial snapshot.
+    Files that are not on disk (pipes, in memory streams) are read without the cache.
+
+    Args:
+        f: The file to read from.
+        cache_dir: The directory of snapshots, it is created if it doesn't exist. A
+            leading ``~`` is expanded to the user's home directory.
+        file_type: The vector file format. If ``None`` the file is sniffed to determine
+            format.
+        workers: The number of processes used to parse text files when the file isn't
+            in the cache, see :py:func:`~word_vectors.read.read_glove`.
+        io_strategy: How the file (or snapshot) is read, see :py:func:`~word_vectors.read.read`.
+        max_size: The maximum number of bytes of snapshots in the cache. ``None`` lets the
+            cache grow forever.
+        content_hash: Include a hash of the file's contents in the key, see
+            :py:func:`~word_vectors.cache.fingerprint`.
+
+    Returns:
+        The vocab and vectors.
+    """
+    cache_dir = os.path.expanduser(str(cache_dir))
+    try:
+        path = _path(f)
+    except AttributeError:
+        path = None
+    if not isinstance(path, str) or not os.path.isfile(path):
+        LOGGER.info("%s is not a file on disk, reading it without the cache", getattr(f, "name", f))
+        return read(f, file_type, workers=workers, io_strategy=io_strategy)
+    snapshot = cache_path(path, cache_dir, file_type, content_hash)
+    try:
+        vocab, vectors = read_leader(snapshot, io_strategy=io_strategy)
+    except FileNotFoundError:
+        pass
+    else:
+        LOGGER.info("Read %s from the cache at %s", path, snapshot)
+        _touch(snapshot)
+        return vocab, vectors
+    vocab, vectors = read(f, file_type, workers=workers, io_strategy=io_strategy)
+    os.makedirs(cache_dir, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(suffix=".tmp", dir=cache_dir)
+    try:
+        with os.fdopen(fd, "wb") as wf:
+            write_leader(wf, vocab, vectors, version=2)
+        os.replace(tmp, snapshot)
+    except BaseException:
+        os.remove(tmp)
+        raise
+    LOGGER.info("Cached %s at %s", path, snapshot)
+    if max_size is not None:
+        evict(cache_dir, max_size, keep=snapshot)
+    return vocab, vectors
+
+
+def evict(cache_dir: Union[str, pathlib.PurePath], max_size: int, keep: Optional[str] = None) -> int:
+    """Delete the least recently used snapshots until the cache is at most ``max_size`` bytes.
+
+    Reading a snapshot from the cache updates its modification time, this is used to
+    decide which was used least recently. Deleting a snapshot that another process has
+    open is safe, that process keeps its memory mapping.
+
+    Args:
+        cache_dir: The directory of snapshots.
+        max_size: The maximum number of bytes the snapshots can use.
+        keep: A snapshot that is never evicted, the one that was just written.
+
+    Returns:
+        The number of snapshots that were deleted.
+    """
+    entries = []
+    with os.scandir(str(cache_dir)) as it:
+        for entry in it:
+            if not entry.name.endswith(CACHE_EXTENSION):
+                continue
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+    total = sum(size for _, size, _ in entries)
+    removed = 0
+    for _, size, path in sorted(entries):
+        if total <= max_size:
+            break
+        if keep is not None and os.path.abspath(path) == os.path.abspath(keep):
+            continue
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            # Another process evicted it first.
+            pass
+        LOGGER.debug("Evicted %s from the cache", path)
+        total -= size
+        removed += 1
+    return removed
+
+
+def _touch(path: str):
+    """Mark a snapshot as recently used."""
+    try:
+        os.utime(path)
+    except FileNotFoundError:
+        # It was evicted by another process after we opened it, the vectors are still valid.
+        pass
+
+
+def _path(f: Union[str, pathlib.PurePath, IO]) -> str:
+    return str(f) if isinstance(f, (str, pathlib.PurePath)) else f.name
@@ -7,15 +7,19 @@ as well as several convenience function for converting between different pairs o
 """
 
 import logging
-from typing import Union, TextIO, BinaryIO, Optional
+from contextlib import ExitStack
+from typing import Union, TextIO, BinaryIO, Optional, Sequence, IO
 from word_vectors import FileType
-from word_vectors.read import read
-from word_vectors.write import write
-from word_vectors.utils import create_output_path
+from word_vectors.read import iter_batches, _count_hint
+from word_vectors.write import open_writer
+from word_vectors.utils import HashSet, create_output_path, hash_words
 
 
 LOGGER = logging.getLogger("word_vectors")
 
+#: The output formats that start with the number of vectors.
+COUNTED_FORMATS = (FileType.W2V, FileType.W2V_TEXT, FileType.FASTTEXT, FileType.NUMBERBATCH)
+
 
 # We don't know what mode to open the file in (text for things like Glove while
 # binary for things like Word2Vec or Leader) we can't use the `@file_or_name`
@@ -23,25 +27,68 @@ LOGGER = logging.getLogger("word_vectors")
 # all the file formats.
 def convert(
     f: Union[str, TextIO, BinaryIO],
-    output: Optional[str] = None,
-    output_file_type: FileType = FileType.LEADER,
+    output: Optional[Union[str, IO, Sequence[Optional[Union[str, IO]]]]] = None,
+    output_file_type: Union[FileType, Sequence[FileType]] = FileType.LEADER,
     input_file_type: Optional[FileType] = None,
+    precision: Optional[int] = None,
 ):
     """Convert vectors from one format to another.
 
+    The vectors are streamed from the input to the output a batch at a time (see
+    :py:func:`~word_vectors.read.iter_batches` and :py:func:`~word_vectors.write.open_writer`)
+    so files that are too large to read into memory can be converted. Only the hashes of
+    the words that have been written are kept, they are used to skip duplicated words.
+
+    Several formats can be written at once by passing a list of file types (and a list
+    of outputs, one for each type), the input is only read and parsed once. ::
+
+        convert("vectors.vec", output_file_type=[FileType.GLOVE, FileType.W2V, FileType.LEADER])
+
     Args:
         f: The file to read from.
         output: The name for the output file. If not provided we use the
-            input file name with a modified extension.
+            input file name with a modified extension. When writing several
+            formats this is a list with an output (or ``None``) for each one.
         output_file_type: The vector serialization format to use when
-            writing out the vectors.
+            writing out the vectors, or a list of formats.
         input_file_type: An explicit vector format to use when reading.
+        precision: The number of significant digits of each float when writing text
+            formats, see :py:func:`~word_vectors.write.write_glove`.
+
+    Raises:
+        ValueError: If the number of outputs doesn't match the number of formats.
     """
-    LOGGER.info("Reading vectors from %s", f)
-    w, wv = read(f, input_file_type)
-    output = create_output_path(f, output_file_type) if output is None else output
-    LOGGER.info("Writing vectors to %s", output)
-    write(output, w, wv, output_file_type)
+    if isinstance(output_file_type, FileType):
+        output_file_types, outputs = [output_file_type], [output]
+    else:
+        output_file_types = list(output_file_type)
+        outputs = [None] * len(output_file_types) if output is None else output
+        if isinstance(outputs, (str, bytes)) or not isinstance(outputs, Sequence):
+            raise ValueError(f"Writing {len(output_file_types)} formats needs a list of outputs, got: {output}")
+        if len(outputs) != len(output_file_types):
+            raise ValueError(f"Got {len(outputs)} outputs for {len(output_file_types)} formats")
+    outputs = [
+        create_output_path(f, file_type) if out is None else out for out, file_type in zip(outputs, output_file_types)
+    ]
+    # Formats with the count in their header leave room for it so it can be filled in once we know how many
+    # vectors were unique, without a bound on the count the output has to be spooled to a temporary file.
+    count = _count_hint(f, input_file_type) if any(t in COUNTED_FORMATS for t in output_file_types) else None
+    names = ", ".join(str(getattr(out, "name", out)) for out in outputs)
+    LOGGER.info("Converting vectors from %s to %s", getattr(f, "name", f), names)
+    seen = HashSet()
+    with ExitStack() as stack:
+        writers = [
+            stack.enter_context(open_writer(out, file_type, count, precision))
+            for out, file_type in zip(outputs, output_file_types)
+        ]
+        for words, vectors in iter_batches(f, input_file_type):
+            new = seen.add(hash_words(words))
+            if not new.all():
+                words = [word for word, keep in zip(words, new) if keep]
+                vectors = vectors[new]
+            for writer in writers:
+                writer.write(words, vectors)
+    LOGGER.info("Wrote %d vectors to %s", writers[0].count, names)
 
 
 def w2v_to_leader(f: Union[str, BinaryIO], output: Optional[str] = None):
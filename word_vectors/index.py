@@ -0,0 +1,416 @@
+"""Look up the vectors for individual words without reading the whole file.
+
+The readers in :py:mod:`word_vectors.read` materialize the full vocabulary and vector
+matrix. When you only need a handful of words from a file with millions of them this
+wastes both time and memory. The classes here use an index to find the words you ask
+for and only touch the parts of the file that hold them.
+"""
+
+import os
+import mmap
+import struct
+import logging
+import pathlib
+import builtins
+from collections.abc import Mapping
+from typing import Union, IO, BinaryIO, Iterable, Iterator, Optional, Tuple
+import numpy as np
+from word_vectors import FileType, LONG_SIZE, LEADER_V2_HEADER, SIDECAR_HEADER, SIDECAR_MAGIC_NUMBER
+from word_vectors.read import (
+    sniff,
+    leader_version,
+    read_leader_v2_header,
+    read_glove_offsets,
+    read_w2v_text_offsets,
+    parse_text_vector,
+)
+from word_vectors.utils import fnv1a, hash_words, build_hash_table, probe_hash_table, advise
+
+
+LOGGER = logging.getLogger("word_vectors")
+
+
+class LeaderIndex:
+    """Look up words in a version 2 Leader file using its on-disk hash index.
+
+    The file is memory mapped and nothing is read up front except the header. Each
+    lookup hashes the word, probes the hash index for its row, and copies that single
+    vector out of the file. Startup is constant time and memory use grows with the
+    number of words that are actually looked up.
+
+    The index is written by :py:func:`~word_vectors.write.write_leader` unless
+    ``index=False`` is passed. ::
+
+        with LeaderIndex("vectors.leader") as index:
+            index.get("dog")
+            vectors, found = index.get_many(["the", "quick", "brown", "fox"])
+
+    Args:
+        f: The Leader file to read from.
+
+    Raises:
+        ValueError: If the file is not a version 2 Leader file or doesn't have a hash index.
+    """
+
+    def __init__(self, f: Union[str, pathlib.PurePath, BinaryIO]):
+        if isinstance(f, (str, pathlib.PurePath)):
+            with open(f, "rb") as f:
+                self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        else:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        # Lookups jump around the file so readahead would only read vectors we don't want.
+        advise(self._mmap, "mmap-random")
+        m = self._mmap
+        version = leader_version(m[:LONG_SIZE])
+        if version < 2:
+            raise ValueError(f"Only version 2 Leader files have a hash index, got version {version}")
+        header = read_leader_v2_header(m[: LONG_SIZE * LEADER_V2_HEADER])
+        if header.index == 0:
+            raise ValueError("This Leader file was written without a hash index.")
+        self._header = header
+        self._vectors = np.frombuffer(m, dtype="<f4", count=header.vocab * header.dim, offset=header.vectors)
+        self._vectors = self._vectors.reshape(header.vocab, header.dim)
+        self._word_offsets = np.frombuffer(m, dtype="<u8", count=header.vocab + 1, offset=header.word_offsets)
+        self._table = np.frombuffer(m, dtype="<u8", count=header.index_size, offset=header.index)
+        self._hashes = np.frombuffer(
+            m, dtype="<u8", count=header.vocab, offset=header.index + LONG_SIZE * header.index_size
+        )
+
+    def __len__(self) -> int:
+        return self._header.vocab
+
+    @property
+    def dim(self) -> int:
+        """The size of the vectors."""
+        return self._header.dim
+
+    def word(self, row: int) -> str:
+        """Get the word stored at some row.
+
+        Args:
+            row: The row in the vector matrix.
+
+        Returns:
+            The word.
+        """
+        start = self._header.words + int(self._word_offsets[row])
+        end = self._header.words + int(self._word_offsets[row + 1])
+        return self._mmap[start:end].decode("utf-8")
+
+    def find(self, word: str) -> int:
+        """Find the row of a word in the vector matrix.
+
+        Args:
+            word: The word to look up.
+
+        Returns:
+            The row of the first occurrence of the word, ``-1`` if it is not in the file.
+        """
+        word = word.encode("utf-8")
+        h = fnv1a(word)
+        words = self._header.words
+        offsets = self._word_offsets
+
+        def matches(row: int) -> bool:
+            return (
+                int(self._hashes[row]) == h
+                and self._mmap[words + int(offsets[row]) : words + int(offsets[row + 1])] == word
+            )
+
+        return probe_hash_table(self._table, h, matches)
+
+    def __contains__(self, word: str) -> bool:
+        return self.find(word) != -1
+
+    def get(self, word: str, default: Optional[np.ndarray] = None) -> Optional[np.ndarray]:
+        """Get the vector for a word.
+
+        Args:
+            word: The word to look up.
+            default: What to return when the word is not in the file.
+
+        Returns:
+            A copy of the word's vector, or the default.
+        """
+        row = self.find(word)
+        if row == -1:
+            return default
+        return self._vectors[row].astype(np.float32)
+
+    def __getitem__(self, word: str) -> np.ndarray:
+        row = self.find(word)
+        if row == -1:
+            raise KeyError(word)
+        return self._vectors[row].astype(np.float32)
+
+    def get_many(self, words: Iterable[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """Get the vectors for many words at once.
+
+        Args:
+            words: The words to look up.
+
+        Returns:
+            A ``[len(words), vector size]`` matrix with a row for each word (rows for words
+            that are not in the file are zeros) and a boolean mask that is True for words
+            that were found.
+        """
+        rows = np.array([self.find(word) for word in words], dtype=np.int64)
+        found = rows != -1
+        vectors = np.zeros((len(rows), self.dim), dtype=np.float32)
+        vectors[found] = self._vectors[rows[found]]
+        return vectors, found
+
+    def close(self):
+        """Release the memory mapped file."""
+        # The numpy views need to be released before the mmap can be closed.
+        self._vectors = self._word_offsets = self._table = self._hashes = None
+        self._mmap.close()
+
+    def __enter__(self) -> "LeaderIndex":
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+#: The extension added to the name of a text vector file to get the name of its sidecar index.
+SIDECAR_EXTENSION = ".wvi"
+
+# How the text format is recorded in the sidecar header.
+_SIDECAR_FORMATS = {FileType.GLOVE: 0, FileType.W2V_TEXT: 1}
+
+
+def sidecar_path(f: Union[str, pathlib.PurePath, IO]) -> str:
+    """Get the path of the sidecar index for a text vector file.
+
+    Args:
+        f: The text vector file.
+
+    Returns:
+        The path to the sidecar index.
+    """
+    path = str(f) if isinstance(f, (str, pathlib.PurePath)) else f.name
+    return path + SIDECAR_EXTENSION
+
+
+def build_index(f: Union[str, pathlib.PurePath, IO], file_type: Optional[FileType] = None) -> str:
+    """Write a sidecar index next to a text (GloVe or w2v-text) vector file.
+
+    Text files have no way to find a word without reading everything before it. The
+    sidecar index records the FNV-1a hash of each word and the byte offset of its vector
+    (as well as the number of lines, unique words, and the vector size) so that later
+    reads can jump straight to the lines they need and know the size of the result
+    before parsing. See :py:class:`~word_vectors.index.TextIndex`.
+
+    The sidecar is written to ``{f}.wvi``. It also records the size and modification
+    time of the vector file, when these change the sidecar is considered stale and
+    it is rebuilt automatically the next time it is loaded.
+
+    The header of the sidecar is 8 little-endian unsigned long longs: The magic number,
+    the size and modification time (in nanoseconds) of the vector file, the number of
+    lines, the number of unique words, the vector size, the number of slots in the hash
+    table, and the text format (``0`` for GloVe, ``1`` for w2v-text). The offset of
+    each line's vector, the hash of each line's word, and the hash table follow, they
+    are all arrays of little-endian unsigned long longs.
+
+    Args:
+        f: The text vector file.
+        file_type: The vector file format. If ``None`` the file is sniffed to determine
+            format.
+
+    Returns:
+        The path to the sidecar index.
+
+    Raises:
+        ValueError: If the vectors are not in a text format.
+    """
+    if file_type is None:
+        file_type = sniff(f)
+    if file_type is FileType.FASTTEXT or file_type is FileType.NUMBERBATCH:
+        file_type = FileType.W2V_TEXT
+    if file_type not in _SIDECAR_FORMATS:
+        raise ValueError(f"Sidecar indices are only used for text formats, got: {file_type}")
+    offsets_reader = read_glove_offsets if file_type is FileType.GLOVE else read_w2v_text_offsets
+    words, offsets = zip(*offsets_reader(f)) if os.path.getsize(_path(f)) else ((), ())
+    offsets = np.array(offsets, dtype="<u8")
+    hashes = hash_words(words).astype("<u8")
+    table = build_hash_table(hashes).astype("<u8")
+    with builtins.open(_path(f), "rb") as rf:
+        m = mmap.mmap(rf.fileno(), 0, access=mmap.ACCESS_READ) if len(offsets) else None
+        dim = len(parse_text_vector(m, int(offsets[0]))) if m is not None else 0
+        if m is not None:
+            m.close()
+    stat = os.stat(_path(f))
+    header = (
+        SIDECAR_MAGIC_NUMBER,
+        stat.st_size,
+        stat.st_mtime_ns,
+        len(offsets),
+        len(set(words)),
+        dim,
+        len(table),
+        _SIDECAR_FORMATS[file_type],
+    )
+    path = sidecar_path(f)
+    # Write to a temporary file and move it into place so readers never see a partial index.
+    tmp = f"{path}.{os.getpid()}.tmp"
+    try:
+        with builtins.open(tmp, "wb") as wf:
+            wf.write(struct.pack(f"<{SIDECAR_HEADER}Q", *header))
+            wf.write(offsets.tobytes())
+            wf.write(hashes.tobytes())
+            wf.write(table.tobytes())
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+    return path
+
+
+def load_index(f: Union[str, pathlib.PurePath, IO]) -> Optional["TextIndex"]:
+    """Load the sidecar index of a text vector file if it has one.
+
+    If the vector file has changed since the sidecar was written it is rebuilt. When the
+    sidecar can't be rebuilt (for example the directory is read-only) it is ignored.
+
+    Args:
+        f: The text vector file.
+
+    Returns:
+        The index or ``None`` if there is no (usable) sidecar (or ``f`` is not a file on disk).
+    """
+    try:
+        path = _path(f)
+    except AttributeError:
+        return None
+    if not os.path.exists(sidecar_path(path)):
+        return None
+    index = TextIndex(path)
+    if not index.is_fresh():
+        LOGGER.info("Sidecar index %s is out of date, rebuilding it.", sidecar_path(path))
+        index.close()
+        try:
+            build_index(path)
+        except OSError as e:
+            LOGGER.warning("Unable to rebuild the sidecar index %s, reading without it: %s", sidecar_path(path), e)
+            return None
+        index = TextIndex(path)
+    return index
+
+
+def _path(f: Union[str, pathlib.PurePath, IO]) -> str:
+    return str(f) if isinstance(f, (str, pathlib.PurePath)) else f.name
+
+
+class TextIndex(Mapping):
+    """A read-only mapping of word -> byte offset of its vector in a text file backed by a sidecar index.
+
+    This is what lets text vector files be read like they had a real index, see
+    :py:func:`~word_vectors.index.build_index` to create one. The offsets can be parsed
+    with :py:func:`~word_vectors.read.parse_text_vector`.
+
+    Note:
+       In the case of duplicated words in the saved vectors we use the offset of
+       the first occurrence of the word.
+
+    Args:
+        f: The text vector file (not the sidecar).
+    """
+
+    def __init__(self, f: Union[str, pathlib.PurePath, IO]):
+        self.path = _path(f)
+        with builtins.open(sidecar_path(self.path), "rb") as rf:
+            self._mmap = mmap.mmap(rf.fileno(), 0, access=mmap.ACCESS_READ)
+        header_size = LONG_SIZE * SIDECAR_HEADER
+        magic, self.size, self.mtime, self.lines, self.unique, self.dim, table_size, text_format = struct.unpack(
+            f"<{SIDECAR_HEADER}Q", self._mmap[:header_size]
+        )
+        if magic != SIDECAR_MAGIC_NUMBER:
+            raise ValueError(
+                f"Magic Number read does not match expected. Expected: `{SIDECAR_MAGIC_NUMBER}` Got: `{magic}`"
+            )
+        self.file_type = FileType.GLOVE if text_format == _SIDECAR_FORMATS[FileType.GLOVE] else FileType.W2V_TEXT
+        self._offsets = np.frombuffer(self._mmap, dtype="<u8", count=self.lines, offset=header_size)
+        self._hashes = np.frombuffer(
+            self._mmap, dtype="<u8", count=self.lines, offset=header_size + LONG_SIZE * self.lines
+        )
+        self._table = np.frombuffer(
+            self._mmap, dtype="<u8", count=table_size, offset=header_size + 2 * LONG_SIZE * self.lines
+        )
+        with builtins.open(self.path, "rb") as rf:
+            self._source = mmap.mmap(rf.fileno(), 0, access=mmap.ACCESS_READ) if self.size else b""
+        if self.size:
+            advise(self._source, "mmap-random")
+
+    def is_fresh(self) -> bool:
+        """Check if the vector file is unchanged since the sidecar was built."""
+        stat = os.stat(self.path)
+        return stat.st_size == self.size and stat.st_mtime_ns == self.mtime
+
+    def word(self, line: int) -> str:
+        """Get the word on some line of the file.
+
+        Args:
+            line: The line (not counting the w2v-text header).
+
+        Returns:
+            The word.
+        """
+        end = int(self._offsets[line]) - 1
+        start = self._source.rfind(b"\n", 0, end) + 1
+        return self._source[start:end].decode("utf-8")
+
+    def find(self, word: str) -> int:
+        """Find the line a word is on.
+
+        Args:
+            word: The word to look up.
+
+        Returns:
+            The line (not counting the w2v-text header) of the first occurrence of the
+            word, ``-1`` if it is not in the file.
+        """
+        word = word.encode("utf-8")
+        h = fnv1a(word)
+
+        def matches(line: int) -> bool:
+            if int(self._hashes[line]) != h:
+                return False
+            end = int(self._offsets[line]) - 1
+            start = end - len(word)
+            return self._source[start:end] == word and (start == 0 or self._source[start - 1 : start] == b"\n")
+
+        return probe_hash_table(self._table, h, matches)
+
+    def __getitem__(self, word: str) -> int:
+        line = self.find(word)
+        if line == -1:
+            raise KeyError(word)
+        return int(self._offsets[line])
+
+    def __contains__(self, word: str) -> bool:
+        return self.find(word) != -1
+
+    def __len__(self) -> int:
+        return self.unique
+
+    def __iter__(self) -> Iterator[str]:
+        for line in range(self.lines):
+            word = self.word(line)
+            # Skip the later occurrences of duplicated words.
+            if self.find(word) == line:
+                yield word
+
+    def close(self):
+        """Release the memory mapped files."""
+        self._offsets = self._hashes = self._table = None
+        self._mmap.close()
+        if self.size:
+            self._source.close()
+
+    def __enter__(self) -> "TextIndex":
+        return self
+
+    def __exit__(self, *args):
+        self.close()
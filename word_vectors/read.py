@@ -9,23 +9,86 @@ functions for reading from specific formats.
 
 import re
 import os
+import io
 import mmap
+import stat
 import struct
 import logging
 import pathlib
 import platform
 from functools import partial
-from typing import Tuple, Union, IO, TextIO, BinaryIO, Optional, Iterator, Callable
+from itertools import islice
+from concurrent.futures import ProcessPoolExecutor
+from typing import (
+    Tuple,
+    List,
+    Dict,
+    Iterable,
+    Union,
+    IO,
+    TextIO,
+    BinaryIO,
+    Optional,
+    Iterator,
+    Callable,
+    NamedTuple,
+    Sequence,
+)
 import numpy as np
 from file_or_name import file_or_name
-from word_vectors import INT_SIZE, LONG_SIZE, FLOAT_SIZE, LEADER_HEADER, Vocab, Vectors, FileType, LEADER_MAGIC_NUMBER
-from word_vectors.utils import find_space, is_binary, bookmark, uniform_initializer
+from word_vectors import (
+    INT_SIZE,
+    LONG_SIZE,
+    FLOAT_SIZE,
+    LEADER_HEADER,
+    LEADER_V2_HEADER,
+    Vocab,
+    Vectors,
+    FileType,
+    LEADER_MAGIC_NUMBER,
+)
+from word_vectors.utils import (
+    is_binary,
+    bookmark,
+    uniform_initializer,
+    to_vocab,
+    Initializer,
+    compression,
+    open_compressed,
+    prefetch,
+    peek,
+    advise,
+    pread_chunks,
+    check_io_strategy,
+)
+from word_vectors.vocab import CompactVocab, BucketVocab
+
+try:
+    from multiprocessing import shared_memory
+except ImportError:  # pragma: no cover
+    # Shared memory was added in python 3.8, without it the parallel readers send the vectors back through a pipe.
+    shared_memory = None
 
 
 GLOVE_TEXT = re.compile(r"^[^ ]+? (-?\d+?\.\d+? )+", re.MULTILINE)
 GLOVE_BIN = re.compile(br"^[^ ]+? (-?\d+?\.\d+? )+", re.MULTILINE)
-W2V_TEXT = re.compile(r"^\d+ \d+$", re.MULTILINE)
-W2V_BIN = re.compile(br"^\d+ \d+$", re.MULTILINE)
+W2V_TEXT = re.compile(r"^\d+ \d+ *$", re.MULTILINE)
+W2V_BIN = re.compile(br"^\d+ \d+ *$", re.MULTILINE)
+
+#: The (approximate) number of bytes of a text file that the bulk readers parse at once.
+BLOCK_SIZE = 2 ** 24
+#: The number of vectors that are parsed at once when reading specific lines of a text file.
+READ_BATCH = 2 ** 12
+#: The number of byte ranges each worker process is given when parsing a text file in parallel.
+RANGES_PER_WORKER = 4
+#: The number of vectors copied at once when gathering the vectors of a word2vec binary file.
+GATHER_BATCH = 2 ** 14
+#: The number of bytes at the start of a file used to sniff its format.
+SNIFF_SIZE = 1024
+#: The default number of vectors in each batch from :py:func:`~word_vectors.read.iter_batches`.
+ITER_BATCH = 2 ** 12
+#: The I/O strategies that memory map the file.
+MAPPED_STRATEGIES = ("mmap-sequential", "mmap-random")
 
 LOGGER = logging.getLogger("word_vectors")
 
@@ -34,7 +97,15 @@ LOGGER = logging.getLogger("word_vectors")
 # binary for things like Word2Vec or Leader) we can't use the `@file_or_name`
 # decorator directly but all the functions we call use that so we can handle
 # all the file formats.
-def read(f: Union[str, TextIO, BinaryIO], file_type: Optional[FileType] = None) -> Tuple[Vocab, Vectors]:
+def read(
+    f: Union[str, TextIO, BinaryIO],
+    file_type: Optional[FileType] = None,
+    workers: Optional[int] = None,
+    io_strategy: str = "mmap-sequential",
+    cache_dir: Optional[Union[str, pathlib.PurePath]] = None,
+    cache_size: Optional[int] = None,
+    content_hash: bool = False,
+) -> Tuple[Vocab, Vectors]:
     """Read vectors from a file.
 
     This function can dispatch to one of the following word vector format readers:
@@ -58,30 +129,70 @@ def read(f: Union[str, TextIO, BinaryIO], file_type: Optional[FileType] = None)
         I haven't seen a sniffing failure but if your file type can't be determined you
         can pass the ``file_type`` explicitly or call the specific reading function yourself.
 
+    Files compressed with gzip, bz2, xz, or zip (recognized by their leading bytes) are
+    parsed as they are decompressed, without writing the decompressed file to disk.
+    Decompression runs in a background thread so it overlaps with parsing.
+
+    Files that can't be memory mapped (pipes like ``sys.stdin``, sockets, or in memory
+    streams like ``io.BytesIO``) are read in chunks and parsed with the same engines.
+
+    The ``io_strategy`` controls how the bytes of a file on disk are read:
+
+    - ``"mmap-sequential"``: Memory map the file and advise the kernel (with ``madvise``)
+      that it will be read front to back, this turns on aggressive readahead and starts
+      reading the whole file in the background.
+    - ``"mmap-random"``: Memory map the file and turn readahead off. This is for files
+      where only parts will be touched, for example the vectors of a version 2 Leader
+      file are a view of the file and are only read when they are used.
+    - ``"buffered"``: Read the file in large chunks with normal ``read`` calls, a
+      background thread reads the next chunk while the current one is parsed.
+    - ``"pread"``: Like ``"buffered"`` but each chunk is read with ``os.pread`` so
+      the reads don't use (or move) the position of the file.
+
+    When a ``cache_dir`` is given the parsed vectors are saved there as a Leader file
+    the first time a file is read and later reads of the (unchanged) file memory map
+    that snapshot instead of parsing the file again. See :py:mod:`word_vectors.cache`.
+
     Args:
         f: The file to read from.
         file_type: The vector file format. If ``None`` the file is sniffed to determine
             format.
+        workers: The number of processes used to parse text (GloVe and w2v-text) files.
+            See :py:func:`~word_vectors.read.read_glove`. Binary files are not parsed
+            so this is ignored for them.
+        io_strategy: How the file is read, one of :py:attr:`~word_vectors.utils.IO_STRATEGIES`.
+        cache_dir: A directory to cache the parsed vectors in, ``None`` doesn't use a cache.
+        cache_size: The maximum number of bytes used by the cache, defaults to
+            :py:attr:`~word_vectors.cache.CACHE_SIZE`.
+        content_hash: Also use a hash of the file contents (not just its path, size, and
+            modification time) to decide if a cached snapshot is for this file.
 
     Returns:
         The vocab and vectors. The vocab is a mapping from word to integer and
         vectors are a numpy array of shape ``[vocab size, vector size]``. The
         vocab gives the index offset into the vector matrix for some word.
     """
+    check_io_strategy(io_strategy)
+    if cache_dir is not None:
+        # word_vectors.cache builds on this module so import it when we need it.
+        from word_vectors.cache import read_cached, CACHE_SIZE
+
+        cache_size = CACHE_SIZE if cache_size is None else cache_size
+        return read_cached(f, cache_dir, file_type, workers, io_strategy, cache_size, content_hash)
+    if not _mappable(f) or compression(f) is not None or io_strategy not in MAPPED_STRATEGIES:
+        return _read_stream(f, file_type, io_strategy)
     if file_type is None:
         file_type = sniff(f)
         LOGGER.info("Sniffed word vector as type %s", file_type)
     if file_type is FileType.GLOVE:
-        line_reader = read_glove_lines
+        return read_glove(f, workers=workers, io_strategy=io_strategy)
     elif file_type is FileType.W2V_TEXT or file_type is FileType.FASTTEXT or file_type is FileType.NUMBERBATCH:
-        line_reader = read_w2v_text_lines
+        return read_w2v_text(f, workers=workers, io_strategy=io_strategy)
     elif file_type is FileType.W2V:
-        line_reader = read_w2v_lines
+        return _read_w2v_table(f, io_strategy)
     elif file_type is FileType.LEADER:
-        line_reader = read_leader_lines
-    else:
-        raise ValueError(f"Unknown vector format, got: {line_reader}")
-    return _read(f, line_reader)
+        return read_leader(f, io_strategy=io_strategy)
+    raise ValueError(f"Unknown vector format, got: {file_type}")
 
 
 def read_with_vocab(
@@ -90,6 +201,8 @@ def read_with_vocab(
     initializer: Callable[[int], np.ndarray] = uniform_initializer(0.25),
     keep_extra: bool = False,
     file_type: Optional[FileType] = None,
+    io_strategy: str = "mmap-sequential",
+    oov_buckets: Optional[int] = None,
 ) -> Tuple[Vocab, Vectors]:
     """Read vectors from a file subject user provided vocabulary constraints.
 
@@ -111,6 +224,18 @@ def read_with_vocab(
     not in the user vocab) these will all be at the end of the vocabulary. Again the
     indices of user provided words will not change.
 
+    When not collecting extra vocabulary, reading stops as soon as every word in the
+    user vocab has been found. Pre-trained embeddings are normally sorted by frequency
+    so a vocab of common words is often found in the first small part of the file.
+
+    A large user vocab of rare words can have millions of words that aren't in the file,
+    each gets a (random) row of its own. With ``oov_buckets`` the missing words share a
+    fixed number of rows instead so the memory used for them is bounded. The words that
+    were found are given new rows, ``0`` to ``found - 1`` in the order of their original
+    indices (followed by the extra vocabulary), and the returned
+    :py:class:`~word_vectors.vocab.BucketVocab` maps any other word to one of the
+    ``oov_buckets`` rows after them based on a hash of the word.
+
     Note:
        In the case of duplicated words in the saved vectors we use the index
        and associated vector from the first occurrence of the word.
@@ -125,67 +250,648 @@ def read_with_vocab(
     Args:
         f: The file to read from.
         user_vocab: A specific vocabulary the user wants to extract form the pre-trained
-            embeddings.
+            embeddings. This can be a ``dict`` or a :py:class:`~word_vectors.vocab.CompactVocab`,
+            a ``dict`` is updated in place with the extra vocabulary while a new
+            :py:class:`~word_vectors.vocab.CompactVocab` is returned.
         initializer: A function that takes the vector size and generates a new vector.
             this is used to generate a representation for a word in the user vocab that
-            is not in the pre-train embeddings.
+            is not in the pre-train embeddings. An :py:class:`~word_vectors.utils.Initializer`
+            creates all of the missing vectors in one call.
         keep_extra: Should you also include vectors that are in the pre-trained embedding
             but not in the user provided vocab?
         file_type: The vector file format. If ``None`` the file is sniffed to determine
             format.
+        io_strategy: How the file is memory mapped while it is scanned for the words in
+            the vocab, ``"mmap-sequential"`` or ``"mmap-random"``. See
+            :py:func:`~word_vectors.read.read`.
+        oov_buckets: The number of hashed rows shared by words that are not in the file,
+            the initializer fills these rows. ``None`` gives each missing word its own row.
 
     Returns:
         The vocab and vectors. The vocab is a mapping from word to integer and
         vectors are a numpy array of shape ``[vocab size, vector size]``. The
         vocab gives the index offset into the vector matrix for some word.
     """
+    line_reader, counter, scanner = _with_vocab_readers(f, file_type, io_strategy, oov_buckets)
+    if keep_extra:
+        return _read_with_vocab_extra(f, line_reader, user_vocab, initializer, counter(f), oov_buckets)
+    if scanner is _scan_glove or scanner is _scan_w2v_text:
+        index = _load_sidecar(f)
+        if index is not None:
+            return _read_with_vocab_indexed(f, index, user_vocab, initializer, oov_buckets)
+    return _read_with_vocab(f, scanner, user_vocab, initializer, io_strategy, oov_buckets)
+
+
+def read_with_vocabs(
+    f: Union[str, IO],
+    user_vocabs: Dict[str, Vocab],
+    initializer: Callable[[int], np.ndarray] = uniform_initializer(0.25),
+    file_type: Optional[FileType] = None,
+    io_strategy: str = "mmap-sequential",
+    oov_buckets: Optional[int] = None,
+) -> Dict[str, Tuple[Vocab, Vectors]]:
+    """Read the vectors for several user vocabularies in a single pass over a file.
+
+    Calling :py:func:`~word_vectors.read.read_with_vocab` for each vocab scans the file
+    again each time. This scans it once, each word that is in any of the vocabs is parsed
+    once and copied into the vectors of every vocab that has it.
+
+    Each vocab is handled the same way as :py:func:`~word_vectors.read.read_with_vocab`,
+    the indices of the words are not changed and words that are not in the file are
+    created by the initializer (or share hashed buckets with ``oov_buckets``). Reading
+    stops as soon as every word in every vocab has been found.
+
+    Args:
+        f: The file to read from.
+        user_vocabs: The vocabs to extract from the pre-trained embeddings by name.
+        initializer: Creates vectors for words in a vocab that are not in the file, see
+            :py:func:`~word_vectors.read.read_with_vocab`.
+        file_type: The vector file format. If ``None`` the file is sniffed to determine
+            format.
+        io_strategy: How the file is memory mapped while it is scanned, ``"mmap-sequential"``
+            or ``"mmap-random"``. See :py:func:`~word_vectors.read.read`.
+        oov_buckets: The number of hashed rows shared by the missing words of each vocab,
+            see :py:func:`~word_vectors.read.read_with_vocab`.
+
+    Returns:
+        The vocab and vectors for each name.
+    """
+    _, _, scanner = _with_vocab_readers(f, file_type, io_strategy, oov_buckets)
+    return _read_with_vocabs(f, scanner, user_vocabs, initializer, io_strategy, oov_buckets)
+
+
+def reindex(
+    vocab: Vocab,
+    vectors: Vectors,
+    user_vocab: Vocab,
+    initializer: Callable[[int], np.ndarray] = uniform_initializer(0.25),
+    keep_extra: bool = False,
+    oov_buckets: Optional[int] = None,
+) -> Tuple[Vocab, Vectors]:
+    """Pull the vectors for a user vocab out of vectors that are already in memory.
+
+    This gives the same result as calling :py:func:`~word_vectors.read.read_with_vocab`
+    on the file that ``vocab`` and ``vectors`` were read from, without reading it again.
+    The rows are gathered with a single ``np.take``.
+
+    Args:
+        vocab: The vocab of the loaded vectors.
+        vectors: The loaded vectors.
+        user_vocab: The vocab to extract, the indices of its words are not changed.
+        initializer: Creates vectors for words in the user vocab that are not in
+            ``vocab``, see :py:func:`~word_vectors.read.read_with_vocab`.
+        keep_extra: Also include the words of ``vocab`` that are not in the user vocab,
+            they come after the user vocab in the order of their index in ``vocab``.
+        oov_buckets: The number of hashed rows shared by the missing words, see
+            :py:func:`~word_vectors.read.read_with_vocab`.
+
+    Returns:
+        The vocab and vectors.
+
+    Raises:
+        ValueError: If ``oov_buckets`` is less than one.
+    """
+    if oov_buckets is not None and oov_buckets < 1:
+        raise ValueError(f"There must be at least one OOV bucket, got: {oov_buckets}")
+    rows = np.full(len(user_vocab), -1, dtype=np.int64)
+    for word, idx in user_vocab.items():
+        row = vocab.get(word)
+        if row is not None:
+            rows[idx] = row
+    extra_words = []
+    if keep_extra:
+        extra = sorted((idx, word) for word, idx in vocab.items() if word not in user_vocab)
+        extra_words = [word for _, word in extra]
+        rows = np.concatenate([rows, np.array([idx for idx, _ in extra], dtype=np.int64)])
+    found = rows[: len(user_vocab)] != -1
+    gathered = np.take(vectors, np.maximum(rows, 0), axis=0)
+    if oov_buckets is not None:
+        return _bucket_missing(gathered, found, initializer, user_vocab, oov_buckets, extra_words)
+    _initialize_missing(gathered, found, initializer, user_vocab)
+    return _add_extra(user_vocab, extra_words), gathered
+
+
+def _with_vocab_readers(
+    f: Union[str, IO], file_type: Optional[FileType], io_strategy: str, oov_buckets: Optional[int]
+) -> Tuple[
+    Callable[[Union[str, IO]], Iterator[Tuple[str, np.ndarray]]],
+    Callable[[Union[str, IO]], int],
+    Callable[[mmap.mmap], Tuple[Optional[int], Iterator[Tuple[bytes, int]]]],
+]:
+    """Check the arguments of a read with a vocab and find the line reader, counter, and scanner for the file."""
+    check_io_strategy(io_strategy, MAPPED_STRATEGIES)
+    if oov_buckets is not None and oov_buckets < 1:
+        raise ValueError(f"There must be at least one OOV bucket, got: {oov_buckets}")
+    if not _mappable(f) or compression(f) is not None:
+        raise ValueError(
+            "Reading with a vocab needs an uncompressed file on disk, use `read` or `iter_batches` instead."
+        )
+    if file_type is None:
+        file_type = sniff(f)
+        LOGGER.info("Sniffed word vector as type %s", file_type)
+    if file_type is FileType.GLOVE:
+        return read_glove_lines, _count_lines, _scan_glove
+    if file_type is FileType.W2V_TEXT or file_type is FileType.FASTTEXT or file_type is FileType.NUMBERBATCH:
+        return read_w2v_text_lines, _count_w2v, _scan_w2v_text
+    if file_type is FileType.W2V:
+        return read_w2v_lines, _count_w2v, _scan_w2v
+    if file_type is FileType.LEADER:
+        return read_leader_lines, _count_leader, _scan_leader
+    raise ValueError(f"Unknown vector format, got: {file_type}")
+
+
+def iter_batches(
+    f: Union[str, TextIO, BinaryIO],
+    file_type: Optional[FileType] = None,
+    batch_size: int = ITER_BATCH,
+    io_strategy: str = "mmap-sequential",
+) -> Iterator[Tuple[List[str], np.ndarray]]:
+    """Stream batches of vectors from a file.
+
+    Unlike :py:func:`~word_vectors.read.read` this never holds more than a batch (and
+    for text formats the block of the file being parsed) in memory so it can be used
+    to filter, normalize, or index files that are too large to load. ::
+
+        for words, vectors in iter_batches("crawl-300d-2M.vec", batch_size=10000):
+            ...
+
+    Note:
+        The rows are yielded as they appear in the file, duplicated words are not
+        removed.
+
+    Compressed files are decompressed as they are read, see :py:func:`~word_vectors.read.read`.
+    (The exception is version 2 Leader files where all the vectors are stored before
+    any of the words so the whole file is decompressed before the first batch.)
+
+    Args:
+        f: The file to read from.
+        file_type: The vector file format. If ``None`` the file is sniffed to determine
+            format.
+        batch_size: The number of vectors in each batch, the last batch may be smaller.
+        io_strategy: How the file is read, see :py:func:`~word_vectors.read.read`.
+
+    Yields:
+        A list of words and a float32 matrix of shape ``[len(words), vector size]``.
+    """
+    if batch_size < 1:
+        raise ValueError(f"Batch size must be positive, got: {batch_size}")
+    check_io_strategy(io_strategy)
+    if not _mappable(f):
+        yield from _rebatch(_stream_batches(_binary_stream(f), file_type), batch_size)
+        return
+    if compression(f) is not None or io_strategy not in MAPPED_STRATEGIES:
+        yield from _rebatch(_stream_batches(_binary_stream(f), file_type, io_strategy), batch_size)
+        return
     if file_type is None:
         file_type = sniff(f)
         LOGGER.info("Sniffed word vector as type %s", file_type)
     if file_type is FileType.GLOVE:
-        line_reader = read_glove_lines
+        yield from _rebatch(read_glove_blocks(f, io_strategy=io_strategy), batch_size)
     elif file_type is FileType.W2V_TEXT or file_type is FileType.FASTTEXT or file_type is FileType.NUMBERBATCH:
-        line_reader = read_w2v_text_lines
+        yield from _rebatch(read_w2v_text_blocks(f, io_strategy=io_strategy), batch_size)
     elif file_type is FileType.W2V:
-        line_reader = read_w2v_lines
+        yield from _iter_binary_batches(f, _scan_w2v, batch_size, io_strategy)
     elif file_type is FileType.LEADER:
-        line_reader = read_leader_lines
+        yield from _iter_binary_batches(f, _scan_leader, batch_size, io_strategy)
     else:
-        raise ValueError(f"Unknown vector format, got: {line_reader}")
-    if keep_extra:
-        return _read_with_vocab_extra(f, line_reader, user_vocab, initializer)
-    return _read_with_vocab(f, line_reader, user_vocab, initializer)
+        raise ValueError(f"Unknown vector format, got: {file_type}")
+
+
+def _rebatch(
+    blocks: Iterator[Tuple[List[str], np.ndarray]], batch_size: int
+) -> Iterator[Tuple[List[str], np.ndarray]]:
+    """Regroup the blocks from a ``read_*_blocks`` function into batches of ``batch_size`` rows."""
+    words = []
+    vectors = []
+    size = 0
+    for block_words, block in blocks:
+        words.extend(block_words)
+        vectors.append(block)
+        size += len(block)
+        while size >= batch_size:
+            matrix = vectors[0] if len(vectors) == 1 else np.concatenate(vectors)
+            yield words[:batch_size], matrix[:batch_size]
+            words, vectors, size = words[batch_size:], [matrix[batch_size:]], size - batch_size
+    if size:
+        yield words, vectors[0] if len(vectors) == 1 else np.concatenate(vectors)
+
+
+def _read_stream(
+    f: Union[str, IO], file_type: Optional[FileType] = None, io_strategy: str = "buffered"
+) -> Tuple[Vocab, Vectors]:
+    """Read a file that is compressed, can't be memory mapped, or shouldn't be memory mapped by parsing it in chunks."""
+    LOGGER.info("Reading %s as a stream", getattr(f, "name", f))
+    return _read_blocks(_binary_stream(f), partial(_stream_batches, file_type=file_type, io_strategy=io_strategy), 0)
+
+
+def _mappable(f: Union[str, pathlib.PurePath, IO]) -> bool:
+    """Check if a file is a regular file on disk that we can memory map."""
+    try:
+        info = os.stat(f) if isinstance(f, (str, pathlib.PurePath)) else os.fstat(f.fileno())
+    except (AttributeError, OSError, ValueError):
+        # ``io.UnsupportedOperation`` (from in memory streams) is both an OSError and a ValueError.
+        return False
+    return stat.S_ISREG(info.st_mode)
+
+
+def _map(f: IO, io_strategy: str = "mmap-sequential", whole: bool = False) -> mmap.mmap:
+    """Memory map a file read-only and advise the kernel how it will be read."""
+    m = mmap.mmap(f.fileno(), 0, prot=mmap.PROT_READ)
+    advise(m, io_strategy, whole)
+    return m
+
+
+def _binary_stream(f: Union[str, pathlib.PurePath, IO]) -> Union[str, pathlib.PurePath, BinaryIO]:
+    """Get a binary version of a stream that was opened in text mode."""
+    if isinstance(f, io.TextIOBase):
+        if hasattr(f, "buffer"):
+            return f.buffer
+        return io.BytesIO(f.read().encode("utf-8"))
+    return f
+
+
+@file_or_name(f="rb")
+def _stream_batches(
+    f: Union[str, BinaryIO], file_type: Optional[FileType] = None, io_strategy: str = "buffered"
+) -> Iterator[Tuple[List[str], np.ndarray]]:
+    """Parse a file in chunks as it is read, decompressing it if it is compressed.
+
+    Args:
+        f: The file, this can be a stream that can't be memory mapped or rewound.
+        file_type: The vector file format. If ``None`` the start of the decompressed
+            file is sniffed to determine the format.
+        io_strategy: ``"pread"`` reads an uncompressed file on disk with ``os.pread``,
+            anything else uses ``read``.
+
+    Yields:
+        A list of words and a float32 matrix of shape ``[len(words), vector size]``,
+        the rows are in file order and duplicates are not removed.
+    """
+    codec = compression(f)
+    stream = open_compressed(f, codec) if codec is not None else f
+    if io_strategy == "pread" and codec is None and hasattr(os, "pread") and _mappable(f):
+        chunks = prefetch(pread_chunks(f, BLOCK_SIZE))
+    else:
+        chunks = prefetch(iter(partial(stream.read, BLOCK_SIZE), b""))
+    try:
+        buf = _ChunkBuffer(chunks)
+        if file_type is None:
+            while len(buf.buf) < SNIFF_SIZE and buf.fill():
+                pass
+            head = bytes(buf.buf[:SNIFF_SIZE])
+            file_type = _sniff_binary(head, is_binary(io.BytesIO(head)), getattr(f, "name", f))
+            LOGGER.info("Sniffed word vector as type %s", file_type)
+        if file_type is FileType.GLOVE:
+            for block in _line_blocks(buf):
+                yield _parse_text_block(block)
+        elif file_type is FileType.W2V_TEXT or file_type is FileType.FASTTEXT or file_type is FileType.NUMBERBATCH:
+            buf.readline()
+            for block in _line_blocks(buf):
+                yield _parse_text_block(block)
+        elif file_type is FileType.W2V:
+            yield from _stream_w2v(buf)
+        elif file_type is FileType.LEADER:
+            yield from _stream_leader(buf)
+        else:
+            raise ValueError(f"Unknown vector format, got: {file_type}")
+    finally:
+        # Stop reading ahead before closing the decompressor, the file itself is managed by the caller.
+        chunks.close()
+        if stream is not f:
+            stream.close()
+
+
+class _ChunkBuffer:
+    """Buffer the chunks of a stream so that records can be parsed across chunk boundaries."""
+
+    def __init__(self, chunks: Iterator[bytes]):
+        self.chunks = iter(chunks)
+        self.buf = bytearray()
+
+    def fill(self) -> bool:
+        """Add the next chunk to the buffer, returns False once the stream is exhausted."""
+        chunk = next(self.chunks, None)
+        if chunk is None:
+            return False
+        self.buf += chunk
+        return True
 
+    def read(self, n: int) -> bytearray:
+        while len(self.buf) < n and self.fill():
+            pass
+        data = self.buf[:n]
+        del self.buf[:n]
+        return data
+
+    def readinto(self, out: memoryview) -> int:
+        """Read straight into ``out`` so large sections are not copied through the buffer."""
+        n = min(len(out), len(self.buf))
+        out[:n] = self.buf[:n]
+        del self.buf[:n]
+        for chunk in self.chunks:
+            if n == len(out):
+                self.buf += chunk
+                break
+            take = min(len(chunk), len(out) - n)
+            out[n : n + take] = chunk[:take]
+            self.buf += chunk[take:]
+            n += take
+        return n
+
+    def readline(self) -> bytearray:
+        start = 0
+        while True:
+            newline = self.buf.find(b"\n", start)
+            if newline != -1:
+                return self.read(newline + 1)
+            start = len(self.buf)
+            if not self.fill():
+                return self.read(len(self.buf))
+
+    def __iter__(self) -> Iterator[bytes]:
+        """Yield what is left of the stream, starting with the buffer."""
+        if self.buf:
+            yield bytes(self.buf)
+            self.buf = bytearray()
+        yield from self.chunks
+
+
+def _line_blocks(chunks: Iterator[bytes]) -> Iterator[bytes]:
+    """Regroup the chunks of a text stream into blocks of complete lines."""
+    carry = b""
+    for chunk in chunks:
+        data = carry + chunk if carry else chunk
+        cut = data.rfind(b"\n") + 1
+        if cut:
+            yield data[:cut]
+        carry = data[cut:]
+    if carry:
+        yield carry
+
+
+def _stream_w2v(buf: _ChunkBuffer) -> Iterator[Tuple[List[str], np.ndarray]]:
+    vocab, dim = map(int, buf.readline().decode("utf-8").split())
+    size = FLOAT_SIZE * dim
+    while vocab:
+        data = buf.buf
+        offset = 0
+        words = []
+        starts = []
+        while vocab:
+            end = data.find(b" ", offset + 1)
+            if end == -1 or end + 1 + size > len(data):
+                break
+            words.append(data[offset:end].decode("utf-8"))
+            starts.append(end + 1)
+            offset = end + 1 + size
+            vocab -= 1
+        if words:
+            yield words, _gather_vectors(data, np.array(starts), dim)
+        del data[:offset]
+        if vocab and not buf.fill():
+            raise ValueError(f"The file ended before all of the vectors were read, {vocab} are missing.")
+
+
+def _stream_leader(buf: _ChunkBuffer) -> Iterator[Tuple[List[str], np.ndarray]]:
+    head = buf.read(LONG_SIZE * LEADER_V2_HEADER)
+    if leader_version(head) >= 2:
+        # The vectors come before the words so the vectors have to be read into memory
+        # before we can produce anything.
+        if len(head) < LONG_SIZE * LEADER_V2_HEADER:
+            raise ValueError("The file ended before all of the vectors were read.")
+        header = read_leader_v2_header(head)
+        _read_exactly(buf, header.vectors - len(head))
+        vectors = np.empty((header.vocab, header.dim), dtype="<f4")
+        size = buf.readinto(memoryview(vectors).cast("B"))
+        if size < vectors.nbytes:
+            missing = header.vocab - size // (FLOAT_SIZE * header.dim)
+            raise ValueError(f"The file ended before all of the vectors were read, {missing} are missing.")
+        _read_exactly(buf, header.word_offsets - header.vectors - vectors.nbytes)
+        offsets = np.frombuffer(_read_exactly(buf, LONG_SIZE * (header.vocab + 1)), dtype="<u8").tolist()
+        _read_exactly(buf, header.words - header.word_offsets - LONG_SIZE * (header.vocab + 1))
+        words = _read_exactly(buf, offsets[-1])
+        words = [words[start:end].decode("utf-8") for start, end in zip(offsets, offsets[1:])]
+        vectors = vectors.astype(np.float32, copy=False)
+        for i in range(0, header.vocab, ITER_BATCH):
+            yield words[i : i + ITER_BATCH], vectors[i : i + ITER_BATCH]
+        return
+    vocab, dim = read_leader_header(head)
+    # Put back the part of the v2 sized header we read that is actually the first record.
+    buf.buf[:0] = head[LONG_SIZE * LEADER_HEADER :]
+    size = FLOAT_SIZE * dim
+    while vocab:
+        data = buf.buf
+        offset = 0
+        words = []
+        starts = []
+        while vocab and offset + INT_SIZE <= len(data):
+            word_start = offset + INT_SIZE
+            word_end = word_start + struct.unpack("<I", data[offset:word_start])[0]
+            if word_end + size > len(data):
+                break
+            words.append(data[word_start:word_end].decode("utf-8"))
+            starts.append(word_end)
+            offset = word_end + size
+            vocab -= 1
+        if words:
+            yield words, _gather_vectors(data, np.array(starts), dim)
+        del data[:offset]
+        if vocab and not buf.fill():
+            raise ValueError(f"The file ended before all of the vectors were read, {vocab} are missing.")
+
+
+def _read_exactly(buf: _ChunkBuffer, n: int) -> bytearray:
+    """Read ``n`` bytes from the stream, a truncated file raises instead of returning fewer bytes."""
+    data = buf.read(n)
+    if len(data) < n:
+        raise ValueError("The file ended before all of the vectors were read.")
+    return data
 
-def _read(
-    f: Union[str, IO], line_reader: Callable[[Union[str, IO]], Iterator[Tuple[str, np.ndarray]]]
+
+@file_or_name(f="rb")
+def _iter_binary_batches(
+    f: Union[str, BinaryIO],
+    scanner: Callable[[mmap.mmap], Tuple[Optional[int], Iterator[Tuple[bytes, int]]]],
+    batch_size: int,
+    io_strategy: str = "mmap-sequential",
+) -> Iterator[Tuple[List[str], np.ndarray]]:
+    with _map(f, io_strategy, whole=True) as m:
+        dim, rows = scanner(m)
+        while True:
+            batch = list(islice(rows, batch_size))
+            if not batch:
+                break
+            words, starts = zip(*batch)
+            # The batch is copied out of the file so it is still valid after the file is closed.
+            yield [word.decode("utf-8") for word in words], _gather_vectors(m, np.array(starts), dim)
+
+
+def _read_blocks(
+    f: Union[str, IO],
+    block_reader: Callable[[Union[str, IO]], Iterator[Tuple[List[str], np.ndarray]]],
+    vocab_size: int,
 ) -> Tuple[Vocab, Vectors]:
     words = {}
-    vectors = []
-    for word, vector in line_reader(f):
-        if word not in words:
-            words[word] = len(words)
-            vectors.append(vector)
-    return words, np.vstack(vectors)
+    vectors = None
+    for block_words, block in block_reader(f):
+        keep = []
+        for i, word in enumerate(block_words):
+            if word not in words:
+                words[word] = len(words)
+                keep.append(i)
+        # Only pay for the copy made by fancy indexing when there were duplicates in this block.
+        block = block if len(keep) == len(block) else block[keep]
+        if vectors is None:
+            vectors = np.empty((vocab_size, block.shape[1]), dtype=block.dtype)
+        vectors = _ensure_rows(vectors, len(words))
+        vectors[len(words) - len(block) : len(words)] = block
+    return words, _trim(vectors, len(words))
 
 
+@file_or_name(f="rb")
 def _read_with_vocab(
     f: Union[str, IO],
-    line_reader: Callable[[Union[str, IO]], Iterator[Tuple[str, np.ndarray]]],
+    scanner: Callable[[mmap.mmap], Tuple[Optional[int], Iterator[Tuple[bytes, int]]]],
     user_vocab: Vocab,
     initializer: Callable[[int], np.ndarray],
+    io_strategy: str = "mmap-sequential",
+    oov_buckets: Optional[int] = None,
 ) -> Tuple[Vocab, Vectors]:
-    vectors = [None for _ in range(len(user_vocab))]
-    for word, vector in line_reader(f):
-        vector_size = len(vector)
-        if word in user_vocab:
-            idx = user_vocab[word]
-            if vectors[idx] is None:
+    """Read the vectors for the user vocab, only the vectors of words in the vocab are parsed.
+
+    Args:
+        f: The file to read from.
+        scanner: One of the ``_scan_*`` functions, it returns the vector size (``None``
+            for text formats) and an iterator of the raw bytes of each word and the
+            offset of its vector.
+        user_vocab: The words to read.
+        initializer: Creates vectors for words that are not in the file.
+        io_strategy: How the file is memory mapped, we might stop early so reading the
+            whole file is never requested up front.
+        oov_buckets: The number of hashed rows shared by the missing words, ``None``
+            gives each its own row.
+
+    Returns:
+        The user vocab and the vectors.
+    """
+    with _map(f, io_strategy) as m:
+        dim, words = scanner(m)
+        parse = parse_text_vector if dim is None else partial(parse_binary_vector, dim=dim)
+        # Compare the raw bytes of each word so rows that aren't in the vocab are never decoded or parsed.
+        encoded = {word.encode("utf-8"): idx for word, idx in user_vocab.items()}
+        vectors = None
+        found = np.zeros(len(user_vocab), dtype=np.bool_)
+        missing = len(user_vocab)
+        rows = 0
+        for word, offset in words:
+            rows += 1
+            idx = encoded.get(word)
+            if idx is not None and not found[idx]:
+                vector = parse(m, offset)
+                if vectors is None:
+                    vectors = np.empty((len(user_vocab), len(vector)), dtype=vector.dtype)
                 vectors[idx] = vector
-    for i, vector in enumerate(vectors):
-        if vector is None:
-            vectors[i] = initializer(vector_size)
-    return user_vocab, np.vstack(vectors)
+                found[idx] = True
+                missing -= 1
+            # Once every word has been found there is no reason to keep reading the file.
+            if missing == 0:
+                LOGGER.info("Found all %d words in the vocab after reading %d vectors.", len(user_vocab), rows)
+                break
+        else:
+            LOGGER.info("Read all %d vectors, %d words in the vocab were not found.", rows, missing)
+        if vectors is None:
+            if dim is None:
+                # Nothing matched so parse the first vector to find the vector size.
+                first = next(scanner(m)[1], None)
+                dim = 0 if first is None else len(parse(m, first[1]))
+            vectors = np.empty((len(user_vocab), dim), dtype=np.float32)
+    return _fill_missing(vectors, found, initializer, user_vocab, oov_buckets)
+
+
+@file_or_name(f="rb")
+def _read_with_vocabs(
+    f: Union[str, IO],
+    scanner: Callable[[mmap.mmap], Tuple[Optional[int], Iterator[Tuple[bytes, int]]]],
+    user_vocabs: Dict[str, Vocab],
+    initializer: Callable[[int], np.ndarray],
+    io_strategy: str = "mmap-sequential",
+    oov_buckets: Optional[int] = None,
+) -> Dict[str, Tuple[Vocab, Vectors]]:
+    """Read the vectors for several user vocabs in one scan, see :py:func:`~word_vectors.read._read_with_vocab`."""
+    names = list(user_vocabs)
+    # Each word routes to every (vocab, index) that needs it. A word is removed once it is found so only the first
+    # occurrence of a duplicated word is used and we know we are done when nothing is left.
+    routes = {}
+    for i, name in enumerate(names):
+        for word, idx in user_vocabs[name].items():
+            routes.setdefault(word.encode("utf-8"), []).append((i, idx))
+    vectors = [None] * len(names)
+    found = [np.zeros(len(user_vocabs[name]), dtype=np.bool_) for name in names]
+    with _map(f, io_strategy) as m:
+        dim, words = scanner(m)
+        parse = parse_text_vector if dim is None else partial(parse_binary_vector, dim=dim)
+        rows = 0
+        if routes:
+            for word, offset in words:
+                rows += 1
+                targets = routes.pop(word, None)
+                if targets is None:
+                    continue
+                vector = parse(m, offset)
+                for i, idx in targets:
+                    if vectors[i] is None:
+                        vectors[i] = np.empty((len(found[i]), len(vector)), dtype=vector.dtype)
+                    vectors[i][idx] = vector
+                    found[i][idx] = True
+                if not routes:
+                    LOGGER.info("Found the words of all %d vocabs after reading %d vectors.", len(names), rows)
+                    break
+            else:
+                LOGGER.info("Read all %d vectors, %d words in the vocabs were not found.", rows, len(routes))
+        parsed = [v for v in vectors if v is not None]
+        if parsed:
+            dim = parsed[0].shape[1]
+        elif dim is None:
+            # Nothing matched so parse the first vector to find the vector size.
+            first = next(scanner(m)[1], None)
+            dim = 0 if first is None else len(parse(m, first[1]))
+    results = {}
+    for i, name in enumerate(names):
+        if vectors[i] is None:
+            vectors[i] = np.empty((len(found[i]), dim), dtype=np.float32)
+        results[name] = _fill_missing(vectors[i], found[i], initializer, user_vocabs[name], oov_buckets)
+    return results
+
+
+@file_or_name(f="rb")
+def _read_with_vocab_indexed(
+    f: Union[str, IO],
+    index: "TextIndex",
+    user_vocab: Vocab,
+    initializer: Callable[[int], np.ndarray],
+    oov_buckets: Optional[int] = None,
+) -> Tuple[Vocab, Vectors]:
+    """Read the user vocab from a text file by jumping straight to the lines in its sidecar index."""
+    with index:
+        vectors = np.empty((len(user_vocab), index.dim), dtype=np.float32)
+        found = np.zeros(len(user_vocab), dtype=np.bool_)
+        rows, offsets = [], []
+        for word, idx in user_vocab.items():
+            offset = index.get(word)
+            if offset is not None:
+                rows.append(idx)
+                offsets.append(offset)
+        if rows:
+            # Only the lines in the vocab are read so readahead would just pull in lines we skip.
+            with _map(f, "mmap-random") as m:
+                # Parse in file order so we walk through the file front to back.
+                order = np.argsort(offsets)
+                rows = np.array(rows)[order]
+                offsets = np.array(offsets)[order].tolist()
+                for i in range(0, len(rows), READ_BATCH):
+                    vectors[rows[i : i + READ_BATCH]] = parse_text_vectors(m, offsets[i : i + READ_BATCH])
+            found[rows] = True
+    return _fill_missing(vectors, found, initializer, user_vocab, oov_buckets)
 
 
 def _read_with_vocab_extra(
@@ -193,38 +899,382 @@ def _read_with_vocab_extra(
     line_reader: Callable[[Union[str, IO]], Iterator[Tuple[str, np.ndarray]]],
     user_vocab: Vocab,
     initializer: Callable[[int], np.ndarray],
+    vocab_size: int,
+    oov_buckets: Optional[int] = None,
 ) -> Tuple[Vocab, Vectors]:
     user_vocab_size = len(user_vocab)
-    vectors = [None for _ in range(len(user_vocab))]
+    vectors = None
+    found = np.zeros(user_vocab_size, dtype=np.bool_)
     extra_words = {}
-    extra_vectors = []
     for word, vector in line_reader(f):
-        vector_size = len(vector)
+        if vectors is None:
+            # The extra words fill the rows after the user vocab, at most every word in the file is an extra.
+            vectors = np.empty((user_vocab_size + vocab_size, len(vector)), dtype=vector.dtype)
         if word in user_vocab:
             idx = user_vocab[word]
-            if vectors[idx] is None:
+            if not found[idx]:
                 vectors[idx] = vector
+                found[idx] = True
         else:
             if word not in extra_words:
+                idx = user_vocab_size + len(extra_words)
+                vectors = _ensure_rows(vectors, idx + 1)
+                vectors[idx] = vector
                 extra_words[word] = len(extra_words)
-                extra_vectors.append(vector)
-    for i, vector in enumerate(vectors):
-        if vector is None:
-            vectors[i] = initializer(vector_size)
-    for word, idx in extra_words.items():
+    if oov_buckets is not None:
+        vectors = _trim(vectors, user_vocab_size + len(extra_words))
+        return _bucket_missing(vectors, found, initializer, user_vocab, oov_buckets, list(extra_words))
+    _initialize_missing(vectors, found, initializer, user_vocab)
+    return _add_extra(user_vocab, extra_words), _trim(vectors, user_vocab_size + len(extra_words))
+
+
+def _add_extra(user_vocab: Vocab, extra_words: Iterable[str]) -> Vocab:
+    """Give the extra words the indices after the user vocab."""
+    if isinstance(user_vocab, CompactVocab):
+        # A compact vocab is read-only so we return a new one.
+        return user_vocab.extend(extra_words)
+    user_vocab_size = len(user_vocab)
+    for idx, word in enumerate(extra_words):
         user_vocab[word] = user_vocab_size + idx
-    vectors.extend(extra_vectors)
-    return user_vocab, np.vstack(vectors)
+    return user_vocab
+
+
+def _ensure_rows(vectors: np.ndarray, rows: int) -> np.ndarray:
+    """Grow the preallocated matrix if a file has more vectors than its header claimed."""
+    if rows <= len(vectors):
+        return vectors
+    grown = np.empty((max(rows, 2 * len(vectors)), vectors.shape[1]), dtype=vectors.dtype)
+    grown[: len(vectors)] = vectors
+    return grown
+
+
+def _trim(vectors: np.ndarray, rows: int) -> np.ndarray:
+    """Drop the unused rows (caused by duplicated words) from the end of a preallocated matrix.
+
+    This is done in place with ``ndarray.resize`` so we don't need memory for a copy of the matrix.
+    """
+    if rows != len(vectors):
+        vectors.resize((rows, vectors.shape[1]), refcheck=False)
+    return vectors
+
+
+def _fill_missing(
+    vectors: np.ndarray,
+    found: np.ndarray,
+    initializer: Callable[[int], np.ndarray],
+    user_vocab: Vocab,
+    oov_buckets: Optional[int] = None,
+) -> Tuple[Vocab, Vectors]:
+    """Create the vectors for words that were not in the file, either a row for each or shared buckets."""
+    if oov_buckets is not None:
+        return _bucket_missing(vectors, found, initializer, user_vocab, oov_buckets)
+    _initialize_missing(vectors, found, initializer, user_vocab)
+    return user_vocab, vectors
+
+
+def _bucket_missing(
+    vectors: np.ndarray,
+    found: np.ndarray,
+    initializer: Callable[[int], np.ndarray],
+    user_vocab: Vocab,
+    oov_buckets: int,
+    extra: Sequence[str] = (),
+) -> Tuple[BucketVocab, Vectors]:
+    """Drop the rows of missing words and add hashed buckets that they share.
+
+    Args:
+        vectors: The vectors for the user vocab, followed by the rows of the extra words.
+        found: Which of the user vocab's rows were found in the file.
+        initializer: Creates the vectors for the buckets.
+        user_vocab: The user's vocab.
+        oov_buckets: The number of buckets.
+        extra: The extra words, in the order of their rows after the user vocab.
+
+    Returns:
+        The vocab of the words that were found (and the extra words) with the buckets, and the vectors.
+    """
+    words = [None] * len(found)
+    for word, idx in user_vocab.items():
+        if idx < len(found) and found[idx]:
+            words[idx] = word
+    rows = np.flatnonzero(found)
+    known = [words[idx] for idx in rows]
+    known.extend(extra)
+    keep = np.concatenate([rows, np.arange(len(found), len(found) + len(extra))])
+    total = len(keep) + oov_buckets
+    if total <= len(vectors):
+        # The kept rows only move towards the front so this can be done in place.
+        vectors[: len(keep)] = vectors[keep]
+        vectors = _trim(vectors, total)
+    else:
+        bucketed = np.empty((total, vectors.shape[1]), dtype=vectors.dtype)
+        bucketed[: len(keep)] = vectors[keep]
+        vectors = bucketed
+    # The buckets are named so a hashed initializer gives the same bucket vectors in every process.
+    bucket_names = {f"<oov bucket {i}>": i for i in range(oov_buckets)}
+    _initialize_missing(vectors[len(keep) :], np.zeros(oov_buckets, dtype=np.bool_), initializer, bucket_names)
+    LOGGER.info("Kept %d vectors, %d missing words share %d buckets.", len(keep), len(found) - len(rows), oov_buckets)
+    known = CompactVocab.from_words(known) if isinstance(user_vocab, CompactVocab) else to_vocab(known)
+    return BucketVocab(known, oov_buckets), vectors
+
+
+def _initialize_missing(
+    vectors: np.ndarray, found: np.ndarray, initializer: Callable[[int], np.ndarray], user_vocab: Vocab
+):
+    """Fill the rows for words that were not in the file using the initializer."""
+    missing = np.flatnonzero(~found)
+    if not isinstance(initializer, Initializer):
+        for idx in missing:
+            vectors[idx] = initializer(vectors.shape[1])
+        return
+    if not len(missing):
+        return
+    words = None
+    if initializer.uses_words:
+        words = [None] * len(found)
+        for word, idx in user_vocab.items():
+            if idx < len(found) and not found[idx]:
+                words[idx] = word
+        words = [words[idx] for idx in missing]
+    vectors[missing] = initializer.batch(len(missing), vectors.shape[1], words)
+
+
+def _load_sidecar(f: Union[str, IO]) -> Optional["TextIndex"]:
+    """Load the sidecar index of a text file, ``None`` when it doesn't have one."""
+    # word_vectors.index builds on the readers in this module so import it when we need it.
+    from word_vectors.index import load_index
+
+    return load_index(f)
+
+
+def _count_text(f: Union[str, IO], counter: Callable[[Union[str, IO]], int]) -> int:
+    """Get the number of vectors in a text file, this is exact when the file has a sidecar index."""
+    index = _load_sidecar(f)
+    if index is None:
+        return counter(f)
+    with index:
+        return len(index)
+
+
+@file_or_name(f="rb")
+def _count_lines(f: Union[str, BinaryIO]) -> int:
+    """Count the lines in a text file, this is the number of vectors in a GloVe file (ignoring duplicates)."""
+    with _map(f, whole=True) as m:
+        size = len(m)
+        lines = sum(m[i : i + BLOCK_SIZE].count(b"\n") for i in range(0, size, BLOCK_SIZE))
+        # The last line might not end with a newline.
+        if size and m[size - 1 : size] != b"\n":
+            lines += 1
+    return lines
+
+
+@file_or_name(f="rb")
+def _count_w2v(f: Union[str, BinaryIO]) -> int:
+    """Read the number of vectors from the header of a (text or binary) word2vec file."""
+    with mmap.mmap(f.fileno(), 0, prot=mmap.PROT_READ) as m:
+        vocab, _ = map(int, m.readline().decode("utf-8").split())
+    return vocab
+
+
+@file_or_name(f="rb")
+def _count_leader(f: Union[str, BinaryIO]) -> int:
+    """Read the number of vectors from the header of a Leader file."""
+    with mmap.mmap(f.fileno(), 0, prot=mmap.PROT_READ) as m:
+        vocab, _ = read_leader_header(m[: LONG_SIZE * LEADER_HEADER])
+    return vocab
+
+
+def _count_hint(f: Union[str, IO], file_type: Optional[FileType] = None) -> Optional[int]:
+    """Get an upper bound on the number of vectors in a file, ``None`` when we would have to read a stream to know.
+
+    This doesn't account for duplicated words so it can be larger than the vocab.
+    """
+    if not _mappable(f) or compression(f) is not None:
+        return None
+    _, counter, _ = _with_vocab_readers(f, file_type, "mmap-sequential", None)
+    return counter(f)
+
+
+def _parse_text_line(line: bytes) -> Tuple[str, np.ndarray]:
+    line = line.decode("utf-8")
+    line = line.rstrip("\n")
+    word, *vector = line.split(" ")
+    return word, np.asarray(vector, dtype=np.float32)
+
+
+def _parse_text_block(block: bytes) -> Tuple[List[str], np.ndarray]:
+    """Parse a block of complete lines from a text vector file in one go.
+
+    Only the word is split off of each line in python, all of the float text in the
+    block is handed to numpy at once and parsed into a single ``[lines, vector size]``
+    matrix. This relies on the C implementation of ``np.loadtxt`` (numpy 1.23+), it is
+    faster than splitting the text and casting the strings. If the vectorized parse fails (for example when the lines have different
+    numbers of elements) we fall back to parsing line by line so that the errors
+    match those of the ``*_lines`` readers.
+
+    Args:
+        block: Complete lines (each ending in a newline, except possibly the last line in the file).
+
+    Returns:
+        The words and a float32 matrix where row ``i`` is the vector for word ``i``.
+    """
+    lines = block.split(b"\n")
+    # The block ends with a newline so splitting creates an empty final element.
+    if not lines[-1]:
+        lines.pop()
+    words, _, vectors = zip(*(line.partition(b" ") for line in lines))
+    try:
+        vectors = np.loadtxt(vectors, dtype=np.float32, comments=None, ndmin=2)
+    except ValueError:
+        vectors = None
+    # ``np.loadtxt`` silently skips empty lines so a word without a vector would misalign the rows.
+    if vectors is None or len(vectors) != len(words):
+        words, vectors = zip(*map(_parse_text_line, lines))
+        return list(words), np.vstack(vectors)
+    return [word.decode("utf-8") for word in words], vectors
+
+
+def _text_blocks(
+    m: mmap.mmap, offset: int = 0, block_size: int = BLOCK_SIZE, end: Optional[int] = None
+) -> Iterator[bytes]:
+    """Split a memory mapped text file into blocks of complete lines.
+
+    Args:
+        m: The memory mapped file.
+        offset: Where in the file to start.
+        block_size: The approximate size of each block, blocks are extended to the
+            end of the line they would have cut.
+        end: Where in the file to stop, this should be the end of a line.
+
+    Yields:
+        Blocks of text, each ending at a newline (except possibly the last block).
+    """
+    for start, stop in _text_ranges(m, offset, block_size, end):
+        yield m[start:stop]
+
+
+def _text_ranges(
+    m: mmap.mmap, offset: int = 0, block_size: int = BLOCK_SIZE, end: Optional[int] = None
+) -> Iterator[Tuple[int, int]]:
+    """Split a memory mapped text file into ``(start, end)`` byte ranges of complete lines."""
+    size = len(m) if end is None else end
+    while offset < size:
+        stop = min(offset + block_size, size)
+        if stop < size:
+            newline = m.find(b"\n", stop - 1, size)
+            stop = size if newline == -1 else newline + 1
+        yield offset, stop
+        offset = stop
+
+
+def _count_newlines(m: mmap.mmap, start: int, end: int) -> int:
+    return sum(m[i : min(i + BLOCK_SIZE, end)].count(b"\n") for i in range(start, end, BLOCK_SIZE))
+
+
+@file_or_name(f="rb")
+def _read_text_parallel(f: Union[str, BinaryIO], workers: int, skip_header: bool = False) -> Tuple[Vocab, Vectors]:
+    """Parse a text (GloVe or w2v-text) file with a pool of processes.
+
+    The file is split into ranges of complete lines and the number of lines in each
+    range is counted so each range knows which rows of the output it fills. The
+    workers parse their ranges into a shared memory matrix and send back only the
+    words. The words are then deduplicated in file order (so the first occurrence
+    wins) and the matrix is copied out of shared memory, dropping the rows of any
+    duplicates.
+    """
+    with _map(f, whole=True) as m:
+        size = len(m)
+        start = 0
+        if skip_header:
+            newline = m.find(b"\n")
+            start = size if newline == -1 else newline + 1
+        if start == size:
+            LOGGER.debug("There are no vectors to parse in parallel, reading in this process.")
+            return read_w2v_text(f) if skip_header else read_glove(f)
+        ranges = list(_text_ranges(m, start, -(-(size - start) // (workers * RANGES_PER_WORKER))))
+        rows = [_count_newlines(m, s, e) for s, e in ranges]
+        # The last line might not end with a newline.
+        if m[size - 1 : size] != b"\n":
+            rows[-1] += 1
+        dim = len(parse_text_vector(m, m.find(b" ", start) + 1))
+    shape = (sum(rows), dim)
+    row_starts = np.cumsum([0] + rows[:-1]).tolist()
+    shm = (
+        shared_memory.SharedMemory(create=True, size=max(1, shape[0] * shape[1] * FLOAT_SIZE))
+        if shared_memory is not None
+        else None
+    )
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [
+                pool.submit(_parse_text_range, f.name, s, e, shm.name if shm else None, shape, row)
+                for (s, e), row in zip(ranges, row_starts)
+            ]
+            results = [future.result() for future in futures]
+        words = {}
+        keep = []
+        for row, (range_words, _) in zip(row_starts, results):
+            for i, word in enumerate(range_words, start=row):
+                if word not in words:
+                    words[word] = len(words)
+                    keep.append(i)
+        if shm is not None:
+            shared = np.ndarray(shape, dtype=np.float32, buffer=shm.buf)
+        else:
+            shared = np.concatenate([vectors for _, vectors in results])
+        # Fancy indexing copies the matrix out of shared memory, without duplicates we can do a plain copy.
+        vectors = np.array(shared) if len(keep) == len(shared) else shared[keep]
+        del shared
+    finally:
+        if shm is not None:
+            shm.close()
+            shm.unlink()
+    return words, vectors
+
+
+def _parse_text_range(
+    path: str, start: int, end: int, shm_name: Optional[str], shape: Tuple[int, int], row: int
+) -> Tuple[List[str], Optional[np.ndarray]]:
+    """Parse a range of complete lines from a text file, this is run in a worker process.
+
+    Args:
+        path: The file to parse.
+        start: The byte offset of the first line in the range.
+        end: The byte offset after the last line in the range.
+        shm_name: The name of the shared memory block to write vectors into. When
+            ``None`` the vectors are returned instead.
+        shape: The shape of the matrix in shared memory.
+        row: The row in the shared matrix that the first line is written to.
+
+    Returns:
+        The words in the range and the vectors if they were not written to shared memory.
+    """
+    words = []
+    blocks = []
+    shm = shared_memory.SharedMemory(name=shm_name) if shm_name is not None else None
+    try:
+        out = np.ndarray(shape, dtype=np.float32, buffer=shm.buf) if shm is not None else None
+        with open(path, "rb") as f:
+            with _map(f) as m:
+                for block in _text_blocks(m, start, end=end):
+                    block_words, vectors = _parse_text_block(block)
+                    if out is not None:
+                        out[row + len(words) : row + len(words) + len(vectors)] = vectors
+                    else:
+                        blocks.append(vectors)
+                    words.extend(block_words)
+        del out
+    finally:
+        if shm is not None:
+            shm.close()
+    return words, np.concatenate(blocks) if blocks else None
 
 
 @file_or_name
 def read_glove_lines(f: Union[str, TextIO]) -> Iterator[Tuple[str, np.ndarray]]:
-    with mmap.mmap(f.fileno(), 0, prot=mmap.PROT_READ) as m:
+    with _map(f, whole=True) as m:
         for line in iter(m.readline, b""):
-            line = line.decode("utf-8")
-            line = line.rstrip("\n")
-            word, *vector = line.split(" ")
-            yield word, np.asarray(vector, dtype=np.float32)
+            yield _parse_text_line(line)
 
 
 @file_or_name
@@ -233,33 +1283,146 @@ def read_w2v_text_lines(f: Union[str, TextIO]) -> Iterator[Tuple[str, np.ndarray
     # needs to be a multiple of ``ALLOCATIONGRANULARITY`` we can't start from the offset
     # that an ``f.readline()`` would give us. This means we can't just advance by one line
     # and then call read_glove so I had to duplicate code here :/
-    with mmap.mmap(f.fileno(), 0, prot=mmap.PROT_READ) as m:
+    with _map(f, whole=True) as m:
         _ = m.readline()
         for line in iter(m.readline, b""):
-            line = line.decode("utf-8")
-            line = line.rstrip("\n")
-            word, *vector = line.split(" ")
-            yield word, np.asarray(vector, dtype=np.float32)
+            yield _parse_text_line(line)
+
+
+@file_or_name
+def read_glove_blocks(
+    f: Union[str, TextIO], block_size: int = BLOCK_SIZE, io_strategy: str = "mmap-sequential"
+) -> Iterator[Tuple[List[str], np.ndarray]]:
+    """Read blocks of (words, vectors) from a glove file.
+
+    This is the bulk version of :py:func:`~word_vectors.read.read_glove_lines`, roughly
+    ``block_size`` bytes of the file are parsed at a time and the float text for the
+    whole block is converted to a single matrix.
+
+    Args:
+        f: The file to read from.
+        block_size: The approximate number of bytes to parse at once.
+        io_strategy: How the file is memory mapped, ``"mmap-sequential"`` or ``"mmap-random"``.
+
+    Yields:
+        A list of words and a float32 matrix of shape ``[len(words), vector size]``.
+    """
+    with _map(f, io_strategy, whole=True) as m:
+        for block in _text_blocks(m, 0, block_size):
+            yield _parse_text_block(block)
+
+
+@file_or_name
+def read_w2v_text_blocks(
+    f: Union[str, TextIO], block_size: int = BLOCK_SIZE, io_strategy: str = "mmap-sequential"
+) -> Iterator[Tuple[List[str], np.ndarray]]:
+    """Read blocks of (words, vectors) from a text based w2v file.
+
+    This is the bulk version of :py:func:`~word_vectors.read.read_w2v_text_lines`, see
+    :py:func:`~word_vectors.read.read_glove_blocks` for details.
+
+    Args:
+        f: The file to read from.
+        block_size: The approximate number of bytes to parse at once.
+        io_strategy: How the file is memory mapped, ``"mmap-sequential"`` or ``"mmap-random"``.
+
+    Yields:
+        A list of words and a float32 matrix of shape ``[len(words), vector size]``.
+    """
+    with _map(f, io_strategy, whole=True) as m:
+        _ = m.readline()
+        for block in _text_blocks(m, m.tell(), block_size):
+            yield _parse_text_block(block)
 
 
 @file_or_name(f="rb")
 def read_w2v_lines(f: Union[str, BinaryIO]) -> Iterator[Tuple[str, np.ndarray]]:
-    with mmap.mmap(f.fileno(), 0, prot=mmap.PROT_READ) as m:
-        header = m.readline()
+    with _map(f, whole=True) as m:
+        dim, words = _scan_w2v(m)
+        size = FLOAT_SIZE * dim
+        for word, offset in words:
+            yield word.decode("utf-8"), np.frombuffer(m[offset : offset + size], dtype=np.float32)
+
+
+@file_or_name(f="rb")
+def _read_w2v_table(f: Union[str, BinaryIO], io_strategy: str = "mmap-sequential") -> Tuple[Vocab, Vectors]:
+    """Read a word2vec binary file in two passes.
+
+    The first pass hops from word to word with the native ``find`` to build a table
+    of where each vector starts, the second copies all of the vectors into a
+    preallocated matrix with vectorized gathers (see :py:func:`~word_vectors.read._gather_vectors`).
+    """
+    with _map(f, io_strategy, whole=True) as m:
+        vocab, dim = map(int, m.readline().decode("utf-8").split())
+        find = m.find
         offset = m.tell()
-        vocab, dim = map(int, header.decode("utf-8").split())
         size = FLOAT_SIZE * dim
+        words = []
+        starts = []
         for _ in range(vocab):
-            word, offset = find_space(m, offset)
-            raw = m[offset : offset + size]
-            vector = np.frombuffer(raw, dtype=np.float32)
-            yield word, vector
-            offset = offset + size
+            end = find(b" ", offset + 1)
+            words.append(m[offset:end])
+            starts.append(end + 1)
+            offset = end + 1 + size
+        words = [word.decode("utf-8") for word in words]
+        starts = np.array(starts, dtype=np.int64)
+        vocab = {word: i for i, word in enumerate(words)}
+        if len(vocab) != len(words):
+            # Only gather the first occurrence of duplicated words.
+            vocab = {}
+            keep = []
+            for i, word in enumerate(words):
+                if word not in vocab:
+                    vocab[word] = len(vocab)
+                    keep.append(i)
+            starts = starts[keep]
+        vectors = _gather_vectors(m, starts, dim)
+    return vocab, vectors
+
+
+def _gather_vectors(buf: Union[bytes, mmap.mmap], starts: np.ndarray, dim: int) -> np.ndarray:
+    """Copy float32 vectors that start at arbitrary byte offsets of a buffer into a single matrix.
+
+    A float32 view of the buffer can only start at offsets that are a multiple of 4
+    bytes from where the view starts, so the vectors are grouped by their offset mod 4
+    and each group uses a view that starts at that shift. A sliding window view over
+    the floats has a row starting at every element so collecting the vectors is just
+    indexing rows of the window view.
+
+    Args:
+        buf: The contents of the file.
+        starts: The byte offset of each vector.
+        dim: The size of the vectors.
+
+    Returns:
+        A ``[len(starts), dim]`` matrix of the vectors.
+    """
+    vectors = np.empty((len(starts), dim), dtype=np.float32)
+    for shift in range(FLOAT_SIZE):
+        rows = np.flatnonzero(starts % FLOAT_SIZE == shift)
+        if not len(rows):
+            continue
+        floats = np.frombuffer(buf, dtype=np.float32, offset=shift, count=(len(buf) - shift) // FLOAT_SIZE)
+        windows = np.lib.stride_tricks.sliding_window_view(floats, dim)
+        index = (starts[rows] - shift) // FLOAT_SIZE
+        # Gather in batches so the temporary copy made by fancy indexing stays small.
+        for i in range(0, len(rows), GATHER_BATCH):
+            vectors[rows[i : i + GATHER_BATCH]] = windows[index[i : i + GATHER_BATCH]]
+        # Drop the views so the memory map can be closed.
+        del floats, windows
+    return vectors
 
 
 @file_or_name(f="rb")
 def read_leader_lines(f: Union[str, BinaryIO]) -> Iterator[Tuple[str, np.ndarray]]:
-    with mmap.mmap(f.fileno(), 0, prot=mmap.PROT_READ) as m:
+    with _map(f, whole=True) as m:
+        if leader_version(m[:LONG_SIZE]) >= 2:
+            header = read_leader_v2_header(m[: LONG_SIZE * LEADER_V2_HEADER])
+            vector_size = FLOAT_SIZE * header.dim
+            for i, word in enumerate(_leader_words(m, header)):
+                start = header.vectors + i * vector_size
+                yield word, np.frombuffer(m[start : start + vector_size], dtype=np.float32)
+            return
         offset = LONG_SIZE * LEADER_HEADER
         vocab, dim = read_leader_header(m[:offset])
         vector_size = FLOAT_SIZE * dim
@@ -276,8 +1439,217 @@ def read_leader_lines(f: Union[str, BinaryIO]) -> Iterator[Tuple[str, np.ndarray
             yield word, vector
 
 
+def _leader_words(m: mmap.mmap, header: "LeaderHeader") -> List[str]:
+    """Decode the words of a version 2 Leader file using the word offset table."""
+    return [word.decode("utf-8") for word in _leader_word_bytes(m, header)]
+
+
+def _leader_word_bytes(m: mmap.mmap, header: "LeaderHeader") -> List[bytes]:
+    offsets = np.frombuffer(m[header.word_offsets : header.words], dtype="<u8", count=header.vocab + 1).tolist()
+    words = m[header.words : header.words + offsets[-1]]
+    return [words[start:end] for start, end in zip(offsets, offsets[1:])]
+
+
+def _read_leader_columns(f: BinaryIO, io_strategy: str = "mmap-sequential") -> Tuple[Vocab, Vectors]:
+    """Read a version 2 Leader file, the vectors are a zero-copy view of the memory mapped file."""
+    # A copy-on-write mapping means the returned vectors can be modified without changing the file.
+    # The mapping stays open as long as the vectors (which hold a reference to it) are alive.
+    m = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+    advise(m, io_strategy, whole=True)
+    header = read_leader_v2_header(m[: LONG_SIZE * LEADER_V2_HEADER])
+    vectors = np.frombuffer(m, dtype="<f4", count=header.vocab * header.dim, offset=header.vectors)
+    vectors = vectors.reshape(header.vocab, header.dim)
+    words = _leader_words(m, header)
+    vocab = {word: i for i, word in enumerate(words)}
+    if len(vocab) != len(words):
+        # There are duplicate words so we need to pull out the rows of the first occurrences (this copies).
+        vocab = {}
+        keep = []
+        for i, word in enumerate(words):
+            if word not in vocab:
+                vocab[word] = len(vocab)
+                keep.append(i)
+        vectors = vectors[keep]
+    return vocab, vectors
+
+
+def _text_word_offsets(m: mmap.mmap, offset: int = 0) -> Iterator[Tuple[bytes, int]]:
+    """Find where the vector for each line in a text file starts without parsing the floats."""
+    for block in _text_blocks(m, offset):
+        lines = block.split(b"\n")
+        if not lines[-1]:
+            lines.pop()
+        for line in lines:
+            word = line.partition(b" ")[0]
+            yield word, offset + len(word) + 1
+            offset += len(line) + 1
+
+
+def _w2v_word_offsets(m: mmap.mmap) -> Iterator[Tuple[bytes, int]]:
+    vocab, dim = map(int, m.readline().decode("utf-8").split())
+    offset = m.tell()
+    size = FLOAT_SIZE * dim
+    for _ in range(vocab):
+        # Search for the space with the native ``find`` instead of checking each byte in python.
+        end = m.find(b" ", offset + 1)
+        yield m[offset:end], end + 1
+        offset = end + 1 + size
+
+
+def _leader_word_offsets(m: mmap.mmap) -> Iterator[Tuple[bytes, int]]:
+    if leader_version(m[:LONG_SIZE]) >= 2:
+        header = read_leader_v2_header(m[: LONG_SIZE * LEADER_V2_HEADER])
+        vector_size = FLOAT_SIZE * header.dim
+        for i, word in enumerate(_leader_word_bytes(m, header)):
+            yield word, header.vectors + i * vector_size
+        return
+    offset = LONG_SIZE * LEADER_HEADER
+    vocab, dim = read_leader_header(m[:offset])
+    vector_size = FLOAT_SIZE * dim
+    for _ in range(vocab):
+        word_start = offset + INT_SIZE
+        word_end = word_start + struct.unpack("<I", m[offset:word_start])[0]
+        yield m[word_start:word_end], word_end
+        offset = word_end + vector_size
+
+
+def _scan_glove(m: mmap.mmap) -> Tuple[Optional[int], Iterator[Tuple[bytes, int]]]:
+    return None, _text_word_offsets(m)
+
+
+def _scan_w2v_text(m: mmap.mmap) -> Tuple[Optional[int], Iterator[Tuple[bytes, int]]]:
+    return None, _text_word_offsets(m, m.find(b"\n") + 1)
+
+
+def _scan_w2v(m: mmap.mmap) -> Tuple[Optional[int], Iterator[Tuple[bytes, int]]]:
+    _, dim = map(int, m[: m.find(b"\n")].decode("utf-8").split())
+    m.seek(0)
+    return dim, _w2v_word_offsets(m)
+
+
+def _scan_leader(m: mmap.mmap) -> Tuple[Optional[int], Iterator[Tuple[bytes, int]]]:
+    if leader_version(m[:LONG_SIZE]) >= 2:
+        dim = read_leader_v2_header(m[: LONG_SIZE * LEADER_V2_HEADER]).dim
+    else:
+        _, dim = read_leader_header(m[: LONG_SIZE * LEADER_HEADER])
+    return dim, _leader_word_offsets(m)
+
+
+def _decoded(word_offsets: Iterator[Tuple[bytes, int]]) -> Iterator[Tuple[str, int]]:
+    for word, offset in word_offsets:
+        yield word.decode("utf-8"), offset
+
+
+@file_or_name
+def read_glove_offsets(f: Union[str, TextIO]) -> Iterator[Tuple[str, int]]:
+    """Read the words of a glove file and the byte offset where the text of their vectors start.
+
+    Args:
+        f: The file to read from.
+
+    Yields:
+        The word and the offset of its vector, use :py:func:`~word_vectors.read.parse_text_vector` to read the vector.
+    """
+    with _map(f) as m:
+        yield from _decoded(_text_word_offsets(m))
+
+
+@file_or_name
+def read_w2v_text_offsets(f: Union[str, TextIO]) -> Iterator[Tuple[str, int]]:
+    """Read the words of a text based w2v file and the byte offset where the text of their vectors start.
+
+    Args:
+        f: The file to read from.
+
+    Yields:
+        The word and the offset of its vector, use :py:func:`~word_vectors.read.parse_text_vector` to read the vector.
+    """
+    with _map(f) as m:
+        _ = m.readline()
+        yield from _decoded(_text_word_offsets(m, m.tell()))
+
+
+@file_or_name(f="rb")
+def read_w2v_offsets(f: Union[str, BinaryIO]) -> Iterator[Tuple[str, int]]:
+    """Read the words of a w2v file and the byte offset where their vectors start.
+
+    Args:
+        f: The file to read from.
+
+    Yields:
+        The word and the offset of its vector, use :py:func:`~word_vectors.read.parse_binary_vector` to read the vector.
+    """
+    with _map(f) as m:
+        yield from _decoded(_w2v_word_offsets(m))
+
+
+@file_or_name(f="rb")
+def read_leader_offsets(f: Union[str, BinaryIO]) -> Iterator[Tuple[str, int]]:
+    """Read the words of a leader file and the byte offset where their vectors start.
+
+    Args:
+        f: The file to read from.
+
+    Yields:
+        The word and the offset of its vector, use :py:func:`~word_vectors.read.parse_binary_vector` to read the vector.
+    """
+    with _map(f) as m:
+        yield from _decoded(_leader_word_offsets(m))
+
+
+def parse_text_vector(buf: Union[bytes, mmap.mmap], offset: int) -> np.ndarray:
+    """Parse the vector that starts at some offset in a text (GloVe or w2v-text) file.
+
+    Args:
+        buf: The contents of the file.
+        offset: Where the vector starts, from :py:func:`~word_vectors.read.read_glove_offsets`
+            or :py:func:`~word_vectors.read.read_w2v_text_offsets`.
+
+    Returns:
+        The vector.
+    """
+    end = buf.find(b"\n", offset)
+    end = len(buf) if end == -1 else end
+    return np.array(buf[offset:end].split(), dtype=np.float32)
+
+
+def parse_text_vectors(buf: Union[bytes, mmap.mmap], offsets: List[int]) -> np.ndarray:
+    """Parse the vectors that start at many offsets in a text (GloVe or w2v-text) file.
+
+    This hands all the float text to numpy at once which is much faster than calling
+    :py:func:`~word_vectors.read.parse_text_vector` for each offset.
+
+    Args:
+        buf: The contents of the file.
+        offsets: Where each vector starts.
+
+    Returns:
+        The vectors, a ``[len(offsets), vector size]`` matrix.
+    """
+    ends = [buf.find(b"\n", offset) for offset in offsets]
+    lines = [buf[offset : end if end != -1 else len(buf)] for offset, end in zip(offsets, ends)]
+    return np.loadtxt(lines, dtype=np.float32, comments=None, ndmin=2)
+
+
+def parse_binary_vector(buf: Union[bytes, mmap.mmap], offset: int, dim: int) -> np.ndarray:
+    """Read the vector that starts at some offset in a binary (w2v or Leader) file.
+
+    Args:
+        buf: The contents of the file.
+        offset: Where the vector starts, from :py:func:`~word_vectors.read.read_w2v_offsets`
+            or :py:func:`~word_vectors.read.read_leader_offsets`.
+        dim: The size of the vector.
+
+    Returns:
+        The vector.
+    """
+    return np.frombuffer(buf[offset : offset + FLOAT_SIZE * dim], dtype=np.float32)
+
+
 @file_or_name
-def read_glove(f: Union[str, TextIO]) -> Tuple[Vocab, Vectors]:
+def read_glove(
+    f: Union[str, TextIO], workers: Optional[int] = None, io_strategy: str = "mmap-sequential"
+) -> Tuple[Vocab, Vectors]:
     """Read vectors from a glove file.
 
     The GloVe format is a pure text format. Each (word, vector) pair is represented
@@ -295,15 +1667,28 @@ def read_glove(f: Union[str, TextIO]) -> Tuple[Vocab, Vectors]:
        In the case of duplicated words in the saved vectors we use the index
        and associated vector from the first occurrence of the word.
 
+    Parsing the float text is what makes reading this format slow. When ``workers``
+    is more than one the file is split into ranges of complete lines that are parsed
+    by a pool of processes, each one writes its vectors directly into a shared memory
+    block and the results are merged in file order.
+
     Args:
         f: The file to read from
+        workers: The number of processes used to parse the file. ``None`` parses it
+            in this process.
+        io_strategy: How the file is read, see :py:func:`~word_vectors.read.read`.
 
     Returns:
         The vocab and vectors. The vocab is a mapping from word to integer and
         vectors are a numpy array of shape ``[vocab size, vector size]``. The
         vocab gives the index offset into the vector matrix for some word.
     """
-    return _read(f, read_glove_lines)
+    check_io_strategy(io_strategy)
+    if not _mappable(f) or io_strategy not in MAPPED_STRATEGIES:
+        return _read_stream(f, FileType.GLOVE, io_strategy)
+    if workers is not None and workers > 1:
+        return _read_text_parallel(f, workers)
+    return _read_blocks(f, partial(read_glove_blocks, io_strategy=io_strategy), _count_text(f, _count_lines))
 
 
 @file_or_name
@@ -333,10 +1718,13 @@ def read_glove_with_vocab(
     Args:
         f: The file to read from.
         user_vocab: A specific vocabulary the user wants to extract form the pre-trained
-            embeddings.
+            embeddings. This can be a ``dict`` or a :py:class:`~word_vectors.vocab.CompactVocab`,
+            a ``dict`` is updated in place with the extra vocabulary while a new
+            :py:class:`~word_vectors.vocab.CompactVocab` is returned.
         initializer: A function that takes the vector size and generates a new vector.
             this is used to generate a representation for a word in the user vocab that
-            is not in the pre-train embeddings.
+            is not in the pre-train embeddings. An :py:class:`~word_vectors.utils.Initializer`
+            creates all of the missing vectors in one call.
         keep_extra: Should you also include vectors that are in the pre-trained embedding
             but not in the user provided vocab?
 
@@ -346,12 +1734,17 @@ def read_glove_with_vocab(
         vocab gives the index offset into the vector matrix for some word.
     """
     if keep_extra:
-        return _read_with_vocab_extra(f, read_glove_lines, user_vocab, initializer)
-    return _read_with_vocab(f, read_glove_lines, user_vocab, initializer)
+        return _read_with_vocab_extra(f, read_glove_lines, user_vocab, initializer, _count_lines(f))
+    index = _load_sidecar(f)
+    if index is not None:
+        return _read_with_vocab_indexed(f, index, user_vocab, initializer)
+    return _read_with_vocab(f, _scan_glove, user_vocab, initializer)
 
 
 @file_or_name
-def read_w2v_text(f: Union[str, TextIO]) -> Tuple[Vocab, Vectors]:
+def read_w2v_text(
+    f: Union[str, TextIO], workers: Optional[int] = None, io_strategy: str = "mmap-sequential"
+) -> Tuple[Vocab, Vectors]:
     """Read vectors from a text based w2v file.
 
     One of two different vector serialization formats introduced in the
@@ -387,13 +1780,21 @@ def read_w2v_text(f: Union[str, TextIO]) -> Tuple[Vocab, Vectors]:
 
     Args:
         f: The file to read from
+        workers: The number of processes used to parse the file. ``None`` parses it
+            in this process. See :py:func:`~word_vectors.read.read_glove`.
+        io_strategy: How the file is read, see :py:func:`~word_vectors.read.read`.
 
     Returns:
         The vocab and vectors. The vocab is a mapping from word to integer and
         vectors are a numpy array of shape ``[vocab size, vector size]``. The
         vocab gives the index offset into the vector matrix for some word.
     """
-    return _read(f, read_w2v_text_lines)
+    check_io_strategy(io_strategy)
+    if not _mappable(f) or io_strategy not in MAPPED_STRATEGIES:
+        return _read_stream(f, FileType.W2V_TEXT, io_strategy)
+    if workers is not None and workers > 1:
+        return _read_text_parallel(f, workers, skip_header=True)
+    return _read_blocks(f, partial(read_w2v_text_blocks, io_strategy=io_strategy), _count_text(f, _count_w2v))
 
 
 @file_or_name
@@ -423,10 +1824,13 @@ def read_w2v_text_with_vocab(
     Args:
         f: The file to read from.
         user_vocab: A specific vocabulary the user wants to extract form the pre-trained
-            embeddings.
+            embeddings. This can be a ``dict`` or a :py:class:`~word_vectors.vocab.CompactVocab`,
+            a ``dict`` is updated in place with the extra vocabulary while a new
+            :py:class:`~word_vectors.vocab.CompactVocab` is returned.
         initializer: A function that takes the vector size and generates a new vector.
             this is used to generate a representation for a word in the user vocab that
-            is not in the pre-train embeddings.
+            is not in the pre-train embeddings. An :py:class:`~word_vectors.utils.Initializer`
+            creates all of the missing vectors in one call.
         keep_extra: Should you also include vectors that are in the pre-trained embedding
             but not in the user provided vocab?
 
@@ -436,12 +1840,15 @@ def read_w2v_text_with_vocab(
         vocab gives the index offset into the vector matrix for some word.
     """
     if keep_extra:
-        return _read_with_vocab_extra(f, read_w2v_text_lines, user_vocab, initializer)
-    return _read_with_vocab(f, read_w2v_text_lines, user_vocab, initializer)
+        return _read_with_vocab_extra(f, read_w2v_text_lines, user_vocab, initializer, _count_w2v(f))
+    index = _load_sidecar(f)
+    if index is not None:
+        return _read_with_vocab_indexed(f, index, user_vocab, initializer)
+    return _read_with_vocab(f, _scan_w2v_text, user_vocab, initializer)
 
 
 @file_or_name(f="rb")
-def read_w2v(f: Union[str, BinaryIO]) -> Tuple[Vocab, Vectors]:
+def read_w2v(f: Union[str, BinaryIO], io_strategy: str = "mmap-sequential") -> Tuple[Vocab, Vectors]:
     """Read vectors from a word2vec file.
 
     One of two different vector serialization formats introduced in the
@@ -479,13 +1886,17 @@ def read_w2v(f: Union[str, BinaryIO]) -> Tuple[Vocab, Vectors]:
 
     Args:
         f: The file to read from
+        io_strategy: How the file is read, see :py:func:`~word_vectors.read.read`.
 
     Returns:
         The vocab and vectors. The vocab is a mapping from word to integer and
         vectors are a numpy array of shape ``[vocab size, vector size]``. The
         vocab gives the index offset into the vector matrix for some word.
     """
-    return _read(f, read_w2v_lines)
+    check_io_strategy(io_strategy)
+    if not _mappable(f) or io_strategy not in MAPPED_STRATEGIES:
+        return _read_stream(f, FileType.W2V, io_strategy)
+    return _read_w2v_table(f, io_strategy)
 
 
 @file_or_name(f="rb")
@@ -515,10 +1926,13 @@ def read_w2v_with_vocab(
     Args:
         f: The file to read from.
         user_vocab: A specific vocabulary the user wants to extract form the pre-trained
-            embeddings.
+            embeddings. This can be a ``dict`` or a :py:class:`~word_vectors.vocab.CompactVocab`,
+            a ``dict`` is updated in place with the extra vocabulary while a new
+            :py:class:`~word_vectors.vocab.CompactVocab` is returned.
         initializer: A function that takes the vector size and generates a new vector.
             this is used to generate a representation for a word in the user vocab that
-            is not in the pre-train embeddings.
+            is not in the pre-train embeddings. An :py:class:`~word_vectors.utils.Initializer`
+            creates all of the missing vectors in one call.
         keep_extra: Should you also include vectors that are in the pre-trained embedding
             but not in the user provided vocab?
 
@@ -528,17 +1942,17 @@ def read_w2v_with_vocab(
         vocab gives the index offset into the vector matrix for some word.
     """
     if keep_extra:
-        return _read_with_vocab_extra(f, read_w2v_lines, user_vocab, initializer)
-    return _read_with_vocab(f, read_w2v_lines, user_vocab, initializer)
+        return _read_with_vocab_extra(f, read_w2v_lines, user_vocab, initializer, _count_w2v(f))
+    return _read_with_vocab(f, _scan_w2v, user_vocab, initializer)
 
 
 @file_or_name(f="rb")
-def read_leader(f: Union[str, BinaryIO]) -> Tuple[Vocab, Vectors]:
+def read_leader(f: Union[str, BinaryIO], io_strategy: str = "mmap-sequential") -> Tuple[Vocab, Vectors]:
     """Read vectors from a leader file.
 
-    This is our fully binary vector format.
+    This is our fully binary vector format. There are two versions of the format.
 
-    The first line is a header for the leader format and it is a 3-tuple.
+    In version 1 the first line is a header for the leader format and it is a 3-tuple.
     The elements of this tuple are: A magic number, the size of the vocabulary,
     and the size of the vectors. These numbers are represented as little-endian
     unsigned long longs that have a size of 8 bytes.
@@ -548,17 +1962,45 @@ def read_leader(f: Union[str, BinaryIO]) -> Tuple[Vocab, Vectors]:
     integer. The word is stored as ``utf-8`` bytes. After the word the vector
     is stored where each element is a little-endian float32 (4 bytes).
 
+    Version 2 is a columnar layout. The header is 8 little-endian unsigned long
+    longs: The magic number (with the format version stored in the upper 32 bits),
+    the size of the vocabulary, the size of the vectors, and the byte offsets of
+    the vector block, the word offset table, the word blob, and an optional hash
+    index followed by the number of slots in the index. The vector block is a single
+    ``[vocab size, vector size]`` matrix of little-endian float32s aligned to
+    :py:attr:`~word_vectors.LEADER_ALIGNMENT` bytes. The word offset table is
+    ``vocab size + 1`` little-endian unsigned long longs where word ``i`` is stored
+    in the word blob (as ``utf-8`` bytes) between offsets ``i`` and ``i + 1``.
+    The index (when present) is an open addressing hash table with a little-endian
+    unsigned long long per slot, followed by the FNV-1a hash of each word. See
+    :py:class:`~word_vectors.index.LeaderIndex` for how it is used to look up
+    words without reading the whole file.
+
+    When reading a version 2 file the vectors are a (copy-on-write) memory mapped
+    view of the vector block, nothing is copied. With the default ``io_strategy`` the
+    kernel starts reading the vectors in the background, with ``"mmap-random"`` they
+    are only read from disk when they are used.
+
     Note:
        In the case of duplicated words in the saved vectors we use the index
        and associated vector from the first occurrence of the word.
 
     Args:
         f: The file to read from
+        io_strategy: How the file is read, see :py:func:`~word_vectors.read.read`.
 
     Returns:
         The vocab and vectors.
     """
-    return _read(f, read_leader_lines)
+    check_io_strategy(io_strategy)
+    if not _mappable(f) or io_strategy not in MAPPED_STRATEGIES:
+        return _read_stream(f, FileType.LEADER, io_strategy)
+    with bookmark(f):
+        version = leader_version(f.read(LONG_SIZE))
+    if version >= 2:
+        return _read_leader_columns(f, io_strategy)
+    batches = partial(_iter_binary_batches, scanner=_scan_leader, batch_size=ITER_BATCH, io_strategy=io_strategy)
+    return _read_blocks(f, batches, _count_leader(f))
 
 
 @file_or_name(f="rb")
@@ -588,10 +2030,13 @@ def read_leader_with_vocab(
     Args:
         f: The file to read from.
         user_vocab: A specific vocabulary the user wants to extract form the pre-trained
-            embeddings.
+            embeddings. This can be a ``dict`` or a :py:class:`~word_vectors.vocab.CompactVocab`,
+            a ``dict`` is updated in place with the extra vocabulary while a new
+            :py:class:`~word_vectors.vocab.CompactVocab` is returned.
         initializer: A function that takes the vector size and generates a new vector.
             this is used to generate a representation for a word in the user vocab that
-            is not in the pre-train embeddings.
+            is not in the pre-train embeddings. An :py:class:`~word_vectors.utils.Initializer`
+            creates all of the missing vectors in one call.
         keep_extra: Should you also include vectors that are in the pre-trained embedding
             but not in the user provided vocab?
 
@@ -601,12 +2046,12 @@ def read_leader_with_vocab(
         vocab gives the index offset into the vector matrix for some word.
     """
     if keep_extra:
-        return _read_with_vocab_extra(f, read_leader_lines, user_vocab, initializer)
-    return _read_with_vocab(f, read_leader_lines, user_vocab, initializer)
+        return _read_with_vocab_extra(f, read_leader_lines, user_vocab, initializer, _count_leader(f))
+    return _read_with_vocab(f, _scan_leader, user_vocab, initializer)
 
 
 @file_or_name(f="rb")
-def sniff(f: Union[str, TextIO], buf_size: int = 1024) -> FileType:
+def sniff(f: Union[str, TextIO], buf_size: int = SNIFF_SIZE) -> FileType:
     """Figure out what kind of vector file it is.
 
     Args:
@@ -616,28 +2061,80 @@ def sniff(f: Union[str, TextIO], buf_size: int = 1024) -> FileType:
     Returns:
         The guessed file type.
     """
-    with bookmark(f):
-        b = f.read(buf_size)
+    codec = compression(f)
+    if codec is not None:
+        with open_compressed(f, codec) as stream:
+            b = stream.read(buf_size)
+        LOGGER.debug("Sniffing %s compressed file", codec)
+        return _sniff_binary(b, is_binary(io.BytesIO(b)), getattr(f, "name", f))
+    b = peek(f, buf_size)
     # Because we support reading from an already open file we can't just start applying
     # the bytes based regexs to the file, if the file was not opened in binary mode use
     # the normal unicode string regexs
-    if "b" not in f.mode:
+    if isinstance(b, str):
         if GLOVE_TEXT.match(b):
             return FileType.GLOVE
         if W2V_TEXT.match(b):
             return FileType.W2V_TEXT
+        raise ValueError(f"Could not determine file format for {getattr(f, 'name', f)}")
+    return _sniff_binary(b, is_binary(io.BytesIO(b)), getattr(f, "name", f))
+
+
+def _sniff_binary(b: bytes, binary: bool, name: str) -> FileType:
+    """Figure out the file type from the bytes at the start of a file."""
+    if binary:
+        if W2V_BIN.match(b):
+            return FileType.W2V
+        if verify_leader(b):
+            LOGGER.debug("Sniffed Leader file version %d", leader_version(b))
+            return FileType.LEADER
     else:
-        if is_binary(f):
-            if W2V_BIN.match(b):
-                return FileType.W2V
-            if verify_leader(b):
-                return FileType.LEADER
-        else:
-            if W2V_BIN.match(b):
-                return FileType.W2V_TEXT
-            if GLOVE_BIN.match(b):
-                return FileType.GLOVE
-    raise ValueError(f"Could not determine file format for {f.name}")
+        if W2V_BIN.match(b):
+            return FileType.W2V_TEXT
+        if GLOVE_BIN.match(b):
+            return FileType.GLOVE
+    raise ValueError(f"Could not determine file format for {name}")
+
+
+class LeaderHeader(NamedTuple):
+    """The header of a version 2 Leader file, the section locations are byte offsets from the start of the file."""
+
+    #: The number of words in the file.
+    vocab: int
+    #: The size of the vectors.
+    dim: int
+    #: Where the ``[vocab, dim]`` float32 vector block starts.
+    vectors: int
+    #: Where the ``vocab + 1`` uint64 word offsets start.
+    word_offsets: int
+    #: Where the ``utf-8`` word blob starts.
+    words: int
+    #: Where the optional hash index starts, ``0`` when there is no index.
+    index: int
+    #: The number of slots in the hash index.
+    index_size: int
+
+
+def leader_version(buf: bytes) -> int:
+    """Get the format version of a Leader file.
+
+    The first element of a Leader header is the magic number, the upper 32
+    bits of this element hold the format version. The original format (version
+    1) has zeros there.
+
+    Args:
+        buf: The beginning of the file we are reading the version from.
+
+    Returns:
+        The version of the Leader format used in the file.
+
+    Raises:
+        ValueError: If the magic number doesn't match.
+    """
+    magic = struct.unpack("<Q", buf[:LONG_SIZE])[0]
+    if magic & 0xFFFFFFFF != LEADER_MAGIC_NUMBER:
+        raise ValueError(f"Magic Number read does not match expected. Expected: `{LEADER_MAGIC_NUMBER}` Got: `{magic}`")
+    return max(magic >> 32, 1)
 
 
 def read_leader_header(buf: bytes) -> Tuple[int, int]:
@@ -648,6 +2145,10 @@ def read_leader_header(buf: bytes) -> Tuple[int, int]:
     and the size of the vectors. These numbers are represented as little-endian
     unsigned long longs that have a size of 8 bytes.
 
+    The version 2 header starts with the same three elements so this works for
+    both versions, see :py:func:`~word_vectors.read.read_leader_v2_header` to
+    read the rest of a version 2 header.
+
     Note:
         The magic number if used to make sure this is can actual
         file and not just trying to extract word vectors from a
@@ -662,24 +2163,44 @@ def read_leader_header(buf: bytes) -> Tuple[int, int]:
     Raises:
         ValueError: If the magic number doesn't match.
     """
-    magic, vocab, dim = struct.unpack("<QQQ", buf[: LONG_SIZE * LEADER_HEADER])
-    if magic != LEADER_MAGIC_NUMBER:
-        raise ValueError(f"Magic Number read does not match expected. Expected: `{LEADER_MAGIC_NUMBER}` Got: `{magic}`")
+    leader_version(buf)
+    _, vocab, dim = struct.unpack("<QQQ", buf[: LONG_SIZE * LEADER_HEADER])
     return vocab, dim
 
 
-def verify_leader(buf: bytes) -> bool:
+def read_leader_v2_header(buf: bytes) -> LeaderHeader:
+    """Read the header from a version 2 leader file.
+
+    Args:
+        buf: The beginning of the file we are reading the header from.
+
+    Returns:
+        The parsed header.
+
+    Raises:
+        ValueError: If the magic number doesn't match or the file is not version 2.
+    """
+    version = leader_version(buf)
+    if version != 2:
+        raise ValueError(f"Expected a version 2 Leader header, got version {version}")
+    _, *header = struct.unpack(f"<{LEADER_V2_HEADER}Q", buf[: LONG_SIZE * LEADER_V2_HEADER])
+    return LeaderHeader(*header)
+
+
+def verify_leader(buf: bytes, version: Optional[int] = None) -> bool:
     """Check if a file is in the leader format by comparing the magic number.
 
     Args:
         buf: The beginning of the file we are trying to determine if the it
         is a Leader formatted file.
+        version: If provided also check that the file uses this version of the format.
 
     Returns:
-        True if the magic number matched, False otherwise.
+        True if the magic number (and version) matched, False otherwise.
     """
     try:
+        file_version = leader_version(buf)
         read_leader_header(buf)
-        return True
-    except ValueError:
+        return version is None or file_version == version
+    except (ValueError, struct.error):
         return False
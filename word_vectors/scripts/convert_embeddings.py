@@ -1,17 +1,236 @@
+import os
+import sys
+import glob
+import time
 import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import List, NamedTuple, Optional, Sequence, Union, IO
 from word_vectors import FileType
 from word_vectors.convert import convert
+from word_vectors.utils import create_output_path
+from word_vectors.write import MAX_PRECISION
+
+
+TEXT_FORMATS = (FileType.GLOVE, FileType.W2V_TEXT)
+MB = 2 ** 20
+
+
+class Result(NamedTuple):
+    """What happened when converting one input file."""
+
+    path: str
+    size: Optional[int]
+    seconds: float
+    status: str
+
+    @property
+    def converted(self) -> bool:
+        return self.status.startswith("converted")
 
 
 def main():
     parser = argparse.ArgumentParser(description="Convert Pre-trained embeddings between different formats")
-    parser.add_argument("embeddings")
-    parser.add_argument("--output-format", "--output_format", default=FileType.LEADER, type=FileType.from_string)
+    parser.add_argument(
+        "embeddings",
+        nargs="+",
+        help="The embeddings to convert, paths or glob patterns (quote them to skip shell expansion). Use `-` to "
+        "read from stdin.",
+    )
+    parser.add_argument(
+        "--output-format",
+        "--output_format",
+        action="append",
+        type=FileType.from_string,
+        help="The format to write, repeat it to write several formats from a single read. Defaults to leader.",
+    )
     parser.add_argument("--input-format", "--input_format", type=FileType.from_string)
-    parser.add_argument("--output", help="The output path.")
+    parser.add_argument(
+        "--output",
+        action="append",
+        help="The output path, use `-` to write to stdout. Reading from stdin writes to stdout by default. "
+        "When there are several output formats repeat it once for each format. Only allowed with a single input, "
+        "otherwise the outputs are named after the inputs.",
+    )
+    parser.add_argument(
+        "--precision",
+        type=int,
+        help="The number of significant digits of each float when writing text formats, the default writes the "
+        "shortest text that reads back as the same float.",
+    )
+    parser.add_argument(
+        "--jobs", "-j", type=int, default=1, help="The number of files to convert at once, each in its own process."
+    )
+    parser.add_argument(
+        "--force", action="store_true", help="Convert files even when their outputs are newer than the input."
+    )
     args = parser.parse_args()
 
-    convert(args.embeddings, output=args.output, output_file_type=args.output_format, input_file_type=args.input_format)
+    if args.jobs < 1:
+        parser.error(f"--jobs must be at least 1, got: {args.jobs}")
+    if args.precision is not None and not 1 <= args.precision <= MAX_PRECISION:
+        parser.error(f"--precision must be between 1 and {MAX_PRECISION}, got: {args.precision}")
+    output_formats = args.output_format or [FileType.LEADER]
+    paths = _expand(args.embeddings, parser)
+
+    if paths == ["-"]:
+        outputs = args.output or [None] * len(output_formats)
+        if len(outputs) != len(output_formats):
+            parser.error(f"Got {len(outputs)} outputs for {len(output_formats)} output formats.")
+        outputs = [
+            _stdout(output_format) if output in ("-", None) else output
+            for output, output_format in zip(outputs, output_formats)
+        ]
+        if sum(output is sys.stdout or output is sys.stdout.buffer for output in outputs) > 1:
+            parser.error("Only one output can be written to stdout.")
+        convert(
+            sys.stdin.buffer,
+            output=outputs,
+            output_file_type=output_formats,
+            input_file_type=args.input_format,
+            precision=args.precision,
+        )
+        for output in outputs:
+            if output is sys.stdout or output is sys.stdout.buffer:
+                output.flush()
+        return
+    if "-" in paths:
+        parser.error("`-` (stdin) can't be combined with other inputs.")
+
+    if args.output is None:
+        outputs = [[create_output_path(path, output_format) for output_format in output_formats] for path in paths]
+    else:
+        if len(paths) > 1:
+            parser.error("--output can only be used with a single input.")
+        if len(args.output) != len(output_formats):
+            parser.error(f"Got {len(args.output)} outputs for {len(output_formats)} output formats.")
+        outputs = [
+            [
+                _stdout(output_format) if output == "-" else output
+                for output, output_format in zip(args.output, output_formats)
+            ]
+        ]
+        if sum(output is sys.stdout or output is sys.stdout.buffer for output in outputs[0]) > 1:
+            parser.error("Only one output can be written to stdout.")
+
+    jobs = [
+        (path, outs, output_formats, args.input_format, args.precision, args.force)
+        for path, outs in zip(paths, outputs)
+    ]
+    results = []
+    if args.jobs == 1 or len(jobs) == 1:
+        for job in jobs:
+            results.append(_report(_run(*job), len(results) + 1, len(jobs)))
+    else:
+        with ProcessPoolExecutor(max_workers=min(args.jobs, len(jobs))) as pool:
+            futures = [pool.submit(_run, *job) for job in jobs]
+            for future in as_completed(futures):
+                results.append(_report(future.result(), len(results) + 1, len(jobs)))
+    for output in outputs[0]:
+        if output is sys.stdout or output is sys.stdout.buffer:
+            output.flush()
+    order = {path: i for i, path in enumerate(paths)}
+    _summary(sorted(results, key=lambda result: order[result.path]))
+    if any(result.status.startswith("failed") for result in results):
+        sys.exit(1)
+
+
+def _expand(patterns: Sequence[str], parser: argparse.ArgumentParser) -> List[str]:
+    """Expand glob patterns into the (unique) files they match, in order."""
+    paths = {}
+    for pattern in patterns:
+        matches = sorted(glob.glob(pattern)) if glob.has_magic(pattern) else [pattern]
+        if not matches:
+            parser.error(f"No files match {pattern}")
+        paths.update(dict.fromkeys(matches))
+    return list(paths)
+
+
+def _stale(path: str, outputs: Sequence[Union[str, IO]]) -> List[int]:
+    """Find the outputs that need to be (re)written, those that are missing or older than the input."""
+    mtime = os.path.getmtime(path)
+    return [
+        i
+        for i, output in enumerate(outputs)
+        if not isinstance(output, str) or not os.path.exists(output) or os.path.getmtime(output) < mtime
+    ]
+
+
+def _run(
+    path: str,
+    outputs: Sequence[Union[str, IO]],
+    output_formats: Sequence[FileType],
+    input_format: Optional[FileType],
+    precision: Optional[int] = None,
+    force: bool = False,
+) -> Result:
+    """Convert a file to every output that isn't up to date, this is run in the worker processes."""
+    start = time.perf_counter()
+    if any(isinstance(output, str) and os.path.abspath(output) == os.path.abspath(path) for output in outputs):
+        # A glob can match the outputs of an earlier run, writing to them would truncate the input.
+        return Result(path, None, 0.0, "failed: the output is the same file as the input")
+    stale = []
+    try:
+        size = os.path.getsize(path)
+        stale = list(range(len(outputs))) if force else _stale(path, outputs)
+        if not stale:
+            return Result(path, size, 0.0, "up to date")
+        convert(
+            path,
+            output=[outputs[i] for i in stale],
+            output_file_type=[output_formats[i] for i in stale],
+            input_file_type=input_format,
+            precision=precision,
+        )
+    except Exception as e:
+        # Remove partial outputs, otherwise they would look up to date next time.
+        for i in stale:
+            if isinstance(outputs[i], str) and os.path.exists(outputs[i]):
+                os.remove(outputs[i])
+        return Result(path, None, time.perf_counter() - start, f"failed: {e}")
+    written = ", ".join(str(output_formats[i]) for i in stale)
+    return Result(path, size, time.perf_counter() - start, f"converted to {written}")
+
+
+def _report(result: Result, done: int, total: int) -> Result:
+    """Print the progress after a file is done."""
+    print(f"[{done}/{total}] {result.path}: {result.status}{_timing(result)}", file=sys.stderr, flush=True)
+    return result
+
+
+def _timing(result: Result) -> str:
+    if not result.converted:
+        return ""
+    return f" ({result.size / MB:.1f} MB in {result.seconds:.2f}s, {_throughput(result)} MB/s)"
+
+
+def _throughput(result: Result) -> str:
+    if not result.converted or result.seconds <= 0:
+        return "-"
+    return f"{result.size / MB / result.seconds:.1f}"
+
+
+def _summary(results: Sequence[Result]):
+    """Print a table of the size, time, and throughput of each file."""
+    rows = [("file", "size (MB)", "time (s)", "MB/s", "status")]
+    for result in results:
+        rows.append(
+            (
+                result.path,
+                "-" if result.size is None else f"{result.size / MB:.1f}",
+                f"{result.seconds:.2f}" if result.converted else "-",
+                _throughput(result),
+                result.status,
+            )
+        )
+    widths = [max(len(row[i]) for row in rows) for i in range(4)]
+    for row in rows:
+        cells = [row[0].ljust(widths[0])] + [cell.rjust(width) for cell, width in zip(row[1:4], widths[1:])]
+        print("  ".join(cells + [row[4]]), file=sys.stderr)
+
+
+def _stdout(output_format: FileType):
+    """The text writers write strings while the binary ones write bytes."""
+    return sys.stdout if output_format in TEXT_FORMATS else sys.stdout.buffer
 
 
 if __name__ == "__main__":
@@ -0,0 +1,200 @@
+"""Share one copy of a set of word vectors between processes.
+
+Each process in a pool of workers (data loaders for example) normally reads its own
+copy of the vectors. Even when the workers are forked from a process that already
+read them the copy-on-write pages are slowly copied as reference counts on the vocab
+dict (one python ``str`` and ``int`` per word) are updated.
+
+:py:func:`~word_vectors.shared.share` copies the vectors into a block of shared memory
+once. Other processes :py:func:`~word_vectors.shared.attach` to the block by name, this
+maps the existing memory so it takes constant time and no memory. The block holds a
+version 2 Leader file (see :py:func:`~word_vectors.read.read_leader`) so the vocab is
+looked up through its hash index instead of being rebuilt as a dict. ::
+
+    shared = word_vectors.share(vocab, vectors)
+    del vocab, vectors
+    with ProcessPoolExecutor(16) as pool:
+        # Pickling only sends the name of the block, the workers attach to it.
+        pool.map(work, repeat(shared), batches)
+
+Note:
+    Shared memory needs python 3.8 or newer.
+"""
+
+import os
+import struct
+import logging
+from collections.abc import Mapping
+from typing import Dict, Optional, Tuple
+import numpy as np
+from word_vectors import Vocab, Vectors, LONG_SIZE, LEADER_V2_HEADER
+from word_vectors.read import read_leader_v2_header
+from word_vectors.utils import to_vocab
+from word_vectors.vocab import CompactVocab
+from word_vectors.write import WRITE_BATCH, _leader_v2_layout
+
+try:
+    from multiprocessing import shared_memory, resource_tracker
+except ImportError:  # pragma: no cover
+    shared_memory = None
+
+
+LOGGER = logging.getLogger("word_vectors")
+
+# The blocks that are open in this process, keyed by name and if this process owns it.
+_OPEN: Dict[Tuple[str, bool], "SharedVectors"] = {}
+
+
+class SharedVectors:
+    """Word vectors in a block of shared memory.
+
+    Use :py:func:`~word_vectors.shared.share` to create the block and
+    :py:func:`~word_vectors.shared.attach` to use it from another process. Pickling
+    a :py:class:`~word_vectors.shared.SharedVectors` only sends the name of the block,
+    unpickling attaches to it.
+
+    The process that created the block owns it, the block is removed when the owner
+    calls :py:meth:`~word_vectors.shared.SharedVectors.unlink` (or exits the context
+    manager). Other processes only close their mapping.
+
+    Attributes:
+        vocab: A read-only :py:class:`~word_vectors.vocab.CompactVocab` of word to row.
+        vectors: A read-only ``[vocab size, vector size]`` view of the vectors.
+    """
+
+    def __init__(self, shm: "shared_memory.SharedMemory", owner: bool = False):
+        self._shm = shm
+        self.owner = owner
+        buf = shm.buf
+        header = read_leader_v2_header(bytes(buf[: LONG_SIZE * LEADER_V2_HEADER]))
+        # ``np.frombuffer`` keeps the buffer exported so the memory can't be unmapped while there are views of it.
+        self.vectors = np.frombuffer(buf, dtype="<f4", count=header.vocab * header.dim, offset=header.vectors)
+        self.vectors = self.vectors.reshape(header.vocab, header.dim)
+        self.vectors.flags.writeable = False
+        offsets = np.frombuffer(buf, dtype="<u8", count=header.vocab + 1, offset=header.word_offsets)
+        self.vocab = CompactVocab(
+            np.frombuffer(buf, dtype=np.uint8, count=int(offsets[-1]), offset=header.words),
+            offsets,
+            np.frombuffer(buf, dtype="<u8", count=header.index_size, offset=header.index),
+            np.frombuffer(buf, dtype="<u8", count=header.vocab, offset=header.index + LONG_SIZE * header.index_size),
+        )
+        # Keep the block open until it is explicitly closed. Otherwise it is closed when this object is garbage
+        # collected, even if there are still views of the vectors.
+        _OPEN[self.name, owner] = self
+
+    @property
+    def name(self) -> str:
+        """The name used to attach to the shared memory."""
+        return self._shm.name
+
+    @property
+    def dim(self) -> int:
+        """The size of the vectors."""
+        return self.vectors.shape[1]
+
+    def __reduce__(self) -> Tuple:
+        return attach, (self.name,)
+
+    def close(self):
+        """Unmap the shared memory from this process.
+
+        Raises:
+            BufferError: If there are still views of the vectors, delete them before closing.
+        """
+        self.vocab = self.vectors = None
+        self._shm.close()
+        if _OPEN.get((self.name, self.owner)) is self:
+            del _OPEN[self.name, self.owner]
+
+    def unlink(self):
+        """Remove the shared memory, processes that are attached keep their mapping."""
+        self._shm.unlink()
+
+    def __enter__(self) -> "SharedVectors":
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+        if self.owner:
+            self.unlink()
+
+
+def share(vocab: Vocab, vectors: Vectors, name: Optional[str] = None) -> SharedVectors:
+    """Copy word vectors into shared memory.
+
+    Args:
+        vocab: The vocab of words -> ints.
+        vectors: The vectors.
+        name: The name of the shared memory block, a random name is used when ``None``.
+
+    Returns:
+        The shared vectors, this process owns the block.
+
+    Raises:
+        ValueError: If shared memory is not available (python before 3.8).
+    """
+    _check_shared_memory()
+    vocab = to_vocab(vocab) if not isinstance(vocab, Mapping) else vocab
+    layout = _leader_v2_layout(vocab, vectors.shape[1])
+    header = read_leader_v2_header(struct.pack(f"<{LEADER_V2_HEADER}Q", *layout.header))
+    shm = shared_memory.SharedMemory(name=name, create=True, size=layout.size)
+    try:
+        buf = shm.buf
+        buf[: LONG_SIZE * LEADER_V2_HEADER] = struct.pack(f"<{LEADER_V2_HEADER}Q", *layout.header)
+        # Copy the vectors over in batches so we never hold a second full copy.
+        out = np.frombuffer(buf, dtype="<f4", count=header.vocab * header.dim, offset=header.vectors)
+        out = out.reshape(header.vocab, header.dim)
+        for start in range(0, header.vocab, WRITE_BATCH):
+            out[start : start + WRITE_BATCH] = vectors[layout.rows[start : start + WRITE_BATCH]]
+        del out
+        buf[header.word_offsets : header.words] = layout.word_offsets.tobytes()
+        buf[header.words : header.words + len(layout.words)] = layout.words
+        table_end = header.index + layout.table.nbytes
+        buf[header.index : table_end] = layout.table.tobytes()
+        buf[table_end : table_end + layout.hashes.nbytes] = layout.hashes.tobytes()
+        del buf
+    except BaseException:
+        shm.close()
+        shm.unlink()
+        raise
+    LOGGER.info("Shared %d vectors (%d bytes) as %s", header.vocab, layout.size, shm.name)
+    return SharedVectors(shm, owner=True)
+
+
+def attach(name: str) -> SharedVectors:
+    """Attach to word vectors that another process put in shared memory.
+
+    A process only attaches to a block once, attaching again (or unpickling the
+    :py:class:`~word_vectors.shared.SharedVectors` for every task sent to a worker)
+    returns the same object until it is closed.
+
+    Args:
+        name: The name of the block, :py:attr:`SharedVectors.name`.
+
+    Returns:
+        The shared vectors.
+
+    Raises:
+        ValueError: If shared memory is not available (python before 3.8).
+    """
+    _check_shared_memory()
+    if (name, False) in _OPEN:
+        return _OPEN[name, False]
+    try:
+        shm = shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        # Before python 3.13 attaching registers the block with the resource tracker of this
+        # process, which deletes the block when the process exits. Processes started by
+        # multiprocessing share the tracker of their parent (which already knows about the
+        # block) but any other process would delete the block out from under everyone else.
+        tracker = getattr(resource_tracker, "_resource_tracker", None)
+        own_tracker = os.name == "posix" and tracker is not None and getattr(tracker, "_fd", None) is None
+        shm = shared_memory.SharedMemory(name=name)
+        if own_tracker:
+            resource_tracker.unregister(shm._name, "shared_memory")
+    return SharedVectors(shm)
+
+
+def _check_shared_memory():
+    if shared_memory is None:
+        raise ValueError("Sharing vectors between processes needs `multiprocessing.shared_memory` (python 3.8+).")
@@ -0,0 +1,207 @@
+"""Lazily read word vectors from a file.
+
+:py:func:`~word_vectors.store.open` does a single scan over a file that only records
+where each word's vector starts. The vectors themselves are parsed the first time
+they are looked up. For text formats this skips the expensive float parsing for all
+the words you never use.
+"""
+
+import mmap
+import logging
+import pathlib
+import builtins
+from collections import OrderedDict
+from collections.abc import Mapping
+from typing import Union, IO, Iterable, Iterator, Optional, Tuple, Dict, List
+import numpy as np
+from word_vectors import FileType, LONG_SIZE, LEADER_HEADER
+from word_vectors.read import (
+    sniff,
+    read_glove_offsets,
+    read_w2v_text_offsets,
+    read_w2v_offsets,
+    read_leader_offsets,
+    read_leader_header,
+    parse_text_vector,
+    parse_text_vectors,
+    parse_binary_vector,
+)
+from word_vectors.index import TextIndex, load_index
+from word_vectors.utils import compression, advise
+
+
+LOGGER = logging.getLogger("word_vectors")
+
+#: The default number of decoded vectors that a :py:class:`~word_vectors.store.VectorStore` keeps.
+CACHE_SIZE = 2 ** 14
+
+
+class VectorStore(Mapping):
+    """A read-only mapping of word to vector that parses vectors on demand.
+
+    Creating the store scans the file once to build a table of word -> byte offset
+    (see the ``read_*_offsets`` functions in :py:mod:`word_vectors.read`), no vectors
+    are parsed. When a text file has a sidecar index (see
+    :py:func:`~word_vectors.index.build_index`) it is used instead and the scan is
+    skipped entirely. Looking up a word parses its vector from the memory mapped file and
+    keeps it in a least recently used cache of ``cache_size`` vectors.
+
+    Note:
+       In the case of duplicated words in the saved vectors we use the vector from
+       the first occurrence of the word.
+
+    Args:
+        f: The file to read from.
+        file_type: The vector file format. If ``None`` the file is sniffed to determine
+            format.
+        cache_size: The number of parsed vectors to keep around.
+    """
+
+    def __init__(
+        self, f: Union[str, pathlib.PurePath, IO], file_type: Optional[FileType] = None, cache_size: int = CACHE_SIZE
+    ):
+        if compression(f) is not None:
+            raise ValueError("Lazy lookups need random access to the file, decompress it first.")
+        if file_type is None:
+            file_type = sniff(f)
+            LOGGER.info("Sniffed word vector as type %s", file_type)
+        if file_type is FileType.GLOVE:
+            offsets_reader = read_glove_offsets
+        elif file_type is FileType.W2V_TEXT or file_type is FileType.FASTTEXT or file_type is FileType.NUMBERBATCH:
+            offsets_reader = read_w2v_text_offsets
+        elif file_type is FileType.W2V:
+            offsets_reader = read_w2v_offsets
+        elif file_type is FileType.LEADER:
+            offsets_reader = read_leader_offsets
+        else:
+            raise ValueError(f"Unknown vector format, got: {file_type}")
+        self.file_type = file_type
+        self.cache_size = cache_size
+        self._binary = file_type is FileType.W2V or file_type is FileType.LEADER
+        if isinstance(f, (str, pathlib.PurePath)):
+            with builtins.open(f, "rb") as rf:
+                self._mmap = mmap.mmap(rf.fileno(), 0, access=mmap.ACCESS_READ)
+        else:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        # Vectors are parsed one lookup at a time so don't read ahead of them.
+        advise(self._mmap, "mmap-random")
+        self._offsets: Union[Dict[str, int], TextIndex] = load_index(f) if not self._binary else None
+        if self._offsets is None:
+            self._offsets = {}
+            for word, offset in offsets_reader(f):
+                if word not in self._offsets:
+                    self._offsets[word] = offset
+        self._cache: OrderedDict = OrderedDict()
+        self.dim = self._read_dim()
+
+    def _read_dim(self) -> int:
+        if self.file_type is FileType.LEADER:
+            return read_leader_header(self._mmap[: LONG_SIZE * LEADER_HEADER])[1]
+        if self.file_type is FileType.W2V:
+            return int(self._mmap[: self._mmap.find(b"\n")].split()[1])
+        if isinstance(self._offsets, TextIndex):
+            return self._offsets.dim
+        if not self._offsets:
+            return 0
+        return len(parse_text_vector(self._mmap, next(iter(self._offsets.values()))))
+
+    def _parse(self, offset: int) -> np.ndarray:
+        if self._binary:
+            return parse_binary_vector(self._mmap, offset, self.dim)
+        return parse_text_vector(self._mmap, offset)
+
+    def _parse_many(self, offsets: List[int]) -> np.ndarray:
+        if not offsets:
+            return np.zeros((0, self.dim), dtype=np.float32)
+        if self._binary:
+            return np.stack([self._parse(offset) for offset in offsets])
+        return parse_text_vectors(self._mmap, offsets)
+
+    def _remember(self, word: str, vector: np.ndarray) -> np.ndarray:
+        # The vectors are shared between lookups so don't let anyone modify them.
+        vector.flags.writeable = False
+        self._cache[word] = vector
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return vector
+
+    def __getitem__(self, word: str) -> np.ndarray:
+        if word in self._cache:
+            self._cache.move_to_end(word)
+            return self._cache[word]
+        return self._remember(word, self._parse(self._offsets[word]))
+
+    def __contains__(self, word: str) -> bool:
+        return word in self._offsets
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._offsets)
+
+    def lookup(self, words: Iterable[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """Get the vectors for many words at once.
+
+        Words that are not cached are parsed together in a single batch.
+
+        Args:
+            words: The words to look up.
+
+        Returns:
+            A ``[len(words), vector size]`` matrix with a row for each word (rows for words
+            that are not in the file are zeros) and a boolean mask that is True for words
+            that were found.
+        """
+        words = list(words)
+        vectors = np.zeros((len(words), self.dim), dtype=np.float32)
+        found = np.array([word in self._offsets for word in words], dtype=np.bool_)
+        missing = list(dict.fromkeys(w for w, f in zip(words, found) if f and w not in self._cache))
+        parsed = dict(zip(missing, self._parse_many([self._offsets[word] for word in missing])))
+        for i, word in enumerate(words):
+            if not found[i]:
+                continue
+            if word in parsed:
+                vectors[i] = parsed[word]
+            else:
+                vectors[i] = self[word]
+        for word, vector in parsed.items():
+            # Copy so the cache doesn't keep the whole batch alive.
+            self._remember(word, vector.copy())
+        return vectors, found
+
+    def close(self):
+        """Release the memory mapped file."""
+        self._cache.clear()
+        if isinstance(self._offsets, TextIndex):
+            self._offsets.close()
+        self._mmap.close()
+
+    def __enter__(self) -> "VectorStore":
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+def open(
+    f: Union[str, pathlib.PurePath, IO], file_type: Optional[FileType] = None, cache_size: int = CACHE_SIZE
+) -> VectorStore:
+    """Open a file of word vectors for lazy lookups.
+
+    This is the lazy counterpart to :py:func:`~word_vectors.read.read`. ::
+
+        with word_vectors.open("glove.840B.300d.txt") as store:
+            store["dog"]
+            vectors, found = store.lookup(["the", "quick", "brown", "fox"])
+
+    Args:
+        f: The file to read from.
+        file_type: The vector file format. If ``None`` the file is sniffed to determine
+            format.
+        cache_size: The number of parsed vectors to keep around.
+
+    Returns:
+        A :py:class:`~word_vectors.store.VectorStore` for the file.
+    """
+    return VectorStore(f, file_type, cache_size)
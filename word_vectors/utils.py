@@ -1,9 +1,16 @@
 """Utilities for working with word vector I/O."""
 
 import os
+import bz2
+import mmap
+import gzip
+import lzma
+import queue
 import pathlib
+import zipfile
+import threading
 from contextlib import contextmanager
-from typing import Tuple, Iterable, Union, BinaryIO, IO, Callable
+from typing import Tuple, Iterable, Iterator, Union, BinaryIO, IO, Callable, Sequence, Optional
 import numpy as np
 from file_or_name import file_or_name
 from word_vectors import Vocab, FileType
@@ -12,6 +19,25 @@ from word_vectors import Vocab, FileType
 # The characters we define as "non-binary" when guessing if a file is binary.
 ASCII_CHARACTERS = b"".join(map(lambda x: bytes((x,)), range(32, 127))) + b"\n\r\t\f\b"
 
+FNV_OFFSET = 0xCBF29CE484222325  #: The starting value of the 64 bit FNV-1a hash.
+FNV_PRIME = 0x100000001B3  #: The multiplier used in the 64 bit FNV-1a hash.
+UINT64_MASK = 0xFFFFFFFFFFFFFFFF
+SPLITMIX_GAMMA = 0x9E3779B97F4A7C15  #: The increment of the SplitMix64 generator used by hashed initializers.
+
+#: The leading (magic) bytes of the compression formats we can read through.
+COMPRESSION_MAGIC = {
+    b"\x1f\x8b": "gzip",
+    b"BZh": "bz2",
+    b"\xfd7zXZ\x00": "xz",
+    b"PK\x03\x04": "zip",
+}
+#: The file extensions used by the compression formats we can read through.
+COMPRESSION_EXTENSIONS = (".gz", ".bz2", ".xz", ".zip")
+#: The ways the readers can get the bytes of a file, see :py:func:`~word_vectors.read.read`.
+IO_STRATEGIES = ("mmap-sequential", "mmap-random", "buffered", "pread")
+#: The ``madvise`` flag used for each of the memory mapped strategies.
+MADVISE_FLAGS = {"mmap-sequential": "MADV_SEQUENTIAL", "mmap-random": "MADV_RANDOM"}
+
 
 def find_space(buf: bytes, offset: int) -> Tuple[str, int]:
     """Find the first space starting from offset and return word that spans the spaces and the new offset.
@@ -98,6 +124,31 @@ def bookmark(f: IO):
     f.seek(start)
 
 
+def peek(f: IO, size: int) -> Union[bytes, str]:
+    """Look at the start of a file without moving through it.
+
+    Seekable files are read and then rewound (see :py:func:`~word_vectors.utils.bookmark`),
+    streams like pipes and sockets can't be rewound so we use their ``peek`` method.
+
+    Args:
+        f: The file to look at.
+        size: The number of bytes to look at. Peeking a stream can return fewer bytes
+            than this if fewer are buffered.
+
+    Returns:
+        The start of the file.
+
+    Raises:
+        ValueError: If the file can't be rewound and doesn't support peeking.
+    """
+    if f.seekable():
+        with bookmark(f):
+            return f.read(size)
+    if hasattr(f, "peek"):
+        return f.peek(size)[:size]
+    raise ValueError(f"Can't look at the start of {getattr(f, 'name', f)} without consuming it.")
+
+
 def to_vocab(words: Iterable[str]) -> Vocab:
     """Convert a series of words to a vocab mapping strings to ints.
 
@@ -124,21 +175,546 @@ def create_output_path(path: Union[str, IO, pathlib.PurePath], file_type: FileTy
         path = str(path)
     else:
         path = path.name
-    base, _ = os.path.splitext(path)
+    base, ext = os.path.splitext(path)
+    # Drop the extension of the format under the compression too, ``vectors.vec.gz`` becomes ``vectors.{file_type}``.
+    if ext in COMPRESSION_EXTENSIONS:
+        base, _ = os.path.splitext(base)
     return f"{base}.{file_type}"
 
 
-def uniform_initializer(unif: float) -> Callable[[int], np.ndarray]:
-    """Create a vector initialization function that takes a vector size as input.
+class Initializer:
+    """Create the vectors for words in a user vocab that are not in the pre-trained embeddings.
+
+    The simplest initializer is a function that takes the vector size and returns one
+    vector, it is called once for each missing word. Subclasses of this create all the
+    missing vectors in a single (vectorized) call to
+    :py:meth:`~word_vectors.utils.Initializer.batch` instead.
+    """
+
+    #: Does :py:meth:`~word_vectors.utils.Initializer.batch` need the missing words.
+    uses_words = False
+
+    def batch(self, n: int, vector_size: int, words: Optional[Sequence[str]] = None) -> np.ndarray:
+        """Create the vectors for ``n`` missing words.
+
+        Args:
+            n: The number of vectors to create.
+            vector_size: The size of each vector.
+            words: The missing words, only passed when ``uses_words`` is set.
+
+        Returns:
+            The ``[n, vector size]`` vectors.
+        """
+        raise NotImplementedError
+
+    def __call__(self, vector_size: int) -> np.ndarray:
+        return self.batch(1, vector_size)[0]
+
+
+class UniformInitializer(Initializer):
+    """Initialize vectors uniformly at random between ``-unif`` and ``unif``.
+
+    Without a seed the vectors are drawn from the global ``np.random`` state, the same
+    vectors as calling ``np.random.uniform`` for each word. With a seed the initializer
+    has its own generator, so two initializers with the same seed create the same sequence
+    of vectors (in any process) while each call still creates new vectors.
+
+    When ``hashed`` is set each vector is derived from the (FNV-1a) hash of its word,
+    mixed with the seed, instead of a generator. A word gets the same vector no matter
+    what else is missing so workers that each read part of a vocab agree on the vectors
+    without sending them to each other.
+
+    Args:
+        unif: The bounds that the new vectors will be initialized within.
+        seed: The seed of the initializer's generator.
+        hashed: Derive each word's vector from the hash of the word.
+    """
+
+    def __init__(self, unif: float = 0.25, seed: Optional[int] = None, hashed: bool = False):
+        self.unif = unif
+        self.seed = seed
+        self.hashed = hashed
+        self._rng = None if seed is None or hashed else np.random.default_rng(seed)
+
+    @property
+    def uses_words(self) -> bool:
+        return self.hashed
+
+    def batch(self, n: int, vector_size: int, words: Optional[Sequence[str]] = None) -> np.ndarray:
+        if self.hashed:
+            if words is None or len(words) != n:
+                raise ValueError("A hashed initializer needs the missing words.")
+            return hashed_uniform(hash_words(words), vector_size, self.unif, self.seed or 0)
+        if self.seed is None:
+            return np.random.uniform(-self.unif, self.unif, size=(n, vector_size))
+        return self._rng.uniform(-self.unif, self.unif, size=(n, vector_size))
+
+
+def uniform_initializer(unif: float, seed: Optional[int] = None, hashed: bool = False) -> UniformInitializer:
+    """Create a vector initializer that draws vectors uniformly at random.
 
     Args:
         unif: The bounds that the new vector will be initialized within
+        seed: A seed that makes the vectors reproducible, see :py:class:`~word_vectors.utils.UniformInitializer`.
+        hashed: Derive each word's vector from the hash of the word.
+
+    Returns:
+        An initializer that creates uniformly random vectors between ``-unif`` and ``unif``,
+        it can also be called with a vector size to create a single vector.
+    """
+    return UniformInitializer(unif, seed, hashed)
+
+
+def hashed_uniform(hashes: np.ndarray, vector_size: int, unif: float, seed: int = 0) -> np.ndarray:
+    """Create a uniformly random vector for each hash.
+
+    Each element is a `SplitMix64`_ mix of the hash, seed, and the element's position
+    so this is vectorized and gives the same vectors on every machine.
+
+    .. _SplitMix64: https://prng.di.unimi.it/splitmix64.c
+
+    Args:
+        hashes: The ``uint64`` hash of each word.
+        vector_size: The size of each vector.
+        unif: The bounds of the vectors.
+        seed: Mixed into the hashes so different seeds give different vectors.
+
+    Returns:
+        The ``[len(hashes), vector size]`` ``float64`` vectors between ``-unif`` and ``unif``.
+    """
+    hashes = np.asarray(hashes, dtype=np.uint64) ^ np.uint64(_splitmix64(seed & UINT64_MASK))
+    steps = np.arange(1, vector_size + 1, dtype=np.uint64) * np.uint64(SPLITMIX_GAMMA)
+    vectors = np.empty((len(hashes), vector_size), dtype=np.float64)
+    # Work on a few rows at a time so the temporary arrays stay small.
+    rows = max(1, 2 ** 20 // max(vector_size, 1))
+    with np.errstate(over="ignore"):
+        for start in range(0, len(hashes), rows):
+            x = hashes[start : start + rows, None] + steps
+            x ^= x >> np.uint64(30)
+            x *= np.uint64(0xBF58476D1CE4E5B9)
+            x ^= x >> np.uint64(27)
+            x *= np.uint64(0x94D049BB133111EB)
+            x ^= x >> np.uint64(31)
+            # The top 53 bits fill the mantissa of a float in [0, 1).
+            out = vectors[start : start + rows]
+            np.multiply(x >> np.uint64(11), 2 * unif * 2.0 ** -53, out=out)
+            out -= unif
+    return vectors
+
+
+def _splitmix64(x: int) -> int:
+    x = (x + SPLITMIX_GAMMA) & UINT64_MASK
+    x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & UINT64_MASK
+    x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & UINT64_MASK
+    return x ^ (x >> 31)
+
+
+def fnv1a(data: bytes) -> int:
+    """Hash bytes with the 64 bit `FNV-1a`_ hash.
+
+    We use this instead of python's ``hash`` because it is stable across processes and
+    machines which lets us store the hashes in files.
+
+    .. _FNV-1a: http://www.isthe.com/chongo/tech/comp/fnv/
+
+    Args:
+        data: The bytes to hash, words are hashed as their ``utf-8`` bytes.
+
+    Returns:
+        The hash as an unsigned 64 bit integer.
+    """
+    h = FNV_OFFSET
+    for byte in data:
+        h = ((h ^ byte) * FNV_PRIME) & UINT64_MASK
+    return h
+
+
+def fnv1a_batch(blob: np.ndarray, offsets: np.ndarray) -> np.ndarray:
+    """Hash many byte strings stored in a single blob with the 64 bit FNV-1a hash.
+
+    This is a vectorized version of :py:func:`~word_vectors.utils.fnv1a` where the strings
+    are stored back to back in ``blob`` and string ``i`` is ``blob[offsets[i]:offsets[i + 1]]``.
+    The strings are processed one byte position at a time so the number of numpy operations
+    is proportional to the length of the longest string rather than the number of strings.
+
+    Args:
+        blob: The ``utf-8`` bytes of all the strings as a ``uint8`` array.
+        offsets: The ``len(strings) + 1`` offsets into the blob.
+
+    Returns:
+        The ``uint64`` hashes of each string.
+    """
+    offsets = np.asarray(offsets, dtype=np.int64)
+    lengths = np.diff(offsets)
+    # Sort by length (longest first) so the strings that still have bytes left at each
+    # position are always a prefix of the sorted order.
+    order = np.argsort(-lengths, kind="stable")
+    starts = offsets[:-1][order]
+    lengths = lengths[order]
+    hashes = np.full(len(lengths), FNV_OFFSET, dtype=np.uint64)
+    prime = np.uint64(FNV_PRIME)
+    # How many strings are longer than each position.
+    active = np.searchsorted(-lengths, -np.arange(lengths.max() if len(lengths) else 0), side="left")
+    for i, n in enumerate(active):
+        hashes[:n] ^= blob[starts[:n] + i]
+        hashes[:n] *= prime
+    result = np.empty_like(hashes)
+    result[order] = hashes
+    return result
+
+
+def hash_words(words: Iterable[str]) -> np.ndarray:
+    """Hash words with the 64 bit FNV-1a hash of their ``utf-8`` bytes.
+
+    Args:
+        words: The words to hash.
+
+    Returns:
+        The ``uint64`` hashes of the words.
+    """
+    words = [word.encode("utf-8") for word in words]
+    offsets = np.zeros(len(words) + 1, dtype=np.int64)
+    np.cumsum([len(word) for word in words], out=offsets[1:])
+    return fnv1a_batch(np.frombuffer(b"".join(words), dtype=np.uint8), offsets)
+
+
+def hash_table_size(n: int, load: float = 0.5) -> int:
+    """The number of slots (a power of two) used in a hash table for ``n`` items.
+
+    Args:
+        n: The number of items in the table.
+        load: The maximum fraction of the slots that are filled.
+
+    Returns:
+        The number of slots.
+    """
+    return 1 << max(int(np.ceil(n / load)) - 1, 0).bit_length()
+
+
+def build_hash_table(hashes: np.ndarray, size: int = None) -> np.ndarray:
+    """Build an open addressing (linear probing) hash table.
+
+    The table maps a hash to the index of the item that produced it. Each slot holds
+    ``index + 1`` with ``0`` marking an empty slot. An item with hash ``h`` lives at the
+    first slot at or after ``h & (size - 1)`` (wrapping around) where it was inserted.
+    Lookups probe from the home slot until they find the item or an empty slot, see
+    :py:func:`~word_vectors.utils.probe_hash_table`.
+
+    The table is built with numpy in rounds instead of inserting one item at a time. In
+    each round every item that hasn't been placed tries its current slot, the lowest index
+    wins each free slot and everyone else moves to the next slot. Items with the same hash
+    (duplicated words) always have the same probe sequence so the lowest index will be found
+    first, matching our "first occurrence wins" rule for duplicates.
+
+    Args:
+        hashes: The ``uint64`` hash of each item.
+        size: The number of slots in the table, must be a power of two. Defaults to
+            :py:func:`~word_vectors.utils.hash_table_size`.
+
+    Returns:
+        The ``uint64`` table.
+    """
+    hashes = np.asarray(hashes, dtype=np.uint64)
+    size = hash_table_size(len(hashes)) if size is None else size
+    if size & (size - 1) or size < len(hashes):
+        raise ValueError(f"The hash table size must be a power of two larger than the number of items, got: {size}")
+    mask = np.uint64(size - 1)
+    table = np.zeros(size, dtype=np.uint64)
+    pending = np.arange(len(hashes), dtype=np.int64)
+    slots = (hashes & mask).astype(np.int64)
+    while len(pending):
+        free = table[slots] == 0
+        claimed, first = np.unique(slots[free], return_index=True)
+        winners = np.flatnonzero(free)[first]
+        table[claimed] = pending[winners] + 1
+        placed = np.zeros(len(pending), dtype=np.bool_)
+        placed[winners] = True
+        pending = pending[~placed]
+        slots = (slots[~placed] + 1) & (size - 1)
+    return table
+
+
+def probe_hash_table(table: Sequence[int], h: int, matches: Callable[[int], bool]) -> int:
+    """Find an item in a table built by :py:func:`~word_vectors.utils.build_hash_table`.
+
+    Args:
+        table: The hash table.
+        h: The hash of the item we are looking for.
+        matches: A function that is given the index of a candidate item with a colliding
+            home slot and returns True if it is the item we are looking for.
+
+    Returns:
+        The index of the item or ``-1`` if it isn't in the table.
+    """
+    mask = len(table) - 1
+    slot = h & mask
+    while True:
+        idx = int(table[slot])
+        if idx == 0:
+            return -1
+        if matches(idx - 1):
+            return idx - 1
+        slot = (slot + 1) & mask
+
+
+class HashSet:
+    """A set of 64 bit hashes stored in a numpy open addressing table.
+
+    This is used to remember which words have been seen while streaming a file, each
+    hash takes ``18`` to ``36`` bytes (depending on how full the table is) compared to
+    the ~``100`` bytes of a python ``str`` in a ``set``.
+
+    Note:
+        Two different words with the same hash look the same. For 64 bit hashes this is
+        very unlikely (about a ``1e-7`` chance with 2 million words).
+
+    Args:
+        capacity: The number of hashes the table has room for before it grows.
+    """
+
+    def __init__(self, capacity: int = 1024):
+        self._table = np.zeros(hash_table_size(capacity), dtype=np.uint64)
+        self._used = np.zeros(len(self._table), dtype=np.bool_)
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def add(self, hashes: np.ndarray) -> np.ndarray:
+        """Add hashes to the set.
+
+        Args:
+            hashes: The ``uint64`` hashes to add.
+
+        Returns:
+            A boolean mask that is True for each hash that was new, when a hash is repeated
+            in ``hashes`` only the first is new.
+        """
+        hashes = np.asarray(hashes, dtype=np.uint64)
+        new = np.zeros(len(hashes), dtype=np.bool_)
+        if not len(hashes):
+            return new
+        # Only the first of the repeats in this batch can be new.
+        candidates = _first_occurrences(hashes)
+        if 2 * (self._size + len(candidates)) > len(self._table):
+            self._grow(self._size + len(candidates))
+        inserted = self._insert(hashes[candidates])
+        new[candidates[inserted]] = True
+        return new
+
+    def _insert(self, hashes: np.ndarray) -> np.ndarray:
+        """Insert unique hashes, the returned mask is True for the ones that were not already in the table."""
+        mask = len(self._table) - 1
+        inserted = np.zeros(len(hashes), dtype=np.bool_)
+        pending = np.arange(len(hashes))
+        slots = (hashes & np.uint64(mask)).astype(np.int64)
+        while len(pending):
+            used = self._used[slots]
+            # Hashes that are already in the table are done.
+            match = used & (self._table[slots] == hashes[pending])
+            # Of the hashes that found an empty slot the first one claims it, the rest look at it again next round.
+            free = np.flatnonzero(~used)
+            winners = free[_first_occurrences(slots[free])]
+            claimed = slots[winners]
+            self._table[claimed] = hashes[pending[winners]]
+            self._used[claimed] = True
+            inserted[pending[winners]] = True
+            done = match.copy()
+            done[winners] = True
+            # Hashes at a slot holding a different hash move on to the next slot.
+            step = used & ~match
+            slots = np.where(step, (slots + 1) & mask, slots)
+            pending, slots = pending[~done], slots[~done]
+        self._size += int(inserted.sum())
+        return inserted
+
+    def _grow(self, n: int):
+        hashes = self._table[self._used]
+        self._table = np.zeros(hash_table_size(n), dtype=np.uint64)
+        self._used = np.zeros(len(self._table), dtype=np.bool_)
+        self._size = 0
+        self._insert(hashes)
+
+
+def _first_occurrences(values: np.ndarray) -> np.ndarray:
+    """The (sorted by value) indices of the first occurrence of each value, this is faster than ``np.unique``."""
+    order = np.argsort(values, kind="stable")
+    ordered = values[order]
+    first = np.ones(len(values), dtype=np.bool_)
+    first[1:] = ordered[1:] != ordered[:-1]
+    return order[first]
+
+
+@file_or_name(f="rb")
+def compression(f: Union[str, BinaryIO]) -> Optional[str]:
+    """Figure out if a file is compressed by looking at its first few bytes.
+
+    Args:
+        f: The file to check.
 
     Returns:
-        A function that returns a uniformly random vector between ``-unif`` and ``unif``,
+        The compression format (``"gzip"``, ``"bz2"``, ``"xz"``, or ``"zip"``), ``None``
+        when the file isn't compressed.
     """
+    head = peek(f, max(map(len, COMPRESSION_MAGIC)))
+    # A file opened in text mode can't be compressed.
+    if isinstance(head, str):
+        return None
+    for magic, codec in COMPRESSION_MAGIC.items():
+        if head.startswith(magic):
+            return codec
+    return None
+
 
-    def _unif_initializer(vector_size: int) -> np.ndarray:
-        return np.random.uniform(-unif, unif, size=(vector_size,))
+def open_compressed(f: Union[str, pathlib.PurePath, BinaryIO], codec: str) -> BinaryIO:
+    """Open a stream that decompresses a file as it is read.
 
-    return _unif_initializer
+    Note:
+        A zip archive must contain a single file, to read one file from an archive
+        with several pass in the opened member, ``zipfile.ZipFile(path).open(name)``.
+
+    Args:
+        f: The compressed file.
+        codec: The compression format, from :py:func:`~word_vectors.utils.compression`.
+
+    Returns:
+        A binary file object of the decompressed contents.
+
+    Raises:
+        ValueError: If the compression format is unknown or a zip archive has more
+            than one file in it.
+    """
+    if codec == "gzip":
+        return gzip.open(f, "rb")
+    if codec == "bz2":
+        return bz2.open(f, "rb")
+    if codec == "xz":
+        return lzma.open(f, "rb")
+    if codec == "zip":
+        archive = zipfile.ZipFile(f)
+        members = [info for info in archive.infolist() if not info.is_dir()]
+        if len(members) != 1:
+            names = [info.filename for info in members]
+            archive.close()
+            raise ValueError(f"Expected a zip archive with a single file, got: {names}")
+        return archive.open(members[0])
+    raise ValueError(f"Unknown compression format, got: {codec}")
+
+
+def prefetch(chunks: Iterator[bytes], depth: int = 2) -> Iterator[bytes]:
+    """Produce the chunks of a file in a background thread so reading overlaps with processing.
+
+    The decompressors in the standard library release the GIL so decompressing the next
+    chunks happens while the current one is being parsed. At most ``depth`` chunks are
+    waiting at a time which keeps the memory use bounded.
+
+    Args:
+        chunks: The chunks of the file, for example ``iter(partial(f.read, size), b"")``.
+        depth: The number of chunks that can be read ahead.
+
+    Yields:
+        The chunks in order. Any exception raised when producing a chunk is re-raised here.
+    """
+    ready: queue.Queue = queue.Queue(maxsize=depth)
+    stop = threading.Event()
+    done = object()
+
+    def put(item) -> bool:
+        while not stop.is_set():
+            try:
+                ready.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def produce():
+        try:
+            for chunk in chunks:
+                if not put(chunk):
+                    return
+            put(done)
+        except Exception as e:
+            put(e)
+
+    thread = threading.Thread(target=produce, daemon=True)
+    thread.start()
+    try:
+        while True:
+            chunk = ready.get()
+            if chunk is done:
+                break
+            if isinstance(chunk, Exception):
+                raise chunk
+            yield chunk
+    finally:
+        # Let the producer finish if we stopped consuming early.
+        stop.set()
+        thread.join()
+
+
+def check_io_strategy(io_strategy: str, allowed: Sequence[str] = IO_STRATEGIES) -> str:
+    """Make sure an I/O strategy is one we know about.
+
+    Args:
+        io_strategy: The strategy to check.
+        allowed: The strategies that are valid where it is used.
+
+    Returns:
+        The strategy.
+
+    Raises:
+        ValueError: If the strategy is unknown or not allowed.
+    """
+    if io_strategy not in allowed:
+        raise ValueError(f"Unknown I/O strategy, expected one of {list(allowed)}, got: {io_strategy}")
+    return io_strategy
+
+
+def advise(m: mmap.mmap, io_strategy: str, whole: bool = False):
+    """Tell the kernel how a memory mapped file is going to be read.
+
+    ``"mmap-sequential"`` asks for aggressive readahead while ``"mmap-random"`` turns
+    readahead off so looking up a few vectors doesn't pull in the pages around them.
+    When the whole file is going to be read ``MADV_WILLNEED`` also starts reading it
+    in the background. These are hints, on platforms without ``madvise`` (or python
+    before 3.8) this does nothing.
+
+    Args:
+        m: The memory mapped file.
+        io_strategy: How the file will be read, one of the ``mmap-*`` strategies in
+            :py:attr:`~word_vectors.utils.IO_STRATEGIES`.
+        whole: Is every page of the file going to be read?
+    """
+    if not hasattr(m, "madvise") or len(m) == 0:
+        return
+    names = [MADVISE_FLAGS[io_strategy]] if io_strategy in MADVISE_FLAGS else []
+    if whole and io_strategy == "mmap-sequential":
+        names.append("MADV_WILLNEED")
+    for name in names:
+        flag = getattr(mmap, name, None)
+        if flag is not None:
+            m.madvise(flag)
+
+
+def pread_chunks(f: BinaryIO, size: int) -> Iterator[bytes]:
+    """Read a file in chunks with ``os.pread`` starting at the current position.
+
+    Each read says where it starts so the file position isn't used (or moved), the
+    reads don't depend on anything else using the same file descriptor.
+
+    Args:
+        f: The file to read, it has to be a regular file.
+        size: The number of bytes in each chunk.
+
+    Yields:
+        The chunks of the file.
+    """
+    fd = f.fileno()
+    offset = f.tell()
+    while True:
+        chunk = os.pread(fd, size, offset)
+        if not chunk:
+            return
+        offset += len(chunk)
+        yield chunk
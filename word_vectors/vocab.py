@@ -0,0 +1,274 @@
+"""A memory efficient vocab that is backed by numpy arrays.
+
+A ``dict`` vocab holds a python ``str`` and ``int`` (and a hash table entry) for every
+word, for a vocab of a few million words this is hundreds of MB and takes seconds to
+build. :py:class:`~word_vectors.vocab.CompactVocab` stores the same mapping in a handful
+of numpy arrays:
+
+- The ``utf-8`` bytes of every word stored back to back in a single blob.
+- The ``vocab size + 1`` offsets of each word in the blob.
+- The 64 bit FNV-1a hash of each word.
+- An open addressing hash table of the hashes, see :py:func:`~word_vectors.utils.build_hash_table`.
+- The index of each word, only when the indices are not just ``0`` to ``vocab size - 1``
+  in order.
+
+This is the same layout as the words and index of a version 2 Leader file, so the vocab
+of a Leader file or of :py:class:`~word_vectors.shared.SharedVectors` can be used
+without copying. Pickling only pickles the arrays so it is fast too.
+
+It is a read-only ``Mapping[str, int]`` and can be used anywhere a ``dict`` vocab is
+accepted, :py:func:`~word_vectors.read.read_with_vocab` or
+:py:func:`~word_vectors.write.write` for example. ::
+
+    >>> vocab = CompactVocab.from_words(["the", "dog", "cat"])
+    >>> vocab["dog"]
+    1
+"""
+
+from collections.abc import Mapping, ItemsView, ValuesView
+from typing import Iterable, Iterator, Optional, Tuple
+import numpy as np
+from word_vectors.utils import fnv1a, fnv1a_batch, build_hash_table, probe_hash_table
+
+
+class CompactVocab(Mapping):
+    """A read-only mapping of word to index that is backed by numpy arrays.
+
+    Use :py:meth:`~word_vectors.vocab.CompactVocab.from_words` or
+    :py:meth:`~word_vectors.vocab.CompactVocab.from_vocab` to create one, the constructor
+    takes the arrays directly.
+
+    Args:
+        words: The ``utf-8`` encoded words, one after the other, as a ``uint8`` array.
+        offsets: The ``vocab size + 1`` offsets of the words in ``words``.
+        table: The hash index of the words, see :py:func:`~word_vectors.utils.build_hash_table`.
+        hashes: The FNV-1a hash of each word.
+        indices: The index of each word, ``None`` when the ``i``th word has index ``i``.
+    """
+
+    def __init__(
+        self,
+        words: np.ndarray,
+        offsets: np.ndarray,
+        table: np.ndarray,
+        hashes: np.ndarray,
+        indices: Optional[np.ndarray] = None,
+    ):
+        self._words = words
+        self._offsets = offsets
+        self._table = table
+        self._hashes = hashes
+        self._indices = indices
+
+    @classmethod
+    def from_words(cls, words: Iterable[str]) -> "CompactVocab":
+        """Create a vocab where each word's index is its position in ``words``.
+
+        Note:
+            Only the first occurrence of a duplicated word is kept and the following words
+            move up to fill the gap, this matches how the readers handle duplicated words.
+
+        Args:
+            words: The words in the vocab.
+
+        Returns:
+            The vocab.
+        """
+        words = [word.encode("utf-8") for word in words]
+        blob, offsets = _pack(words)
+        hashes = fnv1a_batch(blob, offsets).astype("<u8")
+        if _has_duplicates(hashes):
+            # There are duplicated words (or a very unlikely hash collision) so fall back to a dict to find the
+            # first occurrence of each word.
+            unique = list(dict.fromkeys(words))
+            if len(unique) != len(words):
+                words = unique
+                blob, offsets = _pack(words)
+                hashes = fnv1a_batch(blob, offsets).astype("<u8")
+        return cls(blob, offsets, build_hash_table(hashes).astype("<u8"), hashes)
+
+    @classmethod
+    def from_vocab(cls, vocab: Mapping) -> "CompactVocab":
+        """Create a compact version of a vocab.
+
+        Args:
+            vocab: A mapping of word to index, a ``dict`` for example.
+
+        Returns:
+            The vocab, it has the same words and indices as ``vocab``.
+        """
+        if isinstance(vocab, CompactVocab):
+            return vocab
+        words = [word.encode("utf-8") for word in vocab.keys()]
+        indices = np.fromiter(vocab.values(), dtype=np.int64, count=len(words))
+        blob, offsets = _pack(words)
+        hashes = fnv1a_batch(blob, offsets).astype("<u8")
+        if np.array_equal(indices, np.arange(len(indices))):
+            indices = None
+        return cls(blob, offsets, build_hash_table(hashes).astype("<u8"), hashes, indices)
+
+    @property
+    def positional(self) -> bool:
+        """Is the index of each word its position in the vocab."""
+        return self._indices is None
+
+    @property
+    def nbytes(self) -> int:
+        """The number of bytes used by the arrays of the vocab."""
+        arrays = (self._words, self._offsets, self._table, self._hashes, self._indices)
+        return sum(array.nbytes for array in arrays if array is not None)
+
+    def arrays(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, Optional[np.ndarray]]:
+        """The words, offsets, hash table, hashes, and indices that back the vocab."""
+        return self._words, self._offsets, self._table, self._hashes, self._indices
+
+    def word(self, i: int) -> str:
+        """Get the ``i``th word in the vocab, when the vocab is positional this is the word with index ``i``."""
+        return self._words[int(self._offsets[i]) : int(self._offsets[i + 1])].tobytes().decode("utf-8")
+
+    def find(self, word: str) -> int:
+        """Find the position of a word in the vocab, ``-1`` if it is not in the vocab."""
+        word = word.encode("utf-8")
+        h = fnv1a(word)
+
+        def matches(i: int) -> bool:
+            return (
+                int(self._hashes[i]) == h
+                and self._words[int(self._offsets[i]) : int(self._offsets[i + 1])].tobytes() == word
+            )
+
+        return probe_hash_table(self._table, h, matches)
+
+    def extend(self, words: Iterable[str]) -> "CompactVocab":
+        """Create a new vocab with words added to the end.
+
+        The new words get the indices after the end of this vocab, ``len(self)``,
+        ``len(self) + 1``, and so on.
+
+        Args:
+            words: The words to add, they must not already be in the vocab.
+
+        Returns:
+            The extended vocab, this vocab is not changed.
+        """
+        words = [word.encode("utf-8") for word in words]
+        blob, offsets = _pack(words)
+        hashes = np.concatenate([self._hashes, fnv1a_batch(blob, offsets).astype("<u8")])
+        offsets = np.concatenate([self._offsets[:-1], offsets + self._offsets[-1]])
+        indices = self._indices
+        if indices is not None:
+            indices = np.concatenate([indices, np.arange(len(self), len(self) + len(words), dtype=indices.dtype)])
+        return CompactVocab(
+            np.concatenate([self._words, blob]), offsets, build_hash_table(hashes).astype("<u8"), hashes, indices
+        )
+
+    def __getitem__(self, word: str) -> int:
+        i = self.find(word)
+        if i == -1:
+            raise KeyError(word)
+        return i if self._indices is None else int(self._indices[i])
+
+    def __contains__(self, word: str) -> bool:
+        return isinstance(word, str) and self.find(word) != -1
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __iter__(self) -> Iterator[str]:
+        # Slicing python bytes is much faster than slicing the numpy array for each word.
+        blob = self._words.tobytes()
+        offsets = self._offsets.tolist()
+        return (blob[start:end].decode("utf-8") for start, end in zip(offsets, offsets[1:]))
+
+    def items(self) -> "ItemsView":
+        return _CompactItems(self)
+
+    def values(self) -> "ValuesView":
+        return _CompactValues(self)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({len(self)} words, {self.nbytes} bytes)"
+
+
+class BucketVocab(Mapping):
+    """A vocab that gives every word a row, words it doesn't know share a fixed number of hashed buckets.
+
+    The known words map to their rows, ``0`` to ``len(vocab) - 1``, and any other word
+    maps to one of the ``buckets`` rows after them, chosen by the FNV-1a hash of the word.
+    The hash is stable across processes and machines so every worker puts a word in the
+    same bucket.
+
+    Only the known words are part of the mapping (for ``len``, ``in``, and iteration)
+    but looking up any word gives a row.
+
+    Args:
+        vocab: The known words and their rows.
+        buckets: The number of rows that are shared by the unknown words.
+
+    Raises:
+        ValueError: If there isn't at least one bucket.
+    """
+
+    def __init__(self, vocab: Mapping, buckets: int):
+        if buckets < 1:
+            raise ValueError(f"There must be at least one bucket, got: {buckets}")
+        self.vocab = vocab
+        self.buckets = buckets
+
+    def bucket(self, word: str) -> int:
+        """Get the row of the bucket a word hashes to."""
+        return len(self.vocab) + fnv1a(word.encode("utf-8")) % self.buckets
+
+    def lookup(self, words: Iterable[str]) -> np.ndarray:
+        """Get the rows of many words, the buckets of the unknown words are hashed together."""
+        words = list(words)
+        rows = np.fromiter((self.vocab.get(word, -1) for word in words), dtype=np.int64, count=len(words))
+        unknown = np.flatnonzero(rows == -1)
+        if len(unknown):
+            hashes = fnv1a_batch(*_pack(words[i].encode("utf-8") for i in unknown))
+            rows[unknown] = len(self.vocab) + (hashes % np.uint64(self.buckets)).astype(np.int64)
+        return rows
+
+    def __getitem__(self, word: str) -> int:
+        row = self.vocab.get(word)
+        return self.bucket(word) if row is None else row
+
+    def __contains__(self, word: str) -> bool:
+        return word in self.vocab
+
+    def __len__(self) -> int:
+        return len(self.vocab)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.vocab)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({len(self)} words, {self.buckets} buckets)"
+
+
+class _CompactItems(ItemsView):
+    """Iterate the words and indices without looking each word up in the hash table."""
+
+    def __iter__(self) -> Iterator[Tuple[str, int]]:
+        return zip(self._mapping, self._mapping.values())
+
+
+class _CompactValues(ValuesView):
+    def __iter__(self) -> Iterator[int]:
+        if self._mapping._indices is None:
+            return iter(range(len(self._mapping)))
+        return iter(self._mapping._indices.tolist())
+
+
+def _pack(words: Iterable[bytes]) -> Tuple[np.ndarray, np.ndarray]:
+    """Store encoded words back to back in a single blob."""
+    words = list(words)
+    offsets = np.zeros(len(words) + 1, dtype="<u8")
+    np.cumsum([len(word) for word in words], out=offsets[1:])
+    return np.frombuffer(b"".join(words), dtype=np.uint8), offsets
+
+
+def _has_duplicates(hashes: np.ndarray) -> bool:
+    """Check for repeated hashes, sorting is much faster than ``np.unique`` for this."""
+    ordered = np.sort(hashes)
+    return bool(np.any(ordered[1:] == ordered[:-1]))